@@ -0,0 +1,68 @@
+"""
+Pagination classes shared by the API
+"""
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class CreatedCursorPagination(CursorPagination):
+    """Cursor pagination on (created_at, id), newest first"""
+    ordering = ('-created_at', '-id')
+
+
+class OptInCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination (the API default) unless the client opts in with
+    ``?pagination=cursor``; then pages are read with a cursor on (created_at, id)
+    instead of OFFSET, and no COUNT(*) is run. The ``next``/``previous`` links
+    carry the cursor, which also selects cursor mode on its own.
+    
+    Views with an OrderingFilter decide the cursor ordering through the filter
+    (their default ``ordering`` should end in a unique field such as ``-id``).
+    """
+    mode_query_param = 'pagination'
+    cursor_class = CreatedCursorPagination
+    
+    def __init__(self):
+        self.cursor_paginator = None
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._cursor_requested(request):
+            self.cursor_paginator = self.cursor_class()
+            self.cursor_paginator.page_size = self.page_size
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+    
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+    
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "'cursor' para paginar por cursor (sin total de resultados)",
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.cursor_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor de la página (enlaces next/previous)',
+                'schema': {'type': 'string'},
+            },
+        ]
+    
+    def _cursor_requested(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
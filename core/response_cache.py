@@ -0,0 +1,161 @@
+"""
+Cache of rendered responses for public, rarely changing GET endpoints
+
+``cache_response(*groups)`` wraps a view (usually in urls.py) and stores the
+rendered bytes, status and headers of successful JSON responses in a Django
+cache backend (``RESPONSE_CACHE_ALIAS``; local memory or file based both
+work). Entries are keyed by host, path, normalized query string and Accept
+header (the host is part of the key because responses embed absolute media URLs).
+
+Invalidation is by dependency group: every entry key embeds the current
+version of its groups (e.g. ``projects``, ``project:42``), and the
+``post_save``/``post_delete`` handlers in core/signals.py bump those versions,
+so only the responses that depend on the changed rows are dropped. When the
+backend is not shared between instances, ``RESPONSE_CACHE_TIMEOUT`` bounds how
+long another instance may serve an outdated entry.
+
+Hits keep honoring If-None-Match/If-Modified-Since through the stored ETag and
+Last-Modified headers. Hit/miss counters are per process (see ``stats``).
+"""
+
+import functools
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterable
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+KEY_PREFIX = 'response-cache:'
+VERSION_KEY_PREFIX = 'response-cache:version:'
+
+# Defaults (overridable in settings)
+DEFAULT_ALIAS = 'default'
+DEFAULT_TIMEOUT = 60
+
+# Headers that must not be replayed to other clients
+UNCACHED_HEADERS = {'set-cookie'}
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+counters = _Counters()
+
+
+def _backend():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', DEFAULT_ALIAS)]
+
+
+def _timeout() -> int:
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def invalidate(*groups: str) -> None:
+    """Drop every cached response that depends on any of ``groups``"""
+    backend = _backend()
+    for group in groups:
+        version_key = VERSION_KEY_PREFIX + group
+        try:
+            backend.incr(version_key)
+        except ValueError:
+            # Counter not initialized yet (or evicted): entries were keyed on version 0
+            backend.set(version_key, 1, timeout=None)
+
+
+def stats() -> Dict[str, Any]:
+    lookups = counters.hits + counters.misses
+    return {
+        'hits': counters.hits,
+        'misses': counters.misses,
+        'hit_ratio': counters.hits / lookups if lookups else 0.0,
+    }
+
+
+def _cache_key(request, groups: Iterable[str]) -> str:
+    groups = list(groups)
+    versions = _backend().get_many([VERSION_KEY_PREFIX + group for group in groups])
+    query = urlencode(sorted((key, value) for key, values in request.GET.lists() for value in values))
+    raw = '|'.join([
+        request.scheme,
+        request.get_host(),
+        request.path,
+        query,
+        request.META.get('HTTP_ACCEPT', '').strip(),
+        *(f'{group}={versions.get(VERSION_KEY_PREFIX + group, 0)}' for group in groups),
+    ])
+    return KEY_PREFIX + hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def _replay(request, entry: Dict[str, Any]) -> HttpResponse:
+    response = HttpResponse(entry['content'], status=entry['status'])
+    for header, value in entry['headers']:
+        response[header] = value
+    if request.method == 'GET':
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+            response=response
+        )
+    return response
+
+
+def cache_response(*groups: str) -> Callable:
+    """
+    Cache the successful JSON GET responses of a view.
+
+    ``groups`` are the dependency groups of the response; ``{name}`` fields are
+    filled from the URL kwargs (e.g. ``'project:{pk}'``).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or _timeout() <= 0:
+                return view(request, *args, **kwargs)
+
+            backend = _backend()
+            key = _cache_key(request, (group.format(**kwargs) for group in groups))
+            entry = backend.get(key)
+            counters.record(entry is not None)
+            if entry is not None:
+                return _replay(request, entry)
+
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+            if (
+                request.method == 'GET'
+                and response.status_code == 200
+                and response.get('Content-Type', '').startswith('application/json')
+            ):
+                backend.set(key, {
+                    'content': response.content,
+                    'status': response.status_code,
+                    'headers': [
+                        (header, value) for header, value in response.items()
+                        if header.lower() not in UNCACHED_HEADERS
+                    ],
+                }, timeout=_timeout())
+            return response
+        return wrapper
+    return decorator
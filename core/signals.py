@@ -0,0 +1,46 @@
+"""
+Signal handlers that invalidate the cached API responses (see core.response_cache)
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from projects.models import ProjectImage, ProjectVideo, SolarProject
+from simulations.models import EnergyPrice, ExchangeRate, InvestmentSimulation, TariffCategory
+from . import response_cache
+from .models import SiteSettings
+
+
+@receiver([post_save, post_delete], sender=SolarProject)
+def invalidate_project_responses(sender, instance, **kwargs):
+    """Project lists, stats and the detail of the changed project"""
+    response_cache.invalidate('projects', f'project:{instance.pk}')
+
+
+@receiver([post_save, post_delete], sender=ProjectImage)
+@receiver([post_save, post_delete], sender=ProjectVideo)
+def invalidate_project_media_responses(sender, instance, **kwargs):
+    """Lists (featured images) and the detail of the project owning the media"""
+    response_cache.invalidate('projects', f'project:{instance.project_id}')
+
+
+@receiver([post_save, post_delete], sender=TariffCategory)
+def invalidate_tariff_category_responses(sender, **kwargs):
+    response_cache.invalidate('tariff_categories')
+
+
+@receiver([post_save, post_delete], sender=ExchangeRate)
+@receiver([post_save, post_delete], sender=EnergyPrice)
+def invalidate_pricing_responses(sender, **kwargs):
+    response_cache.invalidate('pricing')
+
+
+@receiver([post_save, post_delete], sender=SiteSettings)
+def invalidate_site_settings_responses(sender, **kwargs):
+    response_cache.invalidate('site_settings')
+
+
+@receiver([post_save, post_delete], sender=InvestmentSimulation)
+def invalidate_simulation_count_responses(sender, **kwargs):
+    """The API info endpoint reports the number of simulations"""
+    response_cache.invalidate('simulations')
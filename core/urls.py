@@ -1,13 +1,14 @@
 from django.urls import path
+from .response_cache import cache_response
 from . import views
 
 app_name = 'core'
 
 urlpatterns = [
     # Site information
-    path('settings/', views.site_settings_view, name='site-settings'),
+    path('settings/', cache_response('site_settings')(views.site_settings_view), name='site-settings'),
     path('health/', views.health_check_view, name='health-check'),
-    path('info/', views.api_info_view, name='api-info'),
+    path('info/', cache_response('projects', 'tariff_categories', 'simulations')(views.api_info_view), name='api-info'),
     
     # Contact and communication
     path('contact/', views.contact_message_view, name='contact'),
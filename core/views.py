@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
+from . import response_cache
 from .models import ContactMessage, SiteSettings, Newsletter
 from .serializers import ContactMessageSerializer, SiteSettingsSerializer, NewsletterSerializer
 
@@ -173,7 +174,8 @@ def health_check_view(request):
     return Response({
         'status': 'healthy',
         'message': 'WeSolar API is running',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'response_cache': response_cache.stats()
     }, status=status.HTTP_200_OK)
 
 
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
-    verbose_name = 'Proyectos Solares'
\ No newline at end of file
+    verbose_name = 'Proyectos Solares'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
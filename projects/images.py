@@ -0,0 +1,150 @@
+"""
+Derived versions of uploaded project images
+
+Once an upload is committed (see ProjectImage.save), ``build_variants`` decodes
+the image once with Pillow, applies the EXIF orientation and writes resized
+copies at ``VARIANT_WIDTHS`` (never wider than the original, which is always
+included at full size) as JPEG and, when the Pillow build supports it, WebP. The copies carry no metadata (EXIF, GPS,
+ICC profiles) and their names include a hash of their content, so they can be
+served with long-lived cache headers.
+
+The original itself is stored through ``strip_metadata``: it is re-encoded in
+its own format without EXIF (camera, GPS position), XMP or comments, since it is
+still served as the full-size ``image_url``.
+
+``srcset`` turns the stored variant list into ``srcset`` strings per MIME type
+for ``<picture>``/``<img srcset>``.
+"""
+
+import hashlib
+import io
+import os
+
+from django.core.files.base import ContentFile
+from PIL import ExifTags, Image, ImageOps, features
+
+# Widths (px) of the resized copies: list cards, detail view, full width
+VARIANT_WIDTHS = (320, 640, 1280)
+
+# Directory of the derived files, relative to the storage root
+VARIANTS_DIR = 'images/projects/derived'
+
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+
+# Quality of re-encoded JPEG originals that had to be rotated (otherwise the
+# original quantization tables are kept)
+ORIGINAL_JPEG_QUALITY = 95
+
+# Image info entries kept in stripped originals: rendering data, not metadata
+KEPT_INFO = ('icc_profile', 'transparency', 'background', 'duration', 'loop', 'disposal')
+
+# Pillow format -> (extension, MIME type)
+FORMATS = {
+    'JPEG': ('jpg', 'image/jpeg'),
+    'WEBP': ('webp', 'image/webp'),
+}
+
+
+def output_formats():
+    """Formats written for each width (WebP only when libwebp is available)"""
+    return ['WEBP', 'JPEG'] if features.check('webp') else ['JPEG']
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        if image.mode != 'RGB':
+            # Flatten transparency on white
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+            image = background
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def strip_metadata(source) -> bytes:
+    """
+    Content of the image file ``source`` re-encoded in its own format without
+    metadata, with the EXIF orientation applied to the pixels (animated images
+    keep their frames and orientation)
+    """
+    source.seek(0)
+    with Image.open(source) as original:
+        # Multi-picture JPEGs from phones are stored as their first picture
+        image_format = 'JPEG' if original.format == 'MPO' else original.format
+        options = {}
+        orientation = original.getexif().get(ExifTags.Base.Orientation, 1)
+        if getattr(original, 'n_frames', 1) > 1:
+            image = original
+            options['save_all'] = True
+        elif orientation != 1:
+            image = ImageOps.exif_transpose(original)
+        else:
+            image = original
+
+        if image_format == 'JPEG':
+            if image is original and original.format == 'JPEG':
+                options.update(quality='keep', subsampling='keep')
+            else:
+                options['quality'] = ORIGINAL_JPEG_QUALITY
+            if 'icc_profile' in original.info:
+                options['icc_profile'] = original.info['icc_profile']
+
+        image.info = {key: original.info[key] for key in KEPT_INFO if key in original.info}
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+    source.seek(0)
+    return buffer.getvalue()
+
+
+def build_variants(source, storage, name: str) -> list:
+    """
+    Write the variants of the image file ``source`` (named ``name``) to
+    ``storage`` and return their descriptions, smallest first:
+    ``[{'width': 320, 'height': 213, 'type': 'image/webp', 'name': ...}, ...]``
+    """
+    source.seek(0)
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    source.seek(0)
+
+    widths = sorted({width for width in VARIANT_WIDTHS if width < image.width} | {image.width})
+    stem = os.path.splitext(os.path.basename(name))[0]
+
+    variants = []
+    # Resize from the largest down: each step resamples an already smaller image
+    resized = image
+    for width in reversed(widths):
+        if width != resized.width:
+            resized = resized.resize(
+                (width, max(1, round(image.height * width / image.width))), Image.LANCZOS
+            )
+        for image_format in output_formats():
+            extension, content_type = FORMATS[image_format]
+            content = _encode(resized, image_format)
+            digest = hashlib.sha256(content).hexdigest()[:16]
+            variant_name = f'{VARIANTS_DIR}/{stem}-{width}w.{digest}.{extension}'
+            if not storage.exists(variant_name):
+                variant_name = storage.save(variant_name, ContentFile(content))
+            variants.append({
+                'width': width,
+                'height': resized.height,
+                'type': content_type,
+                'name': variant_name,
+            })
+    variants.sort(key=lambda variant: (variant['width'], variant['type']))
+    return variants
+
+
+def srcset(variants: list, storage, build_url=None) -> dict:
+    """``{MIME type: 'url 320w, url 640w, ...'}`` of stored variants"""
+    build_url = build_url or (lambda url: url)
+    candidates = {}
+    for variant in variants:
+        url = build_url(storage.url(variant['name']))
+        candidates.setdefault(variant['type'], []).append(f"{url} {variant['width']}w")
+    return {content_type: ', '.join(urls) for content_type, urls in candidates.items()}
@@ -0,0 +1,41 @@
+"""
+Django management command to generate the variants of existing project images
+"""
+
+from django.core.management.base import BaseCommand
+from projects.models import ProjectImage
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate thumbnails and WebP variants of project images uploaded before the image pipeline '
+        'and optionally strip the metadata (EXIF, GPS) of their originals'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate images that already have variants')
+        parser.add_argument(
+            '--strip-originals',
+            action='store_true',
+            help='Also replace every original by a copy without metadata (stored under a new name)'
+        )
+
+    def handle(self, *args, **options):
+        images = ProjectImage.objects.exclude(image='')
+        if not options['all'] and not options['strip_originals']:
+            images = images.filter(variants=[])
+        
+        built = failed = 0
+        for project_image in images.iterator():
+            try:
+                if options['strip_originals']:
+                    project_image.strip_metadata()
+                project_image.build_variants()
+            except (OSError, ValueError) as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'Imagen {project_image.pk}: {e}'))
+                continue
+            project_image.save(update_fields=['image', 'variants', 'updated_at'])
+            built += 1
+        
+        self.stdout.write(self.style.SUCCESS(f'Variantes generadas: {built} imágenes ({failed} con errores)'))
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:00
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+FTS_TABLE = 'projects_solarproject_fts'
+
+POSTGRES_FORWARD = [
+    'CREATE INDEX projects_solarproject_search_gin ON projects_solarproject USING GIN (search_vector)',
+    """
+    UPDATE projects_solarproject SET search_vector =
+        setweight(to_tsvector('spanish', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(owners, '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(description, '')), 'C')
+    """,
+]
+POSTGRES_BACKWARD = ['DROP INDEX IF EXISTS projects_solarproject_search_gin']
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, location, owners, description, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, name, location, owners, description)
+    SELECT id, name, location, owners, description FROM projects_solarproject
+    """,
+]
+SQLITE_BACKWARD = [f'DROP TABLE IF EXISTS {FTS_TABLE}']
+
+
+def run_for_vendor(postgres_statements, sqlite_statements):
+    def run(apps, schema_editor):
+        statements = {
+            'postgresql': postgres_statements,
+            'sqlite': sqlite_statements,
+        }.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_auto_20250814_1610'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solarproject',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_BACKWARD, SQLITE_BACKWARD),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_project_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='solarproject',
+            index=models.Index(fields=['-created_at', '-id'], name='project_created_id_idx'),
+        ),
+    ]
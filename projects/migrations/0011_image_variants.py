@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_media_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Copias redimensionadas sin metadatos (ver projects.images)', verbose_name='Variantes'),
+        ),
+    ]
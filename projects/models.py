@@ -1,7 +1,14 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.files.base import ContentFile
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
+import functools
+import operator
 import os
 
+from . import images
+from .search import update_search_vector
+
 
 def project_image_path(instance, filename):
     """Generate file path for project images"""
@@ -118,6 +125,9 @@ class SolarProject(models.Model):
     )
     funding_deadline = models.DateField('Fecha Límite de Financiamiento', null=True, blank=True)
     
+    # Full-text search (PostgreSQL only, GIN index; see projects.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField('Fecha de Creación', auto_now_add=True)
     updated_at = models.DateTimeField('Última Actualización', auto_now=True)
@@ -126,10 +136,18 @@ class SolarProject(models.Model):
         verbose_name = 'Proyecto Solar'
         verbose_name_plural = 'Proyectos Solares'
         ordering = ['-created_at']
+        indexes = [
+            # Cursor pagination of the project list
+            models.Index(fields=['-created_at', '-id'], name='project_created_id_idx'),
+        ]
     
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_search_vector(SolarProject.objects.filter(pk=self.pk))
+    
     @property
     def funding_percentage(self):
         """Calculate funding percentage"""
@@ -152,6 +170,11 @@ class ProjectImage(models.Model):
     caption = models.CharField('Descripción', max_length=200, blank=True)
     is_featured = models.BooleanField('Imagen Principal', default=False)
     order = models.PositiveIntegerField('Orden', default=0)
+    variants = models.JSONField(
+        'Variantes', default=list, blank=True, editable=False,
+        help_text='Copias redimensionadas sin metadatos (ver projects.images)'
+    )
+    updated_at = models.DateTimeField('Última Actualización', auto_now=True)
     
     class Meta:
         verbose_name = 'Imagen del Proyecto'
@@ -160,6 +183,75 @@ class ProjectImage(models.Model):
     
     def __str__(self):
         return f"{self.project.name} - Imagen {self.id}"
+    
+    def save(self, *args, **kwargs):
+        # New upload: strip its metadata before storing the original; the
+        # thumbnails and WebP copies are derived once the row is committed, so
+        # a rolled back save leaves no variant files behind
+        upload_name = self.image.name if self.image and not self.image._committed else None
+        if upload_name:
+            self.strip_metadata()
+        super().save(*args, **kwargs)
+        if upload_name:
+            # Named after the upload, not the deduplicated stored name, so
+            # identical uploads keep sharing their content-named variants
+            transaction.on_commit(functools.partial(self._store_variants, upload_name), robust=True)
+        
+        replaced_original = getattr(self, '_replaced_original', None)
+        if replaced_original:
+            self._replaced_original = None
+            transaction.on_commit(functools.partial(self.image.storage.delete, replaced_original))
+        replaced_variants = getattr(self, '_replaced_variants', [])
+        if replaced_variants:
+            self._replaced_variants = []
+            transaction.on_commit(functools.partial(self.delete_variant_files, replaced_variants))
+    
+    def _store_variants(self, name):
+        """Build the variants of the committed image and save them (fires post_save)"""
+        self.build_variants(name)
+        self.save(update_fields=['variants', 'updated_at'])
+    
+    def strip_metadata(self):
+        """
+        Replace the original by a copy without EXIF/GPS metadata (see
+        images.strip_metadata). A stored original is written under a new name;
+        the old file is deleted once the next save() commits.
+        """
+        content = ContentFile(images.strip_metadata(self.image))
+        if not self.image._committed:
+            self.image.file = content
+            return
+        previous_name = self.image.name
+        self.image.save(os.path.basename(previous_name), content, save=False)
+        self._replaced_original = previous_name
+    
+    def build_variants(self, name=None):
+        """
+        Regenerate ``variants`` from the current image, named after ``name``
+        (default: the stored file). Does not save the row; the files of the
+        replaced variants are deleted once the next save() commits.
+        """
+        previous = self.variants
+        self.variants = images.build_variants(self.image, self.image.storage, name or self.image.name)
+        current = {variant['name'] for variant in self.variants}
+        self._replaced_variants = getattr(self, '_replaced_variants', []) + [
+            variant['name'] for variant in previous if variant['name'] not in current
+        ]
+    
+    def delete_variant_files(self, names):
+        """
+        Delete the variant files ``names`` that no other image lists (identical
+        uploads share the same content-named files)
+        """
+        names = set(names)
+        if not names:
+            return
+        shared = ProjectImage.objects.exclude(pk=self.pk).filter(
+            functools.reduce(operator.or_, (models.Q(variants__icontains=name) for name in names))
+        ).values_list('variants', flat=True)
+        in_use = {variant['name'] for variants in shared for variant in variants}
+        for name in names - in_use:
+            self.image.storage.delete(name)
 
 
 class ProjectVideo(models.Model):
@@ -170,6 +262,7 @@ class ProjectVideo(models.Model):
     title = models.CharField('Título', max_length=200)
     description = models.TextField('Descripción', blank=True)
     order = models.PositiveIntegerField('Orden', default=0)
+    updated_at = models.DateTimeField('Última Actualización', auto_now=True)
     
     class Meta:
         verbose_name = 'Video del Proyecto'
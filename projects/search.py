@@ -0,0 +1,120 @@
+"""
+Indexed, ranked full-text search of solar projects
+
+- PostgreSQL: ``SolarProject.search_vector`` (tsvector, GIN index) weighted by
+  field and refreshed on every save; results are ranked with ``ts_rank``.
+- SQLite (development): the ``projects_solarproject_fts`` FTS5 table (rowid =
+  project id), rewritten on every save; results are ranked with ``bm25``. Rows
+  of deleted projects are left behind but never match (ids are not reused).
+- Any other database falls back to DRF's ``icontains`` search.
+
+Both indexes are built for existing rows by migration 0008. Bulk ``update()``
+calls bypass ``save()``: refresh them with ``update_search_vector``.
+
+Every word of the query must match, as a prefix, so results update while the
+user types.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+# Text search configuration of the PostgreSQL vector (content is in Spanish)
+SEARCH_CONFIG = 'spanish'
+
+# Indexed fields and their PostgreSQL weights (A ranks highest)
+SEARCH_FIELDS = (
+    ('name', 'A'),
+    ('location', 'B'),
+    ('owners', 'B'),
+    ('description', 'C'),
+)
+
+FTS_TABLE = 'projects_solarproject_fts'
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vector():
+    """Weighted tsvector expression of a project (PostgreSQL)"""
+    vector = None
+    for field, weight in SEARCH_FIELDS:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(queryset) -> None:
+    """Refresh the search index entries of the projects in ``queryset``"""
+    if connection.vendor == 'postgresql':
+        queryset.update(search_vector=search_vector())
+    elif connection.vendor == 'sqlite':
+        fields = [field for field, _ in SEARCH_FIELDS]
+        rows = list(queryset.values_list('id', *fields))
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(fields)}) VALUES (%s{", %s" * len(fields)})',
+                rows
+            )
+
+
+def search_projects(queryset, text: str):
+    """
+    Projects of ``queryset`` matching every word of ``text``, annotated with
+    ``search_rank`` (higher is better). ``queryset`` itself, unfiltered and
+    without ``search_rank``, when ``text`` has no words (e.g. only punctuation);
+    None when the database has no index.
+    """
+    words = _WORD.findall(text)
+    if not words:
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        # Words are \w+ only, so the raw tsquery cannot be malformed
+        query = SearchQuery(
+            ' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG
+        )
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{word}"*' for word in words)
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            # bm25() is lower for better matches
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+                (match,)
+            )
+        )
+
+    return None
+
+
+class ProjectSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the full-text index, ranked by relevance unless an
+    explicit ``?ordering=`` is given. List it after OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        # Nothing to match or rank by: same as no ?search=
+        if not _WORD.search(text):
+            return queryset
+
+        results = search_projects(queryset, text)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        if request.query_params.get('ordering'):
+            return results
+        return results.order_by('-search_rank', *results.query.order_by)
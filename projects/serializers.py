@@ -1,14 +1,22 @@
 from rest_framework import serializers
+from . import images
 from .models import SolarProject, ProjectImage, ProjectVideo
 
 
+def _srcset(project_image, request):
+    """``{MIME type: srcset}`` of the resized variants of an image"""
+    build_url = request.build_absolute_uri if request else None
+    return images.srcset(project_image.variants, project_image.image.storage, build_url)
+
+
 class ProjectImageSerializer(serializers.ModelSerializer):
     """Serializer for project images"""
     image_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = ProjectImage
-        fields = ['id', 'image_url', 'caption', 'is_featured', 'order']
+        fields = ['id', 'image_url', 'srcset', 'caption', 'is_featured', 'order']
     
     def get_image_url(self, obj):
         """Return absolute URL for image"""
@@ -18,6 +26,10 @@ class ProjectImageSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.image.url)
             return obj.image.url
         return None
+    
+    def get_srcset(self, obj):
+        """Resized variants per MIME type, e.g. {'image/webp': 'url 320w, url 640w'}"""
+        return _srcset(obj, self.context.get('request'))
 
 
 class ProjectVideoSerializer(serializers.ModelSerializer):
@@ -32,6 +44,7 @@ class SolarProjectListSerializer(serializers.ModelSerializer):
     """Serializer for solar project list view (minimal fields)"""
     
     featured_image = serializers.SerializerMethodField()
+    featured_image_srcset = serializers.SerializerMethodField()
     funding_percentage = serializers.ReadOnlyField()
     available_power_percentage = serializers.ReadOnlyField()
     
@@ -40,18 +53,34 @@ class SolarProjectListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'location', 'status', 'available_power', 
             'total_power_projected', 'price_per_wp_usd', 'featured_image',
-            'funding_percentage', 'available_power_percentage', 'created_at'
+            'featured_image_srcset', 'funding_percentage', 'available_power_percentage', 'created_at'
         ]
     
+    def _featured_image(self, obj):
+        """The featured image (prefetched by the list view as featured_images)"""
+        if hasattr(obj, 'featured_images'):
+            return obj.featured_images[0] if obj.featured_images else None
+        # Cache the lookup: featured_image and featured_image_srcset both use it
+        if not hasattr(obj, '_featured_image'):
+            obj._featured_image = obj.images.filter(is_featured=True).first()
+        return obj._featured_image
+    
     def get_featured_image(self, obj):
         """Get the featured image URL"""
-        featured_image = obj.images.filter(is_featured=True).first()
+        featured_image = self._featured_image(obj)
         if featured_image:
             request = self.context.get('request')
             if request:
                 return request.build_absolute_uri(featured_image.image.url)
             return featured_image.image.url
         return None
+    
+    def get_featured_image_srcset(self, obj):
+        """Resized variants of the featured image per MIME type (card images)"""
+        featured_image = self._featured_image(obj)
+        if featured_image:
+            return _srcset(featured_image, self.context.get('request'))
+        return None
 
 
 class SolarProjectDetailSerializer(serializers.ModelSerializer):
@@ -0,0 +1,19 @@
+"""
+Signal handlers for the projects app
+"""
+
+import functools
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import ProjectImage
+
+
+@receiver(post_delete, sender=ProjectImage)
+def delete_image_variants(sender, instance, **kwargs):
+    """Delete the resized copies of a deleted image once the deletion commits"""
+    names = [variant['name'] for variant in instance.variants]
+    if names:
+        transaction.on_commit(functools.partial(instance.delete_variant_files, names))
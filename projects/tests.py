@@ -0,0 +1,381 @@
+import io
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework import generics
+from rest_framework.test import APIClient
+
+from core import response_cache
+
+from . import images
+from .models import SolarProject, ProjectImage
+from .views import ConditionalGetMixin
+
+
+def create_project(**fields):
+    """Minimal valid SolarProject; ``fields`` override the defaults"""
+    return SolarProject.objects.create(**{
+        'name': 'Proyecto',
+        'description': '',
+        'location': 'Córdoba',
+        'total_power_installed': Decimal('0'),
+        'total_power_projected': Decimal('100'),
+        'available_power': Decimal('100'),
+        'price_per_wp_usd': Decimal('1'),
+        'owners': 'Prueba',
+        **fields
+    })
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class SolarProjectListQueryTests(TestCase):
+    """
+    The project list must run the same number of queries for any page size
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+    
+    def _create_projects(self, count):
+        for index in range(count):
+            project = create_project(name=f'Proyecto {index}')
+            ProjectImage.objects.create(project=project, image=f'images/projects/{index}-a.jpg', order=0)
+            ProjectImage.objects.create(
+                project=project, image=f'images/projects/{index}.jpg', is_featured=True, order=1
+            )
+    
+    def _list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/projects/')
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()['results']
+    
+    def test_constant_query_count(self):
+        self._create_projects(2)
+        small_page_queries, results = self._list_queries()
+        self.assertEqual(len(results), 2)
+        
+        self._create_projects(18)
+        full_page_queries, results = self._list_queries()
+        self.assertEqual(len(results), 20)
+        self.assertEqual(full_page_queries, small_page_queries)
+    
+    def test_featured_image(self):
+        self._create_projects(1)
+        create_project(name='Sin imagen', location='Salta')
+        _, results = self._list_queries()
+        featured = {project['name']: project['featured_image'] for project in results}
+        self.assertTrue(featured['Proyecto 0'].endswith('/images/projects/0.jpg'))
+        self.assertIsNone(featured['Sin imagen'])
+
+
+class SolarProjectSearchTests(TestCase):
+    """
+    ?search= uses the full-text index: every word must match (as a prefix) and
+    results are ranked by relevance
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        for name, description, location in [
+            ('Parque Solar Córdoba', 'Paneles bifaciales en zona rural', 'Córdoba'),
+            ('Techo Comunitario', 'Proyecto cerca del parque solar de Córdoba', 'Rosario'),
+            ('Planta Mendoza', 'Seguidores de un eje', 'Mendoza'),
+        ]:
+            create_project(name=name, description=description, location=location, owners='Cooperativa')
+    
+    def _search(self, text, **params):
+        response = self.client.get('/api/v1/projects/', {'search': text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [project['name'] for project in response.json()['results']]
+    
+    def test_ranked_by_relevance(self):
+        self.assertEqual(self._search('parque solar'), ['Parque Solar Córdoba', 'Techo Comunitario'])
+    
+    def test_prefix_and_accents(self):
+        self.assertEqual(self._search('mendo'), ['Planta Mendoza'])
+        self.assertEqual(self._search('cordoba bifacial'), ['Parque Solar Córdoba'])
+    
+    def test_updated_on_save(self):
+        project = SolarProject.objects.get(name='Planta Mendoza')
+        project.description = 'Ahora con baterías'
+        project.save()
+        self.assertEqual(self._search('baterias'), ['Planta Mendoza'])
+        self.assertEqual(self._search('seguidores'), [])
+    
+    def test_explicit_ordering(self):
+        self.assertEqual(
+            self._search('córdoba', ordering='name'), ['Parque Solar Córdoba', 'Techo Comunitario']
+        )
+        self.assertEqual(
+            self._search('córdoba', ordering='-name'), ['Techo Comunitario', 'Parque Solar Córdoba']
+        )
+    
+    def test_query_without_words(self):
+        self.assertEqual(
+            self._search('¿?', ordering='name'), ['Parque Solar Córdoba', 'Planta Mendoza', 'Techo Comunitario']
+        )
+        self.assertEqual(len(self._search(' - ')), 3)
+
+
+class SolarProjectCursorPaginationTests(TestCase):
+    """
+    ?pagination=cursor walks the list by (created_at, id) without a count
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        for index in range(45):
+            create_project(name=f'Proyecto {index}')
+    
+    def test_page_number_is_default(self):
+        data = self.client.get('/api/v1/projects/').json()
+        self.assertEqual(data['count'], 45)
+    
+    def test_cursor_walks_every_project_once(self):
+        response = self.client.get('/api/v1/projects/', {'pagination': 'cursor'})
+        names = []
+        while True:
+            data = response.json()
+            self.assertNotIn('count', data)
+            names.extend(project['name'] for project in data['results'])
+            if not data['next']:
+                break
+            response = self.client.get(data['next'])
+        self.assertEqual(names, [project.name for project in SolarProject.objects.order_by('-created_at', '-id')])
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class SolarProjectConditionalGetTests(TestCase):
+    """
+    Project endpoints answer 304 while the project and its media are unchanged
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.project = create_project()
+        self.image = ProjectImage.objects.create(project=self.project, image='images/projects/a.jpg')
+    
+    def test_validators_are_required(self):
+        class IncompleteView(ConditionalGetMixin, generics.ListAPIView):
+            queryset = SolarProject.objects.all()
+        
+        with self.assertRaises(TypeError):
+            IncompleteView()
+    
+    def _revalidate(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    
+    def test_detail_not_modified(self):
+        url = f'/api/v1/projects/{self.project.pk}/'
+        response = self.client.get(url)
+        # Only the validator query: no project, image or video reads
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+            )
+    
+    def test_media_changes_invalidate(self):
+        url = f'/api/v1/projects/{self.project.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.image.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+    
+    def test_list_not_modified(self):
+        self.assertEqual(self._revalidate('/api/v1/projects/').status_code, 304)
+        etag = self.client.get('/api/v1/projects/')['ETag']
+        self.project.name = 'Proyecto renombrado'
+        self.project.save()
+        self.assertEqual(self.client.get('/api/v1/projects/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Public project endpoints are served from the response cache until a
+    project or its media change
+    """
+    
+    def setUp(self):
+        cache.clear()
+        response_cache.counters.reset()
+        self.client = APIClient()
+        self.project = create_project()
+    
+    def test_hit_runs_no_queries(self):
+        url = f'/api/v1/projects/{self.project.pk}/'
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(response_cache.stats()['hits'], 2)
+    
+    def test_query_string_is_normalized(self):
+        self.client.get('/api/v1/projects/?status=funding&ordering=name')
+        with self.assertNumQueries(0):
+            self.client.get('/api/v1/projects/?ordering=name&status=funding')
+    
+    def test_changes_invalidate(self):
+        other = create_project(name='Otro', location='Salta')
+        detail_url = f'/api/v1/projects/{self.project.pk}/'
+        self.client.get('/api/v1/projects/')
+        self.client.get(detail_url)
+        
+        other.name = 'Otro renombrado'
+        other.save()
+        # Only the list depends on the other project
+        with self.assertNumQueries(0):
+            self.client.get(detail_url)
+        self.assertIn('Otro renombrado', self.client.get('/api/v1/projects/').content.decode())
+        
+        ProjectImage.objects.create(project=self.project, image='images/projects/a.jpg')
+        self.assertEqual(len(self.client.get(detail_url).json()['images']), 1)
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class SolarProjectStatsTests(TestCase):
+    
+    def test_single_query(self):
+        for index, status in enumerate(['operational', 'funding', 'funding', 'development']):
+            create_project(
+                name=f'Proyecto {index}', status=status,
+                total_power_installed=Decimal('10'), available_power=Decimal('90'),
+            )
+        with self.assertNumQueries(1):
+            response = APIClient().get('/api/v1/projects/stats/')
+        self.assertEqual(response.json(), {
+            'total_projects': 4,
+            'operational_projects': 1,
+            'funding_projects': 2,
+            'total_power_installed_kwp': 40.0,
+            'total_power_available_kwp': 360.0,
+        })
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class ProjectImageVariantsTests(TestCase):
+    """
+    Uploads get metadata-free, content-named variants exposed as srcset
+    """
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.project = create_project()
+    
+    def _jpeg(self, size=(1000, 500), color=(200, 120, 40), orientation=1):
+        exif = Image.Exif()
+        exif[0x010F] = 'Cámara'  # Make
+        exif[0x0112] = orientation
+        exif[0x8825] = {0x0001: 'S', 0x0003: 'W'}  # GPS latitude/longitude refs
+        buffer = io.BytesIO()
+        Image.new('RGB', size, color).save(buffer, 'JPEG', exif=exif, comment=b'Juan')
+        return buffer.getvalue()
+    
+    def _upload(self, size=(1000, 500), **kwargs):
+        # Variants are built when the upload commits
+        with self.captureOnCommitCallbacks(execute=True):
+            return ProjectImage.objects.create(
+                project=self.project, is_featured=True,
+                image=SimpleUploadedFile('foto.jpg', self._jpeg(size, **kwargs), content_type='image/jpeg')
+            )
+    
+    def _assert_stripped(self, name, size):
+        with default_storage.open(name) as file, Image.open(file) as image:
+            self.assertEqual(image.size, size)
+            self.assertEqual(len(image.getexif()), 0)
+            self.assertNotIn('comment', image.info)
+    
+    def test_variants_are_resized_and_stripped(self):
+        project_image = self._upload()
+        formats = len(images.output_formats())
+        self.assertEqual(
+            [variant['width'] for variant in project_image.variants],
+            [width for width in (320, 640, 1000) for _ in range(formats)]
+        )
+        for variant in project_image.variants:
+            self.assertRegex(variant['name'], r'^images/projects/derived/foto-\d+w\.[0-9a-f]{16}\.(jpg|webp)$')
+            with default_storage.open(variant['name']) as file, Image.open(file) as image:
+                self.assertEqual(image.size, (variant['width'], variant['height']))
+                self.assertEqual(len(image.getexif()), 0)
+        
+        # Same content, same names: nothing is written twice
+        self.assertEqual(self._upload().variants, project_image.variants)
+    
+    def test_srcset_in_list_and_detail(self):
+        self._upload()
+        project = APIClient().get('/api/v1/projects/').json()['results'][0]
+        srcset = project['featured_image_srcset']['image/jpeg']
+        self.assertEqual([candidate.split()[1] for candidate in srcset.split(', ')], ['320w', '640w', '1000w'])
+        self.assertTrue(srcset.startswith('http://testserver/media/images/projects/derived/'))
+        
+        detail = APIClient().get(f'/api/v1/projects/{self.project.pk}/').json()
+        self.assertEqual(detail['images'][0]['srcset'], project['featured_image_srcset'])
+    
+    def test_original_is_stripped(self):
+        self._assert_stripped(self._upload().image.name, (1000, 500))
+        # The orientation is applied to the pixels before the tag is dropped
+        rotated = self._upload(size=(300, 200), orientation=6)
+        self._assert_stripped(rotated.image.name, (200, 300))
+        self.assertEqual([variant['width'] for variant in rotated.variants][-1], 200)
+    
+    def test_replaced_variants_are_deleted(self):
+        project_image = self._upload()
+        previous = [variant['name'] for variant in project_image.variants]
+        project_image.image = SimpleUploadedFile('foto.jpg', self._jpeg(color=(10, 20, 30)))
+        with self.captureOnCommitCallbacks(execute=True):
+            project_image.save()
+        for name in previous:
+            self.assertFalse(default_storage.exists(name), name)
+        for variant in project_image.variants:
+            self.assertTrue(default_storage.exists(variant['name']))
+    
+    def test_rolled_back_upload_writes_no_variants(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                ProjectImage.objects.create(
+                    project=self.project, image=SimpleUploadedFile('foto.jpg', self._jpeg())
+                )
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, images.VARIANTS_DIR)))
+    
+    def test_shared_variants_are_kept_until_unused(self):
+        first, second = self._upload(), self._upload()
+        names = [variant['name'] for variant in first.variants]
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(all(default_storage.exists(name) for name in names))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(any(default_storage.exists(name) for name in names))
+    
+    def test_command_strips_stored_originals(self):
+        name = default_storage.save('images/projects/antigua.jpg', ContentFile(self._jpeg()))
+        project_image = ProjectImage.objects.create(project=self.project, image=name)
+        self.assertEqual(project_image.variants, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('build_image_variants', '--strip-originals', stdout=io.StringIO())
+        project_image.refresh_from_db()
+        self.assertNotEqual(project_image.image.name, name)
+        self.assertFalse(default_storage.exists(name))
+        self._assert_stripped(project_image.image.name, (1000, 500))
+        self.assertEqual(len(project_image.variants), 3 * len(images.output_formats()))
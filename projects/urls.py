@@ -1,13 +1,14 @@
 from django.urls import path
+from core.response_cache import cache_response
 from . import views
 
 app_name = 'projects'
 
 urlpatterns = [
     # Public endpoints
-    path('projects/', views.SolarProjectListView.as_view(), name='project-list'),
-    path('projects/<int:pk>/', views.SolarProjectDetailView.as_view(), name='project-detail'),
-    path('projects/stats/', views.project_stats_view, name='project-stats'),
+    path('projects/', cache_response('projects')(views.SolarProjectListView.as_view()), name='project-list'),
+    path('projects/<int:pk>/', cache_response('project:{pk}')(views.SolarProjectDetailView.as_view()), name='project-detail'),
+    path('projects/stats/', cache_response('projects')(views.project_stats_view), name='project-stats'),
     
     # Protected endpoints (require authentication and project access)
     path('projects/<int:project_id>/financial/', views.project_financial_info, name='project-financial'),
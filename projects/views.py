@@ -2,10 +2,17 @@ from rest_framework import generics, filters, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Sum
+import abc
+import hashlib
+
+from django.db.models import Count, Max, Prefetch, Q, Sum
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.hashers import check_password
-from .models import SolarProject
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from core.pagination import OptInCursorPagination
+from .models import SolarProject, ProjectImage, ProjectVideo
+from .search import ProjectSearchFilter
 from .serializers import (
     SolarProjectListSerializer, 
     SolarProjectDetailSerializer,
@@ -15,23 +22,97 @@ from .serializers import (
 )
 
 
-class SolarProjectListView(generics.ListAPIView):
+def _validators(*values):
+    """
+    (ETag, Last-Modified) from ``values``: the negotiated media type plus the
+    latest updated_at timestamps and row counts of what a response renders
+    (counts catch deleted rows)
+    """
+    timestamps = [value for value in values if hasattr(value, 'timestamp')]
+    if not timestamps:
+        return None, None
+    digest = hashlib.md5(repr(values).encode(), usedforsecurity=False).hexdigest()[:16]
+    return f'W/"{digest}"', int(max(timestamps).timestamp())
+
+
+def _project_validators(request, project_id):
+    """Validators of a project with its images and videos, in one query"""
+    state = SolarProject.objects.filter(pk=project_id).aggregate(
+        updated_at=Max('updated_at'),
+        images_updated_at=Max('images__updated_at'),
+        image_count=Count('images', distinct=True),
+        videos_updated_at=Max('videos__updated_at'),
+        video_count=Count('videos', distinct=True),
+    )
+    return _validators(request.accepted_media_type, *state.values())
+
+
+def _not_modified(request, etag, last_modified):
+    """304 response when the request validators match, else None"""
+    if etag is None:
+        return None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def _set_validators(response, etag, last_modified):
+    if etag is not None and response.status_code == status.HTTP_200_OK:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class ConditionalGetMixin(abc.ABC):
+    """
+    Conditional GET for API views: ``get_validators()`` is evaluated before the
+    queryset and the serializer, and a matching If-None-Match/If-Modified-Since
+    returns 304 without rendering anything
+    """
+    
+    @abc.abstractmethod
+    def get_validators(self):
+        """``(etag, last_modified)`` of the response, or ``(None, None)`` to skip the check"""
+    
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = _not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return _set_validators(super().get(request, *args, **kwargs), etag, last_modified)
+
+
+class SolarProjectListView(ConditionalGetMixin, generics.ListAPIView):
     """
     API view to list all solar projects with filtering and search capabilities
     """
     queryset = SolarProject.objects.all()
     serializer_class = SolarProjectListSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = OptInCursorPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, ProjectSearchFilter]
     filterset_fields = ['status', 'location']
     search_fields = ['name', 'description', 'location', 'owners']
     ordering_fields = ['created_at', 'name', 'available_power', 'price_per_wp_usd']
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
+    
+    def get_validators(self):
+        """Any project or featured image change (list responses render nothing else)"""
+        projects = SolarProject.objects.aggregate(updated_at=Max('updated_at'), count=Count('id'))
+        images = ProjectImage.objects.filter(is_featured=True).aggregate(
+            updated_at=Max('updated_at'), count=Count('id')
+        )
+        return _validators(self.request.accepted_media_type, *projects.values(), *images.values())
     
     def get_queryset(self):
         """
         Optionally filter projects by available power range
         """
-        queryset = SolarProject.objects.all()
+        # Featured images of the whole page in one query (see get_featured_image)
+        queryset = SolarProject.objects.prefetch_related(
+            Prefetch(
+                'images',
+                queryset=ProjectImage.objects.filter(is_featured=True),
+                to_attr='featured_images'
+            )
+        )
         
         # Filter by minimum available power
         min_power = self.request.query_params.get('min_power')
@@ -67,12 +148,15 @@ class SolarProjectListView(generics.ListAPIView):
         return queryset
 
 
-class SolarProjectDetailView(generics.RetrieveAPIView):
+class SolarProjectDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     API view to retrieve a single solar project with all details
     """
     queryset = SolarProject.objects.all()
     serializer_class = SolarProjectDetailSerializer
+    
+    def get_validators(self):
+        return _project_validators(self.request, self.kwargs['pk'])
 
 
 class SolarProjectCreateView(generics.CreateAPIView):
@@ -104,24 +188,20 @@ def project_stats_view(request):
     API view to get general statistics about solar projects
     """
     try:
-        total_projects = SolarProject.objects.count()
-        operational_projects = SolarProject.objects.filter(status='operational').count()
-        funding_projects = SolarProject.objects.filter(status='funding').count()
-        
-        total_power_installed = SolarProject.objects.aggregate(
-            total=Sum('total_power_installed')
-        )['total'] or 0
-        
-        total_power_available = SolarProject.objects.aggregate(
-            total=Sum('available_power')
-        )['total'] or 0
+        totals = SolarProject.objects.aggregate(
+            total_projects=Count('id'),
+            operational_projects=Count('id', filter=Q(status='operational')),
+            funding_projects=Count('id', filter=Q(status='funding')),
+            total_power_installed=Sum('total_power_installed'),
+            total_power_available=Sum('available_power'),
+        )
         
         stats = {
-            'total_projects': total_projects,
-            'operational_projects': operational_projects,
-            'funding_projects': funding_projects,
-            'total_power_installed_kwp': float(total_power_installed),
-            'total_power_available_kwp': float(total_power_available),
+            'total_projects': totals['total_projects'],
+            'operational_projects': totals['operational_projects'],
+            'funding_projects': totals['funding_projects'],
+            'total_power_installed_kwp': float(totals['total_power_installed'] or 0),
+            'total_power_available_kwp': float(totals['total_power_available'] or 0),
         }
         
         return Response(stats, status=status.HTTP_200_OK)
@@ -176,8 +256,18 @@ def project_financial_info(request, project_id):
             from authentication.models import ProjectAccess
             ProjectAccess.objects.get_or_create(user=request.user, project=project)
         
+        # Revalidación: la respuesta solo depende de los campos del proyecto
+        etag, last_modified = _validators(request.accepted_media_type, project.updated_at)
+        if request.method == 'GET':
+            response = _not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+        
         serializer = SolarProjectFinancialSerializer(project, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        if request.method == 'GET':
+            _set_validators(response, etag, last_modified)
+        return response
     
     except Exception as e:
         return Response(
@@ -208,8 +298,18 @@ def project_simulator_config(request, project_id):
             from authentication.models import ProjectAccess
             ProjectAccess.objects.get_or_create(user=request.user, project=project)
         
+        # Revalidación: la respuesta solo depende de los campos del proyecto
+        etag, last_modified = _validators(request.accepted_media_type, project.updated_at)
+        if request.method == 'GET':
+            response = _not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+        
         serializer = SolarProjectSimulatorConfigSerializer(project, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        if request.method == 'GET':
+            _set_validators(response, etag, last_modified)
+        return response
     
     except Exception as e:
         return Response(
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import InvestmentSimulation, TariffCategory, ExchangeRate, EnergyPrice
+from .models import InvestmentSimulation, TariffCategory, ExchangeRate, EnergyPrice, PricingTier
 
 
 @admin.register(EnergyPrice)
@@ -54,6 +54,15 @@ class ExchangeRateAdmin(admin.ModelAdmin):
     ordering = ['-date']
 
 
+@admin.register(PricingTier)
+class PricingTierAdmin(admin.ModelAdmin):
+    list_display = ['project', 'min_panels', 'price_per_panel_usd', 'updated_at']
+    list_filter = ['project']
+    search_fields = ['project__name']
+    readonly_fields = ['created_at', 'updated_at']
+    ordering = ['project', 'min_panels']
+
+
 @admin.register(InvestmentSimulation)
 class InvestmentSimulationAdmin(admin.ModelAdmin):
     list_display = [
@@ -79,7 +88,8 @@ class InvestmentSimulationAdmin(admin.ModelAdmin):
         ('Parámetros de Entrada', {
             'fields': [
                 'monthly_bill_ars', 'simulation_type',
-                'bill_coverage_percentage', 'number_of_panels', 'investment_amount_usd'
+                'bill_coverage_percentage', 'number_of_panels', 'investment_amount_usd',
+                'target_value'
             ]
         }),
         ('Resultados de la Simulación', {
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class SimulationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'simulations'
-    verbose_name = 'Simulaciones de Inversión'
\ No newline at end of file
+    verbose_name = 'Simulaciones de Inversión'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,277 @@
+"""
+Vectorized batch simulation engine
+
+Computes many simulation scenarios in one NumPy pass using the same formulas as
+SolarInvestmentCalculator, without building an InvestmentSimulation instance per
+scenario. Results are returned in columnar form (one list per field) so they can
+be serialized straight to JSON.
+"""
+
+import copy
+from typing import Dict, Any, Sequence
+
+import numpy as np
+
+from .pricing import PricingSnapshot
+
+# Sentinel payback used by the engine when there are no savings
+NO_PAYBACK_YEARS = 999.0
+
+# Output columns and the decimal places of the matching InvestmentSimulation fields
+RESULT_COLUMNS = {
+    'number_of_panels': 0,
+    'total_investment_usd': 2,
+    'total_investment_ars': 2,
+    'installed_power_kw': 3,
+    'annual_generation_kwh': 2,
+    'monthly_generation_kwh': 2,
+    'monthly_savings_ars': 2,
+    'annual_savings_ars': 2,
+    'monthly_savings_usd': 2,
+    'annual_savings_usd': 2,
+    'payback_period_years': 2,
+    'bill_coverage_achieved': 2,
+    'roi_annual': 2,
+}
+
+# Parameters that can be scaled per scenario by BatchSimulationEngine.perturbed()
+# (panel_price scales every tier of the price table)
+PERTURBABLE_PARAMETERS = (
+    'energy_price_ars',
+    'exchange_rate',
+    'panel_price',
+    'system_performance_factor',
+    'performance_ratio',
+)
+
+# Columns returned by the panel-count curve
+CURVE_COLUMNS = (
+    'number_of_panels',
+    'total_investment_usd',
+    'total_investment_ars',
+    'installed_power_kw',
+    'monthly_savings_ars',
+    'annual_savings_usd',
+    'payback_period_years',
+    'roi_annual',
+    'bill_coverage_achieved',
+)
+
+
+class BatchSimulationEngine:
+    """
+    NumPy counterpart of SolarInvestmentCalculator for many scenarios at once
+    """
+
+    def __init__(self, panel_power_wp, pricing: PricingSnapshot):
+        self.pricing = pricing
+        self.panel_power_kw = float(panel_power_wp) / 1000
+        self.exchange_rate = float(pricing.exchange_rate)
+        self.energy_price_ars = float(pricing.energy_price_ars)
+        self.annual_generation_factor = float(pricing.annual_generation_factor)
+        self.performance_ratio = float(pricing.performance_ratio)
+        self.panel_efficiency_factor = float(pricing.panel_efficiency_factor)
+        self.hours_per_day = float(pricing.hours_per_day)
+        self.days_per_month = float(pricing.days_per_month)
+        self.system_performance_factor = float(pricing.system_performance_factor)
+
+        # Tier table as breakpoint arrays: tier i covers [tier_min[i], tier_max[i]]
+        self.tier_min = np.array([min_panels for min_panels, _ in pricing.price_tiers], dtype=np.int64)
+        self.tier_price = np.array([float(price) for _, price in pricing.price_tiers], dtype=np.float64)
+        self.tier_max = np.append(self.tier_min[1:] - 1, np.iinfo(np.int64).max)
+        self.panel_price = 1.0
+
+    @classmethod
+    def from_calculator(cls, calculator) -> 'BatchSimulationEngine':
+        """Build a batch engine sharing the project and pricing of a SolarInvestmentCalculator"""
+        return cls(calculator.project.panel_power_wp, calculator.pricing)
+
+    def perturbed(self, **factors) -> 'BatchSimulationEngine':
+        """
+        Copy of the engine with parameters multiplied by per-scenario factor arrays.
+
+        The scalar parameters become arrays that broadcast against the scenario
+        inputs, so one simulate_* call evaluates every perturbed variant.
+        """
+        engine = copy.copy(self)
+        for name, factor in factors.items():
+            if name not in PERTURBABLE_PARAMETERS:
+                raise ValueError(f'Unknown engine parameter: {name}')
+            setattr(engine, name, getattr(self, name) * np.asarray(factor, dtype=np.float64))
+        return engine
+
+    @property
+    def savings_per_panel_ars(self) -> float:
+        """Monthly savings (ARS) of a single panel"""
+        return (
+            self.panel_efficiency_factor * self.energy_price_ars *
+            self.hours_per_day * self.days_per_month * self.system_performance_factor
+        )
+
+    def total_investment_usd(self, panels: np.ndarray) -> np.ndarray:
+        """Uniform tiered cost of each panel count"""
+        tier_index = np.searchsorted(self.tier_min, panels, side='right') - 1
+        return panels * self.tier_price[np.clip(tier_index, 0, None)] * self.panel_price
+
+    def max_affordable_panels(self, budget_usd: np.ndarray) -> np.ndarray:
+        """Vectorized inverse of total_investment_usd (see pricing.max_affordable_panels)"""
+        budget = np.asarray(budget_usd, dtype=np.float64)[:, np.newaxis]
+        tier_price = np.multiply.outer(self.panel_price, self.tier_price)
+        affordable = np.minimum(np.floor(budget / tier_price), self.tier_max)
+        affordable = np.where(affordable >= np.maximum(self.tier_min, 1), affordable, 0)
+        return affordable.max(axis=1).astype(np.int64)
+
+    def max_panels_for_bill(self, monthly_bill_ars: np.ndarray) -> np.ndarray:
+        """Panels whose savings equal the bill (100% coverage), rounded half-even like Decimal"""
+        return np.rint(monthly_bill_ars / self.savings_per_panel_ars).astype(np.int64)
+
+    def simulate_by_bill_coverage(self, monthly_bill_ars, coverages) -> Dict[str, np.ndarray]:
+        coverages = np.asarray(coverages, dtype=np.float64)
+        bill = np.broadcast_to(np.asarray(monthly_bill_ars, dtype=np.float64), coverages.shape)
+
+        monthly_generation = bill * (coverages / 100) / self.energy_price_ars
+        installed_power_kw = (
+            monthly_generation / self.hours_per_day / self.system_performance_factor / self.days_per_month
+        )
+        panels = np.floor(installed_power_kw / self.panel_efficiency_factor + 0.5).astype(np.int64)
+
+        total_investment_usd = self.total_investment_usd(panels)
+        return self._finalize(
+            bill, panels, total_investment_usd, installed_power_kw,
+            monthly_generation * 12, monthly_generation
+        )
+
+    def simulate_by_panels(self, monthly_bill_ars, panel_quantities) -> Dict[str, np.ndarray]:
+        requested = np.asarray(panel_quantities, dtype=np.int64)
+        bill = np.broadcast_to(np.asarray(monthly_bill_ars, dtype=np.float64), requested.shape)
+
+        panels = np.minimum(requested, self.max_panels_for_bill(bill))
+        installed_power_kw = panels * self.panel_power_kw
+        annual_generation = installed_power_kw * self.annual_generation_factor * self.performance_ratio
+
+        total_investment_usd = self.total_investment_usd(panels)
+        return self._finalize(
+            bill, panels, total_investment_usd, installed_power_kw,
+            annual_generation, annual_generation / 12
+        )
+
+    def simulate_by_investment(self, monthly_bill_ars, investment_amounts) -> Dict[str, np.ndarray]:
+        amounts = np.asarray(investment_amounts, dtype=np.float64)
+        bill = np.broadcast_to(np.asarray(monthly_bill_ars, dtype=np.float64), amounts.shape)
+
+        # Cap the investment at the cost of 100% bill coverage, as the scalar engine does
+        max_investment_usd = self.total_investment_usd(self.max_panels_for_bill(bill))
+        amounts = np.minimum(amounts, max_investment_usd)
+
+        panels = self.max_affordable_panels(amounts)
+        installed_power_kw = panels * self.panel_power_kw
+        annual_generation = installed_power_kw * self.annual_generation_factor * self.performance_ratio
+
+        return self._finalize(
+            bill, panels, amounts, installed_power_kw,
+            annual_generation, annual_generation / 12
+        )
+
+    def _finalize(
+        self,
+        bill: np.ndarray,
+        panels: np.ndarray,
+        total_investment_usd: np.ndarray,
+        installed_power_kw: np.ndarray,
+        annual_generation_kwh: np.ndarray,
+        monthly_generation_kwh: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Financial metrics shared by all simulation modes"""
+        total_investment_ars = total_investment_usd * self.exchange_rate
+        monthly_savings_ars = panels * self.savings_per_panel_ars
+        annual_savings_ars = monthly_savings_ars * 12
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payback = np.where(
+                annual_savings_ars > 0, total_investment_ars / annual_savings_ars, NO_PAYBACK_YEARS
+            )
+            roi_annual = np.where(
+                total_investment_ars > 0, annual_savings_ars / total_investment_ars * 100, 0.0
+            )
+            bill_coverage = np.where(bill > 0, monthly_savings_ars / bill * 100, 0.0)
+
+        return {
+            'number_of_panels': panels,
+            'total_investment_usd': total_investment_usd,
+            'total_investment_ars': total_investment_ars,
+            'installed_power_kw': installed_power_kw,
+            'annual_generation_kwh': annual_generation_kwh,
+            'monthly_generation_kwh': monthly_generation_kwh,
+            'monthly_savings_ars': monthly_savings_ars,
+            'annual_savings_ars': annual_savings_ars,
+            'monthly_savings_usd': monthly_savings_ars / self.exchange_rate,
+            'annual_savings_usd': monthly_savings_ars / self.exchange_rate * 12,
+            'payback_period_years': payback,
+            'bill_coverage_achieved': bill_coverage,
+            'roi_annual': roi_annual,
+        }
+
+    def run(
+        self,
+        monthly_bill_ars,
+        bill_coverage_percentages: Sequence = (),
+        panel_quantities: Sequence = (),
+        investment_amounts: Sequence = ()
+    ) -> Dict[str, Any]:
+        """
+        Compute every scenario and return the results in columnar form
+        """
+        parts = []
+        for simulation_type, parameters, simulate in (
+            ('bill_coverage', bill_coverage_percentages, self.simulate_by_bill_coverage),
+            ('panels', panel_quantities, self.simulate_by_panels),
+            ('investment', investment_amounts, self.simulate_by_investment),
+        ):
+            if len(parameters):
+                parts.append((simulation_type, parameters, simulate(monthly_bill_ars, parameters)))
+
+        return to_columnar(parts)
+
+    def curve(self, monthly_bill_ars, max_points: int) -> Dict[str, Any]:
+        """
+        Investment, savings, payback and ROI for every panel count from 1 up to
+        100% bill coverage (capped at ``max_points``), in columnar form
+        """
+        max_panels = int(self.max_panels_for_bill(np.asarray([monthly_bill_ars], dtype=np.float64))[0])
+        panels = np.arange(1, min(max_panels, max_points) + 1, dtype=np.int64)
+
+        results = self.simulate_by_panels(monthly_bill_ars, panels)
+        columns = {name: round_column(name, results[name]) for name in CURVE_COLUMNS}
+        columns['max_panels_for_bill_coverage'] = max_panels
+        columns['truncated'] = max_panels > max_points
+        return columns
+
+
+def round_column(name: str, values: np.ndarray) -> list:
+    """Round a result column to the decimal places of its model field"""
+    decimal_places = RESULT_COLUMNS[name]
+    if decimal_places:
+        return np.round(values.astype(np.float64), decimal_places).tolist()
+    return values.astype(np.int64).tolist()
+
+
+def to_columnar(parts) -> Dict[str, Any]:
+    """
+    Concatenate (simulation_type, parameters, results) blocks into JSON-ready columns
+    """
+    columns: Dict[str, Any] = {
+        'simulation_type': [],
+        'parameter': [],
+    }
+    for simulation_type, parameters, _ in parts:
+        columns['simulation_type'].extend([simulation_type] * len(parameters))
+        columns['parameter'].extend(float(value) for value in parameters)
+
+    for name in RESULT_COLUMNS:
+        if parts:
+            values = np.concatenate([results[name] for _, _, results in parts])
+        else:
+            values = np.empty(0)
+        columns[name] = round_column(name, values)
+
+    return columns
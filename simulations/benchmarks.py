@@ -0,0 +1,248 @@
+"""
+Benchmark suite for the simulation engine and the main API endpoints
+
+Used by ``manage.py bench``. Each case is timed over a number of iterations
+(p50/p95/mean), then run once more to count database queries and once under
+tracemalloc to record the peak memory allocated by the call. Results can be
+stored as a JSON baseline and later runs compared against it.
+
+The simulation result cache and the response cache are disabled while
+benchmarking so repeated calls measure the computation and its queries, not a
+cache lookup.
+"""
+
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import django
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Database hosts considered local (an empty HOST is the local Unix socket)
+LOCAL_HOSTS = ('', None, 'localhost', '127.0.0.1', '::1')
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_WARMUP = 3
+
+# Relative slowdown (p50) or memory growth tolerated before a case is a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Timing differences below this are treated as noise (milliseconds)
+MIN_REGRESSION_MS = 0.05
+
+# Number of projects created for the list endpoints
+FIXTURE_PROJECTS = 20
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    func: Callable[[], Any]
+    iterations: Optional[int] = None
+
+
+class BenchmarkFixture:
+    """
+    Data used by the benchmark cases. Create it inside a transaction that is
+    rolled back afterwards (see the bench command).
+    """
+
+    def __init__(self):
+        # Importar aquí para evitar imports circulares
+        from projects.models import SolarProject
+        from .models import TariffCategory, ExchangeRate, EnergyPrice
+
+        self.projects = [
+            SolarProject.objects.create(
+                name=f'Benchmark {index}',
+                description='Proyecto de benchmark',
+                location='Benchmark',
+                total_power_installed=Decimal('100'),
+                total_power_projected=Decimal('500'),
+                available_power=Decimal('300'),
+                price_per_wp_usd=Decimal('1'),
+                panel_power_wp=Decimal('550'),
+                owners='Benchmark',
+            )
+            for index in range(FIXTURE_PROJECTS)
+        ]
+        self.project = self.projects[0]
+        self.tariff_category, _ = TariffCategory.objects.get_or_create(
+            code='BENCH', defaults={'name': 'Benchmark'}
+        )
+        if not ExchangeRate.objects.exists():
+            ExchangeRate.objects.create(rate=Decimal('1330.00'), date=date.today(), source='Benchmark')
+        if not EnergyPrice.objects.exists():
+            EnergyPrice.objects.create(price_ars_per_kwh=Decimal('101.25'), effective_date=date.today())
+
+
+def build_cases(fixture: BenchmarkFixture) -> List[BenchmarkCase]:
+    """Engine and endpoint cases, in run order"""
+    from .serializers import InvestmentSimulationSerializer, SimulationResultSerializer
+    from .simulation_engine import SolarInvestmentCalculator
+
+    calculator = SolarInvestmentCalculator(fixture.project, fixture.tariff_category, fixed_point=False)
+    fixed_point_calculator = SolarInvestmentCalculator(fixture.project, fixture.tariff_category, fixed_point=True)
+    bill = Decimal('500000.00')
+    client = Client(HTTP_HOST='localhost')
+
+    def compare_payload(size: int) -> Dict[str, Any]:
+        per_mode = max(size // 3, 1)
+        return {
+            'project_id': fixture.project.id,
+            'tariff_category_id': fixture.tariff_category.id,
+            'monthly_bill_ars': str(bill),
+            'bill_coverage_percentages': [round(1 + 99 * i / per_mode, 2) for i in range(per_mode)],
+            'panel_quantities': [1 + i for i in range(per_mode)],
+            'investment_amounts': [round(500 + 100 * i, 2) for i in range(per_mode)],
+        }
+
+    def post(path: str, payload: Dict[str, Any]) -> Callable[[], Any]:
+        body = json.dumps(payload)
+        return lambda: client.post(path, body, content_type='application/json')
+
+    def get(path: str) -> Callable[[], Any]:
+        return lambda: client.get(path)
+
+    return [
+        BenchmarkCase('engine.simulate_by_bill_coverage',
+                      lambda: calculator.simulate_by_bill_coverage(bill, Decimal('60'))),
+        BenchmarkCase('engine.simulate_by_panels',
+                      lambda: calculator.simulate_by_panels(bill, 12)),
+        BenchmarkCase('engine.simulate_by_investment',
+                      lambda: calculator.simulate_by_investment(bill, Decimal('6000'))),
+        # Same modes through the integer engine (compare with the Decimal cases above)
+        BenchmarkCase('engine.fixed_point.simulate_by_bill_coverage',
+                      lambda: fixed_point_calculator.simulate_by_bill_coverage(bill, Decimal('60'))),
+        BenchmarkCase('engine.fixed_point.simulate_by_panels',
+                      lambda: fixed_point_calculator.simulate_by_panels(bill, 12)),
+        BenchmarkCase('engine.fixed_point.simulate_by_investment',
+                      lambda: fixed_point_calculator.simulate_by_investment(bill, Decimal('6000'))),
+        BenchmarkCase('engine.calculate[panels]',
+                      lambda: calculator.calculate('panels', bill, 12)),
+        BenchmarkCase('serialize.model[30]',
+                      lambda: InvestmentSimulationSerializer(
+                          [calculator.simulate_by_panels(bill, panels) for panels in range(1, 31)], many=True
+                      ).data),
+        BenchmarkCase('serialize.result[30]',
+                      lambda: SimulationResultSerializer(
+                          [calculator.calculate('panels', bill, panels) for panels in range(1, 31)], many=True,
+                          context={'project': fixture.project, 'tariff_category': fixture.tariff_category}
+                      ).data),
+        BenchmarkCase('engine.calculate_bill_based_limits',
+                      lambda: calculator._calculate_bill_based_limits(bill)),
+        BenchmarkCase('api.compare[3]', post('/api/v1/simulations/compare/', compare_payload(3))),
+        BenchmarkCase('api.compare[30]', post('/api/v1/simulations/compare/', compare_payload(30))),
+        BenchmarkCase('api.compare[300]', post('/api/v1/simulations/compare/', compare_payload(300)),
+                      iterations=10),
+        BenchmarkCase('api.compare_batch[300]', post('/api/v1/simulations/compare/batch/', compare_payload(300))),
+        BenchmarkCase('api.compare_batch[3000]', post('/api/v1/simulations/compare/batch/', compare_payload(3000))),
+        BenchmarkCase('api.calculate_limits', post('/api/v1/calculate-limits/', {
+            'project_id': fixture.project.id,
+            'tariff_category_id': fixture.tariff_category.id,
+            'monthly_bill_ars': str(bill),
+        })),
+        BenchmarkCase('api.projects.list', get('/api/v1/projects/')),
+        BenchmarkCase('api.projects.stats', get('/api/v1/projects/stats/')),
+        BenchmarkCase('api.tariff_categories.list', get('/api/v1/tariff-categories/')),
+        BenchmarkCase('api.exchange_rates.list', get('/api/v1/exchange-rates/')),
+        BenchmarkCase('api.simulations.stats', get('/api/v1/simulations/stats/')),
+    ]
+
+
+def measure(case: BenchmarkCase, iterations: int = DEFAULT_ITERATIONS, warmup: int = DEFAULT_WARMUP) -> Dict[str, Any]:
+    """Time, query count and peak allocation of one case"""
+    iterations = case.iterations or iterations
+    for _ in range(warmup):
+        case.func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        case.func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # The query log is bounded; with DEBUG on the timed calls may have filled it
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        case.func()
+
+    tracemalloc.start()
+    try:
+        case.func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(samples), 4),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'queries': len(queries),
+        'allocated_kb': round(peak / 1024, 1),
+    }
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """Describe every case that got slower, used more queries or allocated more than its baseline"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if (
+            current['p50_ms'] > previous['p50_ms'] * (1 + threshold)
+            and current['p50_ms'] - previous['p50_ms'] > MIN_REGRESSION_MS
+        ):
+            regressions.append(f"{name}: p50 {previous['p50_ms']} ms -> {current['p50_ms']} ms")
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        if current['allocated_kb'] > previous['allocated_kb'] * (1 + threshold):
+            regressions.append(f"{name}: allocated {previous['allocated_kb']} KB -> {current['allocated_kb']} KB")
+    return regressions
+
+
+def environment() -> Dict[str, str]:
+    return {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'machine': platform.machine(),
+        'database': connection.vendor,
+    }
+
+
+def is_local_database() -> bool:
+    """Whether the default connection is SQLite or a server on this machine"""
+    if connection.vendor == 'sqlite':
+        return True
+    return connection.settings_dict.get('HOST') in LOCAL_HOSTS
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_report(path: Path, results: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump({'environment': environment(), 'results': results}, report_file, indent=2, sort_keys=True)
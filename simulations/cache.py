@@ -0,0 +1,194 @@
+"""
+In-process caches for the simulation engine
+
+Current value lookups (exchange rate, energy price)
+---------------------------------------------------
+Values are kept in a module-level dictionary so the hot read path is a dict
+lookup plus a clock comparison. Freshness across serverless instances is kept
+by two mechanisms:
+
+- ``post_save``/``post_delete`` signals (see signals.py) drop the local entry
+  and bump a version counter in Django's cache backend.
+- Every ``PRICING_CACHE_CHECK_INTERVAL`` seconds an entry compares its version
+  with that counter (a single cache ``get``) and reloads when it changed. When
+  the cache backend is not shared between instances, entries are reloaded from
+  the database at most ``PRICING_CACHE_MAX_AGE`` seconds after being loaded.
+
+Simulation results
+------------------
+``SimulationResultCache`` is a bounded LRU of core ``SimulationResult`` records keyed by
+project, project version, tariff, mode, quantized input and pricing version, so
+repeat scenarios (round bill amounts, common coverages) skip the engine. A new
+pricing version makes old keys unreachable; the signal handlers also clear it.
+
+Project economics
+-----------------
+``project_economics`` keeps the per-panel ``ProjectEconomics`` of each project,
+keyed by project, project version and pricing version. It is small (one entry
+per active project) and is not affected by ``SIMULATION_CACHE_SIZE``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'simulations:current-value-version:'
+
+# Default staleness bounds in seconds (overridable in settings)
+DEFAULT_CHECK_INTERVAL = 5
+DEFAULT_MAX_AGE = 60
+
+
+class _Entry:
+    __slots__ = ('value', 'version', 'loaded_at', 'checked_at')
+
+    def __init__(self, value, version, now):
+        self.value = value
+        self.version = version
+        self.loaded_at = now
+        self.checked_at = now
+
+
+class CurrentValueCache:
+    """
+    Process-wide cache of values that change rarely and are read on every request
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any], cache_none: bool = True) -> Any:
+        """
+        Return the cached value for ``key``, calling ``loader`` when missing or stale.
+
+        With ``cache_none=False`` a None result is returned but not stored: use it
+        for keys built from request input, which would otherwise grow the cache
+        without bound.
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self._check_interval():
+            return entry.value
+        return self._revalidate(key, loader, entry, now, cache_none)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the local entry and signal other instances through the version counter"""
+        with self._lock:
+            self._entries.pop(key, None)
+        version_key = VERSION_KEY_PREFIX + key
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Counter not initialized yet (or evicted)
+            cache.add(version_key, 1, timeout=None)
+
+    def version(self, key: str) -> Optional[int]:
+        """Current shared version of ``key`` (None until it is first invalidated)"""
+        return cache.get(VERSION_KEY_PREFIX + key)
+
+    def clear(self) -> None:
+        """Drop every local entry (other instances are not notified)"""
+        with self._lock:
+            self._entries.clear()
+
+    def _revalidate(self, key, loader, entry, now, cache_none=True):
+        version = self.version(key)
+        with self._lock:
+            if (
+                entry is not None
+                and entry.version == version
+                and now - entry.loaded_at < self._max_age()
+            ):
+                entry.checked_at = now
+                return entry.value
+
+            value = loader()
+            if value is None and not cache_none:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = _Entry(value, version, now)
+            return value
+
+    @staticmethod
+    def _check_interval() -> float:
+        return getattr(settings, 'PRICING_CACHE_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+
+    @staticmethod
+    def _max_age() -> float:
+        return getattr(settings, 'PRICING_CACHE_MAX_AGE', DEFAULT_MAX_AGE)
+
+
+current_values = CurrentValueCache()
+
+
+# Default number of simulation results kept in memory (overridable in settings)
+DEFAULT_SIMULATION_CACHE_SIZE = 1024
+
+
+class SimulationResultCache:
+    """
+    Thread-safe bounded LRU cache with hit/miss counters
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self._maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        if self._maxsize is not None:
+            return self._maxsize
+        return getattr(settings, 'SIMULATION_CACHE_SIZE', DEFAULT_SIMULATION_CACHE_SIZE)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for ``key`` or None, marking it as recently used"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value``, evicting the least recently used entries beyond maxsize"""
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+simulation_results = SimulationResultCache()
+
+
+# Number of projects whose unit economics are kept in memory
+DEFAULT_ECONOMICS_CACHE_SIZE = 256
+
+project_economics = SimulationResultCache(maxsize=DEFAULT_ECONOMICS_CACHE_SIZE)
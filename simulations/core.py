@@ -0,0 +1,428 @@
+"""
+Pure simulation core
+
+The calculation part of SolarInvestmentCalculator without any Django import: it
+takes plain inputs (panel power and a PricingSnapshot) and returns
+``SimulationResult`` records with ``__slots__``. Both are cheap to pickle, so the
+core can run in worker processes without ``django.setup()`` or a database
+connection. SolarInvestmentCalculator is the adapter that turns results into
+InvestmentSimulation instances for the views.
+"""
+
+import functools
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Optional, Tuple
+
+from .fixed_point import FixedPointEngine, to_decimal
+from .pricing import PriceTier, PricingSnapshot, tier_price, total_investment, max_affordable_panels
+
+# Modes that solve for the panel count reaching a target (value stored in target_value)
+TARGET_SIMULATION_TYPES = ('target_monthly_savings', 'target_payback_years', 'target_roi')
+
+
+class TargetNotReachable(ValueError):
+    """No panel count within the bill limit reaches the requested target"""
+
+
+class SimulationResult:
+    """
+    Inputs and computed values of one simulation (the InvestmentSimulation
+    fields filled by the engine).
+
+    Immutable: results are shared through the simulation result cache, and a
+    record with ``__slots__`` is much cheaper to build and render than an
+    unsaved model instance for calculations that are never persisted.
+    """
+    __slots__ = (
+        'simulation_type',
+        'monthly_bill_ars',
+        'bill_coverage_percentage',
+        'number_of_panels',
+        'investment_amount_usd',
+        'target_value',
+        'total_investment_usd',
+        'total_investment_ars',
+        'installed_power_kw',
+        'annual_generation_kwh',
+        'monthly_generation_kwh',
+        'monthly_savings_ars',
+        'annual_savings_ars',
+        'payback_period_years',
+        'bill_coverage_achieved',
+        'roi_annual',
+        'exchange_rate_used',
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.pop(name, None))
+        if values:
+            raise TypeError(f'Unknown simulation result fields: {", ".join(values)}')
+
+    def __setattr__(self, name, value):
+        raise AttributeError('SimulationResult is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('SimulationResult is immutable')
+
+    def __reduce__(self):
+        return (_restore_result, (self.as_dict(),))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @property
+    def monthly_savings_usd(self) -> Decimal:
+        """Monthly savings in USD (same as InvestmentSimulation.monthly_savings_usd)"""
+        return self.monthly_savings_ars / self.exchange_rate_used
+
+    @property
+    def annual_savings_usd(self) -> Decimal:
+        """Annual savings in USD: (monthly_savings_ars / exchange_rate) * 12"""
+        return (self.monthly_savings_ars / self.exchange_rate_used) * 12
+
+    def __repr__(self):
+        return (
+            f'SimulationResult({self.simulation_type}, panels={self.number_of_panels}, '
+            f'investment_usd={self.total_investment_usd})'
+        )
+
+
+def _restore_result(values: Dict[str, Any]) -> SimulationResult:
+    return SimulationResult(**values)
+
+
+@dataclass(frozen=True)
+class ProjectEconomics:
+    """
+    Per-panel unit economics of a project under one pricing snapshot.
+
+    Savings and generation are linear in the panel count and the cost is
+    piecewise linear by tier, so with these values every simulation reduces to
+    a few multiplications. Built once per (project version, pricing version).
+    """
+    panel_power_wp: Decimal
+    panel_power_kw: Decimal
+    annual_generation_per_panel_kwh: Decimal
+    savings_per_panel_ars: Decimal
+    exchange_rate: Decimal
+    price_tiers: Tuple[PriceTier, ...]
+    pricing_version: str
+
+    @classmethod
+    def build(cls, panel_power_wp: Decimal, pricing: PricingSnapshot) -> 'ProjectEconomics':
+        panel_power_kw = panel_power_wp / 1000
+        return cls(
+            panel_power_wp=panel_power_wp,
+            panel_power_kw=panel_power_kw,
+            # kW × kWh/kWp/año × performance ratio (exact: short decimal factors)
+            annual_generation_per_panel_kwh=(
+                panel_power_kw * pricing.annual_generation_factor * pricing.performance_ratio
+            ),
+            savings_per_panel_ars=pricing.savings_per_panel_ars,
+            exchange_rate=pricing.exchange_rate,
+            price_tiers=pricing.price_tiers,
+            pricing_version=pricing.version,
+        )
+
+
+class SimulationCore:
+    """
+    Decimal (or fixed-point) simulation formulas for one panel model and pricing snapshot
+    """
+
+    def __init__(
+        self,
+        panel_power_wp: Decimal,
+        pricing: PricingSnapshot,
+        fixed_point: bool = False,
+        economics: Optional[ProjectEconomics] = None
+    ):
+        self.panel_power_wp = panel_power_wp
+        self.pricing = pricing
+        self.fixed_point = fixed_point
+        self.economics = economics or ProjectEconomics.build(panel_power_wp, pricing)
+        self.exchange_rate = pricing.exchange_rate
+        self.price_tiers = pricing.price_tiers
+
+    @functools.cached_property
+    def fixed_point_engine(self) -> FixedPointEngine:
+        return FixedPointEngine(self.panel_power_wp, self.pricing)
+
+    def simulate_by_bill_coverage(self, monthly_bill_ars: Decimal, bill_coverage_percentage: Decimal) -> SimulationResult:
+        """
+        Simulate investment based on desired bill coverage percentage
+        Using new formulas:
+        - energia_generada = monto_factura_total / precio_energia
+        - potencia = energia_generada / 24 / 0.19 / 30
+        - paneles = potencia / 0.66
+        """
+        if self.fixed_point:
+            return SimulationResult(
+                simulation_type='bill_coverage',
+                monthly_bill_ars=monthly_bill_ars,
+                bill_coverage_percentage=bill_coverage_percentage,
+                **to_decimal(self.fixed_point_engine.simulate_by_bill_coverage(monthly_bill_ars, bill_coverage_percentage))
+            )
+
+        # Calculate target monthly savings in ARS
+        target_monthly_savings_ars = monthly_bill_ars * (bill_coverage_percentage / 100)
+
+        # Nueva fórmula: energía_generada = monto_factura_total / precio_energia
+        # target_monthly_savings_ars es el equivalente al "monto de factura" que queremos cubrir
+        pricing = self.pricing
+        required_monthly_generation_kwh = target_monthly_savings_ars / pricing.energy_price_ars
+
+        # Nueva fórmula: potencia = energia_generada / 24 / 0.19 / 30
+        required_power_kw = (
+            required_monthly_generation_kwh /
+            pricing.hours_per_day /
+            pricing.system_performance_factor /
+            pricing.days_per_month
+        )
+
+        # Nueva fórmula: paneles = potencia / 0.66
+        number_of_panels = int(
+            (required_power_kw / pricing.panel_efficiency_factor).to_integral_value(ROUND_HALF_UP)
+        )
+
+        # Calculate actual generation based on the new formula
+        actual_monthly_generation = required_monthly_generation_kwh
+        actual_annual_generation = actual_monthly_generation * 12
+
+        # Calculate investment using tiered pricing
+        total_investment_usd = self.total_investment(number_of_panels)
+
+        return self._finalize(
+            'bill_coverage', monthly_bill_ars, number_of_panels, total_investment_usd,
+            required_power_kw, actual_annual_generation, actual_monthly_generation,
+            bill_coverage_percentage=bill_coverage_percentage
+        )
+
+    def simulate_by_panels(self, monthly_bill_ars: Decimal, number_of_panels: int) -> SimulationResult:
+        """
+        Simulate investment based on number of panels with tiered pricing.
+        Applies bill-based restrictions to prevent excessive installations.
+        """
+        if self.fixed_point:
+            return SimulationResult(
+                simulation_type='panels',
+                monthly_bill_ars=monthly_bill_ars,
+                **to_decimal(self.fixed_point_engine.simulate_by_panels(monthly_bill_ars, number_of_panels))
+            )
+
+        # Apply bill-based restrictions to number of panels
+        number_of_panels = self.apply_bill_restrictions(number_of_panels, monthly_bill_ars)
+
+        # Calculate system specifications from the per-panel values
+        actual_power_kw = number_of_panels * self.economics.panel_power_kw
+        actual_annual_generation = number_of_panels * self.economics.annual_generation_per_panel_kwh
+        actual_monthly_generation = actual_annual_generation / 12
+
+        # Calculate investment using tiered pricing
+        total_investment_usd = self.total_investment(number_of_panels)
+
+        return self._finalize(
+            'panels', monthly_bill_ars, number_of_panels, total_investment_usd,
+            actual_power_kw, actual_annual_generation, actual_monthly_generation
+        )
+
+    def simulate_by_investment(self, monthly_bill_ars: Decimal, investment_amount_usd: Decimal) -> SimulationResult:
+        """
+        Simulate investment based on investment amount
+        Applies bill-based restrictions to prevent excessive investments.
+        """
+        if self.fixed_point:
+            return SimulationResult(
+                simulation_type='investment',
+                monthly_bill_ars=monthly_bill_ars,
+                **to_decimal(self.fixed_point_engine.simulate_by_investment(monthly_bill_ars, investment_amount_usd))
+            )
+
+        # Check investment limits based on bill (100% coverage limit)
+        limits = self.bill_based_limits(monthly_bill_ars)
+        max_panels_100_coverage = limits['max_panels_for_bill_coverage']
+
+        # Calculate maximum investment based on 100% coverage
+        max_investment_usd_100_coverage = self.total_investment(max_panels_100_coverage)
+
+        # Apply investment restriction to 100% coverage limit
+        investment_amount_usd = min(investment_amount_usd, max_investment_usd_100_coverage)
+
+        # Calculate how many panels can be bought with the investment using tiered pricing
+        # (closed-form inverse over the tier table, handles the cheaper tier boundaries)
+        number_of_panels = max_affordable_panels(investment_amount_usd, self.price_tiers)
+
+        # Calculate power and generation of the panels we can afford
+        actual_power_kw = number_of_panels * self.economics.panel_power_kw
+        actual_annual_generation = number_of_panels * self.economics.annual_generation_per_panel_kwh
+        actual_monthly_generation = actual_annual_generation / 12
+
+        # Keep the user's exact investment amount
+        return self._finalize(
+            'investment', monthly_bill_ars, number_of_panels, investment_amount_usd,
+            actual_power_kw, actual_annual_generation, actual_monthly_generation,
+            investment_amount_usd=investment_amount_usd
+        )
+
+    def simulate_by_target_monthly_savings(self, monthly_bill_ars: Decimal, target_savings_ars: Decimal) -> SimulationResult:
+        """Fewest panels whose monthly savings (ARS) reach the target"""
+        return self._simulate_target('target_monthly_savings', monthly_bill_ars, target_savings_ars)
+
+    def simulate_by_target_payback_years(self, monthly_bill_ars: Decimal, target_years: Decimal) -> SimulationResult:
+        """Fewest panels whose payback period is at most the target (years)"""
+        return self._simulate_target('target_payback_years', monthly_bill_ars, target_years)
+
+    def simulate_by_target_roi(self, monthly_bill_ars: Decimal, target_roi: Decimal) -> SimulationResult:
+        """Fewest panels whose annual ROI (%) is at least the target"""
+        return self._simulate_target('target_roi', monthly_bill_ars, target_roi)
+
+    def _simulate_target(self, simulation_type: str, monthly_bill_ars: Decimal, target_value: Decimal) -> SimulationResult:
+        number_of_panels = self.panels_for_target(simulation_type, monthly_bill_ars, target_value)
+        values = self.simulate_by_panels(monthly_bill_ars, number_of_panels).as_dict()
+        values.update(simulation_type=simulation_type, target_value=target_value)
+        return SimulationResult(**values)
+
+    def panels_for_target(self, simulation_type: str, monthly_bill_ars: Decimal, target_value: Decimal) -> int:
+        """
+        Smallest panel count reaching a target, in O(number of tiers).
+
+        Savings are linear in the panel count, so the savings target is a ceiling
+        division. Payback and ROI only depend on the price of the tier (investment
+        and savings both scale with the count), so the answer is the first panel
+        count of the first tier that meets the target. Counts above the 100%
+        bill coverage limit are not allowed (simulate_by_panels would cap them).
+        """
+        max_panels = self.bill_based_limits(monthly_bill_ars)['max_panels_for_bill_coverage']
+
+        if simulation_type == 'target_monthly_savings':
+            savings_per_panel = self.economics.savings_per_panel_ars
+            number_of_panels = int(target_value // savings_per_panel)
+            if number_of_panels * savings_per_panel < target_value:
+                number_of_panels += 1
+            number_of_panels = max(number_of_panels, 1)
+            if number_of_panels > max_panels:
+                raise TargetNotReachable(
+                    'El ahorro mensual objetivo supera el ahorro máximo permitido por la factura'
+                )
+            return number_of_panels
+
+        for min_panels, _ in self.price_tiers:
+            number_of_panels = max(min_panels, 1)
+            if number_of_panels > max_panels:
+                break
+            result = self.simulate_by_panels(monthly_bill_ars, number_of_panels)
+            if simulation_type == 'target_payback_years':
+                reached = result.payback_period_years <= target_value
+            else:
+                reached = result.roi_annual >= target_value
+            if reached:
+                return number_of_panels
+
+        raise TargetNotReachable(
+            'Ninguna cantidad de paneles dentro del límite de la factura alcanza el objetivo'
+        )
+
+    def _finalize(
+        self,
+        simulation_type: str,
+        monthly_bill_ars: Decimal,
+        number_of_panels: int,
+        total_investment_usd: Decimal,
+        installed_power_kw: Decimal,
+        annual_generation_kwh: Decimal,
+        monthly_generation_kwh: Decimal,
+        **mode_input
+    ) -> SimulationResult:
+        """Savings and financial metrics shared by all simulation modes"""
+        total_investment_ars = total_investment_usd * self.exchange_rate
+
+        # Calculate savings using new formula (based on number of panels)
+        monthly_savings_ars = self.monthly_savings(number_of_panels)
+        annual_savings_ars = monthly_savings_ars * 12
+
+        # Calculate metrics
+        payback_period = total_investment_ars / annual_savings_ars if annual_savings_ars > 0 else Decimal('999')
+        roi_annual = (annual_savings_ars / total_investment_ars) * 100 if total_investment_ars > 0 else Decimal('0')
+        bill_coverage_achieved = (monthly_savings_ars / monthly_bill_ars) * 100
+
+        return SimulationResult(
+            simulation_type=simulation_type,
+            monthly_bill_ars=monthly_bill_ars,
+            number_of_panels=number_of_panels,
+            total_investment_usd=total_investment_usd,
+            total_investment_ars=total_investment_ars,
+            installed_power_kw=installed_power_kw,
+            annual_generation_kwh=annual_generation_kwh,
+            monthly_generation_kwh=monthly_generation_kwh,
+            monthly_savings_ars=monthly_savings_ars,
+            annual_savings_ars=annual_savings_ars,
+            payback_period_years=payback_period,
+            bill_coverage_achieved=bill_coverage_achieved,
+            roi_annual=roi_annual,
+            exchange_rate_used=self.exchange_rate,
+            **mode_input
+        )
+
+    def tier_price(self, number_of_panels: int) -> Decimal:
+        """Price per panel (USD) of the tier that ``number_of_panels`` falls into"""
+        return tier_price(number_of_panels, self.price_tiers)
+
+    def total_investment(self, number_of_panels: int) -> Decimal:
+        """Total investment (USD) with uniform tier pricing"""
+        return total_investment(number_of_panels, self.price_tiers)
+
+    def monthly_savings(self, number_of_panels: int) -> Decimal:
+        """
+        Ahorro Mensual (ARS) = cant_paneles × 0.66 × precio_energia × 24 × 30 × 0.19
+        """
+        return number_of_panels * self.economics.savings_per_panel_ars
+
+    def bill_based_limits(self, monthly_bill_ars: Decimal) -> Dict[str, Any]:
+        """
+        Calculate maximum investment and panels based on monthly bill
+        The investment should not exceed what can be recovered through bill savings
+        """
+        # Calculate maximum reasonable payback period (e.g., 10 years)
+        max_payback_years = 10
+        max_total_savings = monthly_bill_ars * 12 * max_payback_years  # 10 years of bills
+
+        # Convert to USD for investment comparison
+        max_investment_ars = max_total_savings
+        max_investment_usd = max_investment_ars / self.exchange_rate
+
+        # For 100% coverage, we need panels that generate monthly_bill_ars in savings
+        # monthly_bill_ars = number_of_panels * ahorro_por_panel
+        ahorro_por_panel = self.economics.savings_per_panel_ars
+
+        max_panels_for_bill = int((monthly_bill_ars / ahorro_por_panel).to_integral_value())
+
+        return {
+            'max_investment_usd': max_investment_usd,
+            'max_investment_ars': max_investment_ars,
+            'max_panels_for_bill_coverage': max_panels_for_bill,
+            'max_payback_years': max_payback_years,
+            'savings_per_panel_ars': ahorro_por_panel
+        }
+
+    def apply_bill_restrictions(self, number_of_panels: int, monthly_bill_ars: Decimal) -> int:
+        """
+        Maximum = exactly what's needed for 100% bill coverage (factura total = ahorro mensual)
+        """
+        max_panels = self.bill_based_limits(monthly_bill_ars)['max_panels_for_bill_coverage']
+        return min(number_of_panels, max_panels)
+
+
+def simulate(
+    panel_power_wp: Decimal,
+    pricing: PricingSnapshot,
+    method: str,
+    monthly_bill_ars: Decimal,
+    parameter,
+    fixed_point: bool = False
+) -> SimulationResult:
+    """
+    Run one simulate_* method from plain, picklable arguments (process pool entry point)
+    """
+    return getattr(SimulationCore(panel_power_wp, pricing, fixed_point), method)(monthly_bill_ars, parameter)
@@ -0,0 +1,267 @@
+"""
+Integer fixed-point simulation engine
+
+Alternative to the Decimal arithmetic of SolarInvestmentCalculator. Per-call
+inputs use fixed scales - the bill and investment in centavos, the coverage
+percentage in hundredths of a percent - and the pricing constants are combined
+once, in the constructor, into integer numerator/denominator factors. Each
+result field is then one integer product divided by a precomputed denominator
+with a single half-even rounding to its stored scale (centavos, hundredths of
+a kWh, thousandths of a kW, ...).
+
+The Decimal engine rounds intermediate values to the 28 significant digits of
+the decimal context; with inputs of at most a few decimal places the exact
+values are never that close to a rounding boundary, so after quantizing to the
+stored ``decimal_places`` both engines return the same values (checked by the
+differential tests).
+
+Results come back as scaled integers (value × 10^decimal_places of the matching
+InvestmentSimulation field) and are converted to Decimal at the API boundary by
+``to_decimal``.
+
+This is not a performance option: in CPython the C ``decimal`` module is as fast
+as these integer operations, and converting the results back to Decimal costs
+as much again, so a simulation takes about twice the arithmetic time of the
+Decimal engine (``manage.py bench --filter engine`` compares both). Use it when
+results must not depend on the decimal context (precision, rounding).
+"""
+
+from bisect import bisect_right
+from decimal import Decimal
+from typing import Dict, Tuple
+
+from .pricing import PricingSnapshot
+
+# Exact rational number as (numerator, denominator), denominator > 0
+Ratio = Tuple[int, int]
+
+# Decimal places of the InvestmentSimulation fields produced by the engine
+RESULT_DECIMAL_PLACES = {
+    'number_of_panels': 0,
+    'investment_amount_usd': 2,
+    'total_investment_usd': 2,
+    'total_investment_ars': 2,
+    'installed_power_kw': 3,
+    'annual_generation_kwh': 2,
+    'monthly_generation_kwh': 2,
+    'monthly_savings_ars': 2,
+    'annual_savings_ars': 2,
+    'payback_period_years': 2,
+    'bill_coverage_achieved': 2,
+    'roi_annual': 2,
+    'exchange_rate_used': 2,
+}
+
+# Payback reported when there are no savings (999 years, in hundredths)
+NO_PAYBACK_SCALED = 99900
+
+
+def ratio(value) -> Ratio:
+    """Exact ratio of an int or Decimal"""
+    if isinstance(value, int):
+        return value, 1
+    return Decimal(value).as_integer_ratio()
+
+
+def to_scaled(value, places: int) -> int:
+    """
+    Input ``value`` as an integer at ``places`` decimal places (e.g. centavos
+    for 2). Inputs are quantized to the API precision before reaching the
+    engine, so any other value is rejected instead of rounded.
+    """
+    if isinstance(value, int):
+        return value * 10 ** places
+    numerator, denominator = Decimal(value).as_integer_ratio()
+    scale = 10 ** places
+    if scale % denominator:
+        raise ValueError(f'{value} has more than {places} decimal places')
+    return numerator * (scale // denominator)
+
+
+def _round_half_even(numerator: int, denominator: int) -> int:
+    """numerator / denominator rounded half-even to an integer"""
+    quotient, remainder = divmod(numerator, denominator)
+    remainder += remainder
+    if remainder > denominator or (remainder == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+def _round_half_up(numerator: int, denominator: int) -> int:
+    """numerator / denominator rounded half-up (away from zero for positives)"""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def scaled(value: Ratio, places: int) -> int:
+    """value × 10^places rounded half-even, as stored in a DecimalField"""
+    return _round_half_even(value[0] * 10 ** places, value[1])
+
+
+class FixedPointEngine:
+    """
+    Integer counterpart of SolarInvestmentCalculator's simulate_* methods.
+
+    Build it once per panel model and pricing snapshot (SimulationCore caches
+    it): the constructor does the Decimal-to-integer work, each simulation only
+    a handful of integer multiplications and one division per result field.
+    """
+
+    def __init__(self, panel_power_wp, pricing: PricingSnapshot):
+        energy_n, energy_d = ratio(pricing.energy_price_ars)
+        exchange_n, exchange_d = ratio(pricing.exchange_rate)
+        savings_n, savings_d = ratio(pricing.savings_per_panel_ars)
+        power_n, power_d = ratio(panel_power_wp)
+        power_d *= 1000  # W -> kW
+
+        # Annual generation of one panel: kW × kWh/kWp/año × performance ratio
+        generation_n, generation_d = power_n, power_d
+        for factor in (pricing.annual_generation_factor, pricing.performance_ratio):
+            factor_n, factor_d = ratio(factor)
+            generation_n, generation_d = generation_n * factor_n, generation_d * factor_d
+
+        # potencia = energia / (24 × 0.19 × 30); paneles = potencia / 0.66
+        hours_n, hours_d = ratio(pricing.hours_per_day)
+        system_n, system_d = ratio(pricing.system_performance_factor)
+        days_n, days_d = ratio(pricing.days_per_month)
+        efficiency_n, efficiency_d = ratio(pricing.panel_efficiency_factor)
+        to_power_n = hours_d * system_d * days_d
+        to_power_d = hours_n * system_n * days_n
+
+        # Scaled results as (numerator factor, denominator) of integer inputs:
+        # bill centavos × coverage hundredths of % = target savings (ARS) × 10^6
+        coverage_d = 10 ** 6 * energy_n
+        self.monthly_generation_factor = (energy_d * 100, coverage_d)              # centi-kWh
+        self.annual_generation_from_bill_factor = (energy_d * 1200, coverage_d)    # centi-kWh
+        self.power_from_bill_factor = (energy_d * to_power_n * 1000, coverage_d * to_power_d)  # milli-kW
+        self.panels_from_bill_factor = (energy_d * to_power_n * efficiency_d, coverage_d * to_power_d * efficiency_n)
+
+        # Per panel: power (milli-kW), generation (centi-kWh), savings (centavos)
+        self.power_factor = (power_n * 1000, power_d)
+        self.annual_generation_factor = (generation_n * 100, generation_d)
+        self.monthly_generation_per_panel_factor = (generation_n * 100, generation_d * 12)
+        self.monthly_savings_factor = (savings_n * 100, savings_d)
+        self.annual_savings_factor = (savings_n * 1200, savings_d)
+
+        # Savings per panel and exchange rate as exact ratios (payback, ROI, coverage)
+        self.savings_n, self.savings_d = savings_n, savings_d
+        self.exchange_n, self.exchange_d = exchange_n, exchange_d
+        self.exchange_rate_scaled = _round_half_even(exchange_n * 100, exchange_d)
+
+        # Tier table in centavos: ((min_panels, price_cents), ...)
+        self.tiers = tuple((min_panels, to_scaled(price, 2)) for min_panels, price in pricing.price_tiers)
+        self.tier_minimums = pricing.price_tiers.minimums
+
+    def _tier_price_cents(self, number_of_panels: int) -> int:
+        index = bisect_right(self.tier_minimums, number_of_panels) - 1
+        return self.tiers[max(index, 0)][1]
+
+    def _max_affordable_panels(self, budget_cents: int) -> int:
+        best_panels = 0
+        for index, (min_panels, price_cents) in enumerate(self.tiers):
+            affordable = budget_cents // price_cents
+            if index + 1 < len(self.tiers):
+                affordable = min(affordable, self.tiers[index + 1][0] - 1)
+            if affordable >= max(min_panels, 1):
+                best_panels = max(best_panels, affordable)
+        return best_panels
+
+    def max_panels_for_bill(self, bill_cents: int) -> int:
+        """Same as _calculate_bill_based_limits()['max_panels_for_bill_coverage']"""
+        return _round_half_even(bill_cents * self.savings_d, 100 * self.savings_n)
+
+    def simulate_by_bill_coverage(self, monthly_bill_ars, bill_coverage_percentage) -> Dict[str, int]:
+        bill = to_scaled(monthly_bill_ars, 2)
+        target = bill * to_scaled(bill_coverage_percentage, 2)
+
+        panels_n, panels_d = self.panels_from_bill_factor
+        power_n, power_d = self.power_from_bill_factor
+        annual_n, annual_d = self.annual_generation_from_bill_factor
+        monthly_n, monthly_d = self.monthly_generation_factor
+        number_of_panels = _round_half_up(target * panels_n, panels_d)
+        return self._finalize(
+            bill, number_of_panels, number_of_panels * self._tier_price_cents(number_of_panels),
+            _round_half_even(target * power_n, power_d),
+            _round_half_even(target * annual_n, annual_d),
+            _round_half_even(target * monthly_n, monthly_d),
+        )
+
+    def simulate_by_panels(self, monthly_bill_ars, number_of_panels: int) -> Dict[str, int]:
+        bill = to_scaled(monthly_bill_ars, 2)
+        number_of_panels = min(number_of_panels, self.max_panels_for_bill(bill))
+        return self._finalize_panels(bill, number_of_panels, number_of_panels * self._tier_price_cents(number_of_panels))
+
+    def simulate_by_investment(self, monthly_bill_ars, investment_amount_usd) -> Dict[str, int]:
+        bill = to_scaled(monthly_bill_ars, 2)
+        max_panels = self.max_panels_for_bill(bill)
+        amount = min(to_scaled(investment_amount_usd, 2), max_panels * self._tier_price_cents(max_panels))
+
+        results = self._finalize_panels(bill, self._max_affordable_panels(amount), amount)
+        results['investment_amount_usd'] = amount
+        return results
+
+    def _finalize_panels(self, bill: int, number_of_panels: int, investment_cents: int) -> Dict[str, int]:
+        """_finalize for the modes whose power and generation follow from the panel count"""
+        power_n, power_d = self.power_factor
+        annual_n, annual_d = self.annual_generation_factor
+        monthly_n, monthly_d = self.monthly_generation_per_panel_factor
+        return self._finalize(
+            bill, number_of_panels, investment_cents,
+            _round_half_even(number_of_panels * power_n, power_d),
+            _round_half_even(number_of_panels * annual_n, annual_d),
+            _round_half_even(number_of_panels * monthly_n, monthly_d),
+        )
+
+    def _finalize(
+        self,
+        bill: int,
+        number_of_panels: int,
+        investment_cents: int,
+        power_scaled: int,
+        annual_generation_scaled: int,
+        monthly_generation_scaled: int
+    ) -> Dict[str, int]:
+        savings_d, exchange_d = self.savings_d, self.exchange_d
+        savings = number_of_panels * self.savings_n
+        investment_ars = investment_cents * self.exchange_n
+        monthly_n, monthly_d = self.monthly_savings_factor
+        annual_n, annual_d = self.annual_savings_factor
+
+        if savings > 0:
+            # (investment × rate) / (12 × savings), in hundredths of a year
+            payback = _round_half_even(investment_ars * savings_d, 12 * savings * exchange_d)
+        else:
+            payback = NO_PAYBACK_SCALED
+        if investment_ars > 0:
+            # 12 × savings / (investment × rate) × 100, in hundredths of a percent
+            roi_annual = _round_half_even(savings * exchange_d * 12 * 10 ** 6, investment_ars * savings_d)
+        else:
+            roi_annual = 0
+
+        return {
+            'number_of_panels': number_of_panels,
+            'total_investment_usd': investment_cents,
+            'total_investment_ars': _round_half_even(investment_ars, exchange_d),
+            'installed_power_kw': power_scaled,
+            'annual_generation_kwh': annual_generation_scaled,
+            'monthly_generation_kwh': monthly_generation_scaled,
+            'monthly_savings_ars': _round_half_even(number_of_panels * monthly_n, monthly_d),
+            'annual_savings_ars': _round_half_even(number_of_panels * annual_n, annual_d),
+            'payback_period_years': payback,
+            # savings / bill × 100, in hundredths of a percent
+            'bill_coverage_achieved': _round_half_even(savings * 10 ** 6, savings_d * bill),
+            'roi_annual': roi_annual,
+            'exchange_rate_used': self.exchange_rate_scaled,
+        }
+
+
+# Multiplying by the quantum is exact and faster than Decimal.scaleb
+_QUANTUMS = {name: Decimal(1).scaleb(-places) for name, places in RESULT_DECIMAL_PLACES.items() if places}
+
+
+def to_decimal(results: Dict[str, int]) -> Dict[str, object]:
+    """Convert scaled integer results to Decimal (and int panel counts)"""
+    quantums = _QUANTUMS
+    return {
+        name: Decimal(value) * quantums[name] if name in quantums else value
+        for name, value in results.items()
+    }
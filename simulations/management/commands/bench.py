@@ -0,0 +1,119 @@
+"""
+Django management command to benchmark the simulation engine and API endpoints
+"""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from simulations import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark simulate_*, bill limits, compare requests and the main list endpoints '
+        '(p50/p95, queries, allocations) and compare against a stored JSON baseline. '
+        'Benchmark data is created in a transaction that is rolled back; only runs '
+        'against a local database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=benchmarks.DEFAULT_ITERATIONS,
+            help=f'Timed iterations per case (default: {benchmarks.DEFAULT_ITERATIONS})'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=benchmarks.DEFAULT_WARMUP,
+            help=f'Untimed warm-up calls per case (default: {benchmarks.DEFAULT_WARMUP})'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'),
+            help='Baseline JSON file (default: benchmarks/baseline.json)'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store this run as the new baseline instead of comparing against it'
+        )
+        parser.add_argument(
+            '--no-baseline',
+            action='store_true',
+            help='Only report the results, without comparing against a baseline'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=benchmarks.DEFAULT_THRESHOLD,
+            help=f'Tolerated relative regression (default: {benchmarks.DEFAULT_THRESHOLD})'
+        )
+        parser.add_argument(
+            '--filter',
+            default='',
+            help='Only run cases whose name contains this text'
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write the results of this run to this JSON file'
+        )
+
+    def handle(self, *args, **options):
+        if not benchmarks.is_local_database():
+            raise CommandError(
+                "bench solo corre contra una base de datos local "
+                f"(HOST actual: {connection.settings_dict.get('HOST')}); use DEVELOPMENT=True"
+            )
+
+        baseline_path = Path(options['baseline'])
+        baseline = None
+        if not options['save_baseline'] and not options['no_baseline']:
+            baseline = benchmarks.load_baseline(baseline_path)
+            if baseline is None:
+                raise CommandError(
+                    f'Sin baseline en {baseline_path}: use --save-baseline para crearlo '
+                    f'o --no-baseline para correr sin comparar'
+                )
+
+        results = {}
+        # Measure uncached work: the result LRU and the response cache would turn
+        # every timed request after the warm-up into a hit with no queries
+        with override_settings(SIMULATION_CACHE_SIZE=0, RESPONSE_CACHE_TIMEOUT=0), transaction.atomic():
+            fixture = benchmarks.BenchmarkFixture()
+            for case in benchmarks.build_cases(fixture):
+                if options['filter'] not in case.name:
+                    continue
+                results[case.name] = benchmarks.measure(case, options['iterations'], options['warmup'])
+                self.stdout.write(self._format(case.name, results[case.name]))
+            transaction.set_rollback(True)
+
+        if options['output']:
+            benchmarks.save_report(Path(options['output']), results)
+
+        if options['save_baseline']:
+            benchmarks.save_report(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f'\nBaseline guardado en {baseline_path}'))
+            return
+        if baseline is None:
+            return
+
+        regressions = benchmarks.find_regressions(results, baseline['results'], options['threshold'])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f'  {regression}'))
+            raise CommandError(f'{len(regressions)} regresiones respecto de {baseline_path}')
+
+        self.stdout.write(self.style.SUCCESS('\nSin regresiones respecto del baseline'))
+
+    @staticmethod
+    def _format(name, result):
+        return (
+            f"{name:<44} p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  "
+            f"queries {result['queries']:>3}  alloc {result['allocated_kb']:>9.1f} KB"
+        )
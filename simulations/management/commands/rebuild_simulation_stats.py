@@ -0,0 +1,14 @@
+"""
+Django management command to recompute the simulation stats summary row
+"""
+
+from django.core.management.base import BaseCommand
+from simulations.models import SimulationStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute SimulationStats from the simulation table (after bulk imports or enabling SIMULATION_STATS_SUMMARY)'
+
+    def handle(self, *args, **options):
+        stats = SimulationStats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Resumen recalculado: {stats.total_simulations} simulaciones'))
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:55
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simulations', '0005_merge_20250826_1453'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investmentsimulation',
+            name='target_value',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Ahorro mensual (ARS), período de retorno (años) o ROI anual (%) según el tipo', max_digits=12, null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Valor Objetivo'),
+        ),
+        migrations.AlterField(
+            model_name='investmentsimulation',
+            name='simulation_type',
+            field=models.CharField(choices=[('bill_coverage', 'Cobertura de Factura'), ('panels', 'Número de Paneles'), ('investment', 'Monto de Inversión'), ('target_monthly_savings', 'Ahorro Mensual Objetivo'), ('target_payback_years', 'Período de Retorno Objetivo'), ('target_roi', 'ROI Anual Objetivo')], max_length=30, verbose_name='Tipo de Simulación'),
+        ),
+    ]
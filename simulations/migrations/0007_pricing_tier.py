@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:57
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_auto_20250814_1610'),
+        ('simulations', '0006_target_simulation_modes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PricingTier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('min_panels', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Cantidad Mínima de Paneles')),
+                ('price_per_panel_usd', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Precio por Panel (USD)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última Actualización')),
+                ('project', models.ForeignKey(blank=True, help_text='Vacío para la tabla por defecto de todos los proyectos sin tabla propia', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pricing_tiers', to='projects.solarproject')),
+            ],
+            options={
+                'verbose_name': 'Tramo de Precio',
+                'verbose_name_plural': 'Tramos de Precio',
+                'ordering': ['project', 'min_panels'],
+                'unique_together': {('project', 'min_panels')},
+            },
+        ),
+    ]
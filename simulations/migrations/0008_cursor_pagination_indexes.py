@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simulations', '0007_pricing_tier'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentsimulation',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='simulation_user_created_idx'),
+        ),
+    ]
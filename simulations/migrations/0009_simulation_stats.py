@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:06
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def build_summary(apps, schema_editor):
+    InvestmentSimulation = apps.get_model('simulations', 'InvestmentSimulation')
+    SimulationStats = apps.get_model('simulations', 'SimulationStats')
+    totals = InvestmentSimulation.objects.aggregate(
+        total_simulations=Count('id'),
+        sum_investment_usd=Sum('total_investment_usd'),
+        sum_payback_years=Sum('payback_period_years'),
+        sum_roi_annual=Sum('roi_annual'),
+    )
+    SimulationStats.objects.create(pk=1, **{name: value or 0 for name, value in totals.items()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simulations', '0008_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimulationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_simulations', models.PositiveBigIntegerField(default=0, verbose_name='Total de Simulaciones')),
+                ('sum_investment_usd', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Suma de Inversión (USD)')),
+                ('sum_payback_years', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Suma de Períodos de Retorno (años)')),
+                ('sum_roi_annual', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Suma de ROI Anual (%)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última Actualización')),
+            ],
+            options={
+                'verbose_name': 'Resumen de Simulaciones',
+                'verbose_name_plural': 'Resumen de Simulaciones',
+            },
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:16
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def drop_duplicate_global_tiers(apps, schema_editor):
+    """Keep the most recently updated global tier of each minimum (only it can satisfy the new constraint)"""
+    PricingTier = apps.get_model('simulations', 'PricingTier')
+    seen = set()
+    for tier in PricingTier.objects.filter(project__isnull=True).order_by('min_panels', '-updated_at', '-id'):
+        if tier.min_panels in seen:
+            tier.delete()
+        else:
+            seen.add(tier.min_panels)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simulations', '0009_simulation_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_global_tiers, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='pricingtier',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='pricingtier',
+            name='min_panels',
+            field=models.PositiveIntegerField(help_text='El tramo más bajo de cada tabla se aplica desde 1 panel', validators=[django.core.validators.MinValueValidator(1)], verbose_name='Cantidad Mínima de Paneles'),
+        ),
+        migrations.AddConstraint(
+            model_name='pricingtier',
+            constraint=models.UniqueConstraint(fields=('project', 'min_panels'), name='pricing_tier_project_min_panels'),
+        ),
+        migrations.AddConstraint(
+            model_name='pricingtier',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('min_panels',), name='pricing_tier_global_min_panels'),
+        ),
+    ]
@@ -1,7 +1,12 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Count, F, Sum
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
 from projects.models import SolarProject
+from .cache import current_values
+from .pricing import DEFAULT_PANEL_PRICE_TIERS, TierTable
 import uuid
 
 # Fixed energy price for savings calculation (legacy - use EnergyPrice model instead)
@@ -48,7 +53,12 @@ class EnergyPrice(models.Model):
     
     @classmethod
     def get_current_price(cls):
-        """Get the current active energy price"""
+        """Get the current active energy price (cached, see simulations.cache)"""
+        return current_values.get('energy_price', cls._query_current_price)
+    
+    @classmethod
+    def _query_current_price(cls):
+        """Read the current active energy price from the database"""
         try:
             active_price = cls.objects.filter(is_active=True).first()
             return active_price.price_ars_per_kwh if active_price else ENERGY_PRICE_ARS_PER_KWH
@@ -79,6 +89,15 @@ class TariffCategory(models.Model):
     
     def __str__(self):
         return f"{self.name} ({self.code})"
+    
+    @classmethod
+    def get_ids(cls):
+        """Ids of every tariff category (cached, see simulations.cache)"""
+        return current_values.get('tariff_category_ids', cls._query_ids)
+    
+    @classmethod
+    def _query_ids(cls):
+        return frozenset(cls.objects.values_list('id', flat=True))
 
 
 class ExchangeRate(models.Model):
@@ -105,7 +124,12 @@ class ExchangeRate(models.Model):
     
     @classmethod
     def get_latest_rate(cls):
-        """Get the most recent exchange rate"""
+        """Get the most recent exchange rate (cached, see simulations.cache)"""
+        return current_values.get('exchange_rate', cls._query_latest_rate)
+    
+    @classmethod
+    def _query_latest_rate(cls):
+        """Read the most recent exchange rate from the database"""
         latest = cls.objects.first()
         return latest.rate if latest else 1000  # Default fallback rate
 
@@ -117,6 +141,9 @@ class InvestmentSimulation(models.Model):
         ('bill_coverage', 'Cobertura de Factura'),
         ('panels', 'Número de Paneles'),
         ('investment', 'Monto de Inversión'),
+        ('target_monthly_savings', 'Ahorro Mensual Objetivo'),
+        ('target_payback_years', 'Período de Retorno Objetivo'),
+        ('target_roi', 'ROI Anual Objetivo'),
     ]
     
     # Unique identifier for the simulation
@@ -144,7 +171,7 @@ class InvestmentSimulation(models.Model):
     )
     tariff_category = models.ForeignKey(TariffCategory, on_delete=models.CASCADE)
     
-    simulation_type = models.CharField('Tipo de Simulación', max_length=20, choices=SIMULATION_TYPE_CHOICES)
+    simulation_type = models.CharField('Tipo de Simulación', max_length=30, choices=SIMULATION_TYPE_CHOICES)
     
     # Variable input (depends on simulation type)
     bill_coverage_percentage = models.DecimalField(
@@ -164,6 +191,15 @@ class InvestmentSimulation(models.Model):
         blank=True,
         validators=[MinValueValidator(0)]
     )
+    target_value = models.DecimalField(
+        'Valor Objetivo',
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0)],
+        help_text="Ahorro mensual (ARS), período de retorno (años) o ROI anual (%) según el tipo"
+    )
     
     # Calculated results
     total_investment_usd = models.DecimalField(
@@ -243,6 +279,10 @@ class InvestmentSimulation(models.Model):
         verbose_name = 'Simulación de Inversión'
         verbose_name_plural = 'Simulaciones de Inversión'
         ordering = ['-created_at']
+        indexes = [
+            # A user's simulation history (cursor pagination on created_at, id)
+            models.Index(fields=['user', '-created_at', '-id'], name='simulation_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"Simulación {self.id} - {self.project.name} ({self.simulation_type})"
@@ -260,4 +300,142 @@ class InvestmentSimulation(models.Model):
     @property
     def annual_savings_usd_legacy(self):
         """Calculate annual savings in USD using official exchange rate (legacy method)"""
-        return self.annual_savings_ars / self.exchange_rate_used
\ No newline at end of file
+        return self.annual_savings_ars / self.exchange_rate_used
+
+
+class SimulationStats(models.Model):
+    """
+    Running totals of all simulations in a single row (pk=1), updated
+    incrementally by the InvestmentSimulation signals when
+    SIMULATION_STATS_SUMMARY is enabled, so stats reads cost one primary key
+    lookup. Bulk operations that skip signals (bulk_create, queryset.update)
+    must be followed by ``rebuild()`` (command rebuild_simulation_stats).
+    """
+    
+    # Summary field -> summed InvestmentSimulation field
+    SUMMED_FIELDS = {
+        'sum_investment_usd': 'total_investment_usd',
+        'sum_payback_years': 'payback_period_years',
+        'sum_roi_annual': 'roi_annual',
+    }
+    
+    total_simulations = models.PositiveBigIntegerField('Total de Simulaciones', default=0)
+    sum_investment_usd = models.DecimalField('Suma de Inversión (USD)', max_digits=20, decimal_places=2, default=0)
+    sum_payback_years = models.DecimalField('Suma de Períodos de Retorno (años)', max_digits=20, decimal_places=2, default=0)
+    sum_roi_annual = models.DecimalField('Suma de ROI Anual (%)', max_digits=20, decimal_places=2, default=0)
+    
+    updated_at = models.DateTimeField('Última Actualización', auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Resumen de Simulaciones'
+        verbose_name_plural = 'Resumen de Simulaciones'
+    
+    def __str__(self):
+        return f"{self.total_simulations} simulaciones"
+    
+    @classmethod
+    def compute(cls) -> dict:
+        """Totals of the simulation table in one aggregate query"""
+        totals = InvestmentSimulation.objects.aggregate(
+            total_simulations=Count('id'),
+            **{name: Sum(field) for name, field in cls.SUMMED_FIELDS.items()}
+        )
+        return {name: value or 0 for name, value in totals.items()}
+    
+    @classmethod
+    def rebuild(cls) -> 'SimulationStats':
+        """Recompute the summary row from the simulation table"""
+        stats, created = cls.objects.update_or_create(pk=1, defaults=cls.compute())
+        return stats
+    
+    @classmethod
+    def get(cls) -> 'SimulationStats':
+        """The summary row, built on first use"""
+        return cls.objects.filter(pk=1).first() or cls.rebuild()
+    
+    @classmethod
+    def apply(cls, count_delta: int, simulation: 'InvestmentSimulation', sign: int = 1, previous: dict = None) -> None:
+        """
+        Add ``sign`` times the values of ``simulation`` (minus ``previous`` values,
+        for updates) to the totals with a single atomic UPDATE
+        """
+        deltas = {}
+        for name, field in cls.SUMMED_FIELDS.items():
+            # Instances may hold more decimal places than the column stores
+            places = InvestmentSimulation._meta.get_field(field).decimal_places
+            delta = sign * Decimal(str(getattr(simulation, field))).quantize(Decimal(1).scaleb(-places))
+            if previous is not None:
+                delta -= previous[field]
+            deltas[name] = F(name) + delta
+        if not cls.objects.filter(pk=1).update(total_simulations=F('total_simulations') + count_delta, **deltas):
+            # No summary row yet: build it from the table, which already includes this change
+            cls.rebuild()
+    
+    @classmethod
+    def totals(cls) -> dict:
+        """Current totals: from the summary row when enabled, else one aggregate query"""
+        if not getattr(settings, 'SIMULATION_STATS_SUMMARY', True):
+            return cls.compute()
+        stats = cls.get()
+        return {name: getattr(stats, name) for name in ('total_simulations', *cls.SUMMED_FIELDS)}
+
+
+class PricingTier(models.Model):
+    """Volume discount tier: price per panel from a minimum quantity (project or global default)"""
+    
+    project = models.ForeignKey(
+        SolarProject,
+        on_delete=models.CASCADE,
+        related_name='pricing_tiers',
+        null=True,
+        blank=True,
+        help_text="Vacío para la tabla por defecto de todos los proyectos sin tabla propia"
+    )
+    min_panels = models.PositiveIntegerField(
+        'Cantidad Mínima de Paneles',
+        validators=[MinValueValidator(1)],
+        help_text="El tramo más bajo de cada tabla se aplica desde 1 panel"
+    )
+    price_per_panel_usd = models.DecimalField(
+        'Precio por Panel (USD)',
+        max_digits=10,
+        decimal_places=2,
+        validators=[MinValueValidator(0)]
+    )
+    
+    created_at = models.DateTimeField('Fecha de Creación', auto_now_add=True)
+    updated_at = models.DateTimeField('Última Actualización', auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Tramo de Precio'
+        verbose_name_plural = 'Tramos de Precio'
+        ordering = ['project', 'min_panels']
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'min_panels'], name='pricing_tier_project_min_panels'),
+            # NULL project ids are distinct in a unique index: the global table needs its own constraint
+            models.UniqueConstraint(
+                fields=['min_panels'], condition=models.Q(project__isnull=True),
+                name='pricing_tier_global_min_panels'
+            ),
+        ]
+    
+    def __str__(self):
+        scope = self.project.name if self.project_id else 'Por defecto'
+        return f"{scope}: desde {self.min_panels} paneles ${self.price_per_panel_usd} USD"
+    
+    @classmethod
+    def table_for(cls, project=None):
+        """Compiled tier table of ``project``, else the global one, else the built-in default"""
+        tables = current_values.get('price_tiers', cls._query_tables)
+        project_id = project.pk if project is not None else None
+        return tables.get(project_id) or tables.get(None) or DEFAULT_PANEL_PRICE_TIERS
+    
+    @classmethod
+    def _query_tables(cls):
+        """Read every tier and compile one table per project (None = global default)"""
+        rows = {}
+        for project_id, min_panels, price in cls.objects.values_list(
+            'project_id', 'min_panels', 'price_per_panel_usd'
+        ):
+            rows.setdefault(project_id, []).append((min_panels, price))
+        return {project_id: TierTable(tiers) for project_id, tiers in rows.items()}
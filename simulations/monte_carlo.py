@@ -0,0 +1,276 @@
+"""
+Monte Carlo risk simulation of exchange-rate and energy-price paths
+
+The deterministic engine freezes today's exchange rate and energy price for the
+whole life of the system. Here both follow independent geometric Brownian
+motions whose drift and volatility are estimated from the stored ExchangeRate and
+EnergyPrice history. Each path gives a monthly stream of savings in USD:
+
+    savings_usd[t] = monthly_savings_ars × (price[t] / price[0]) / rate[t] × degradation[t]
+
+and the investment (fixed in USD) is recovered when the cumulative savings reach
+it. Payback and annual ROI percentiles are computed over all paths.
+
+Paths are generated in chunks of ``CHUNK_PATHS`` with one NumPy pass per chunk.
+Chunks are independent (each has its own child seed), so the result for a given
+seed does not depend on where they run. By default every chunk runs in the
+calling process; runs of at least ``parallel_min_paths`` paths with more than
+one worker are spread over a process pool, bounded by the CPU count and
+``MAX_WORKERS`` and shut down at exit. This module does not touch the ORM inside
+the workers.
+"""
+
+import atexit
+import math
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .projection import payback_periods, DEFAULT_HORIZON_YEARS
+
+# Paths generated per chunk (one task per chunk in the process pool)
+CHUNK_PATHS = 5000
+
+# Smaller runs stay in the calling process: starting the pool and sending the
+# results back cost more than the chunks they would spread
+DEFAULT_PARALLEL_MIN_PATHS = 50000
+
+# Upper bound of worker processes, whatever the settings ask for
+MAX_WORKERS = 8
+
+# Monthly time step
+STEPS_PER_YEAR = 12
+
+# Fallback model when there is not enough history to estimate it (annual, log scale)
+DEFAULT_EXCHANGE_RATE_DRIFT = 0.0
+DEFAULT_EXCHANGE_RATE_VOLATILITY = 0.30
+DEFAULT_ENERGY_PRICE_DRIFT = 0.0
+DEFAULT_ENERGY_PRICE_VOLATILITY = 0.20
+
+# Estimated volatilities are capped so a couple of outliers cannot blow up the model
+MAX_VOLATILITY = 2.0
+MIN_OBSERVATIONS = 3
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+DAYS_PER_YEAR = 365.25
+
+
+@dataclass(frozen=True)
+class PriceProcess:
+    """
+    Geometric Brownian motion of a price, in annual log-drift and volatility
+    """
+    drift: float
+    volatility: float
+    observations: int = 0
+
+    @classmethod
+    def estimate(
+        cls,
+        history: Sequence[Tuple[Any, Any]],
+        default_drift: float,
+        default_volatility: float
+    ) -> 'PriceProcess':
+        """
+        Maximum-likelihood estimate from (date, value) observations sorted by date.
+        Observations may be irregularly spaced; same-day duplicates are ignored.
+        """
+        times, values = [], []
+        for day, value in history:
+            value = float(value)
+            if value <= 0:
+                continue
+            if times and day <= times[-1]:
+                continue
+            times.append(day)
+            values.append(value)
+
+        if len(values) < MIN_OBSERVATIONS:
+            return cls(default_drift, default_volatility, len(values))
+
+        elapsed = np.array(
+            [(later - earlier).days / DAYS_PER_YEAR for earlier, later in zip(times, times[1:])]
+        )
+        log_returns = np.diff(np.log(values))
+        drift = log_returns.sum() / elapsed.sum()
+        variance = np.mean((log_returns - drift * elapsed) ** 2 / elapsed)
+        volatility = min(math.sqrt(variance), MAX_VOLATILITY)
+        return cls(float(drift), float(volatility), len(values))
+
+    def paths(self, initial: float, steps: int, rng: np.random.Generator, count: int) -> np.ndarray:
+        """``count`` × ``steps`` array of simulated values after each step"""
+        dt = 1 / STEPS_PER_YEAR
+        shocks = rng.standard_normal((count, steps))
+        shocks *= self.volatility * math.sqrt(dt)
+        shocks += self.drift * dt
+        np.cumsum(shocks, axis=1, out=shocks)
+        np.exp(shocks, out=shocks)
+        shocks *= initial
+        return shocks
+
+
+@dataclass(frozen=True)
+class RiskModel:
+    """
+    Exchange-rate and energy-price processes used by the Monte Carlo simulation
+    """
+    exchange_rate: PriceProcess
+    energy_price: PriceProcess
+
+    @classmethod
+    def from_history(cls) -> 'RiskModel':
+        """Estimate both processes from the stored ExchangeRate and EnergyPrice rows"""
+        # Importar aquí para evitar imports circulares
+        from .models import ExchangeRate, EnergyPrice
+
+        return cls(
+            exchange_rate=PriceProcess.estimate(
+                ExchangeRate.objects.order_by('date', 'id').values_list('date', 'rate'),
+                DEFAULT_EXCHANGE_RATE_DRIFT, DEFAULT_EXCHANGE_RATE_VOLATILITY
+            ),
+            energy_price=PriceProcess.estimate(
+                EnergyPrice.objects.order_by('effective_date', 'id').values_list(
+                    'effective_date', 'price_ars_per_kwh'
+                ),
+                DEFAULT_ENERGY_PRICE_DRIFT, DEFAULT_ENERGY_PRICE_VOLATILITY
+            ),
+        )
+
+    def describe(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                'drift': round(process.drift, 6),
+                'volatility': round(process.volatility, 6),
+                'observations': process.observations,
+            }
+            for name, process in (('exchange_rate', self.exchange_rate), ('energy_price', self.energy_price))
+        }
+
+
+@dataclass(frozen=True)
+class RiskScenario:
+    """
+    Plain inputs of one Monte Carlo run (picklable, sent to the worker processes)
+    """
+    investment_usd: float
+    monthly_savings_ars: float
+    exchange_rate: float
+    degradation: float
+    model: RiskModel
+    horizon_years: int = DEFAULT_HORIZON_YEARS
+
+
+def simulate_chunk(scenario: RiskScenario, seed: np.random.SeedSequence, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Payback (years, NaN if not reached) and average annual ROI (%) of ``count`` paths
+    """
+    rng = np.random.default_rng(seed)
+    steps = scenario.horizon_years * STEPS_PER_YEAR
+
+    # Panel output degrades once per year of operation
+    degradation = (1 - scenario.degradation) ** (np.arange(steps) // STEPS_PER_YEAR)
+
+    savings = scenario.model.energy_price.paths(1.0, steps, rng, count)
+    savings /= scenario.model.exchange_rate.paths(scenario.exchange_rate, steps, rng, count)
+    savings *= scenario.monthly_savings_ars * degradation
+
+    cumulative = np.cumsum(savings, axis=1)
+    total_savings = cumulative[:, -1].copy()
+    cumulative -= scenario.investment_usd
+
+    if scenario.monthly_savings_ars > 0:
+        payback_years = payback_periods(cumulative, savings) / STEPS_PER_YEAR
+    else:
+        # As in the deterministic engine, a system without savings never pays back
+        payback_years = np.full(count, np.nan)
+    if scenario.investment_usd > 0:
+        roi_annual = total_savings / scenario.horizon_years / scenario.investment_usd * 100
+    else:
+        roi_annual = np.zeros(count)
+    return payback_years, roi_annual
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by every request of this process (created on first use)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            atexit.register(shutdown)
+        return _executor
+
+
+def shutdown() -> None:
+    """Stop the worker processes, if the pool was started"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
+
+def bounded_workers(workers: int) -> int:
+    """``workers`` capped by the CPU count and ``MAX_WORKERS`` (at least 1)"""
+    return max(1, min(workers, os.cpu_count() or 1, MAX_WORKERS))
+
+
+def run(
+    scenario: RiskScenario,
+    paths: int,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    parallel_min_paths: int = DEFAULT_PARALLEL_MIN_PATHS
+) -> Dict[str, Any]:
+    """
+    Simulate ``paths`` paths and summarize payback and ROI percentiles.
+
+    The chunks run on the shared process pool only when ``workers`` > 1 and
+    ``paths`` >= ``parallel_min_paths``; otherwise they run in the calling process.
+    """
+    workers = bounded_workers(workers)
+    if seed is None:
+        seed = secrets.randbits(32)
+    seed_sequence = np.random.SeedSequence(seed)
+    counts = [CHUNK_PATHS] * (paths // CHUNK_PATHS)
+    if paths % CHUNK_PATHS:
+        counts.append(paths % CHUNK_PATHS)
+    seeds = seed_sequence.spawn(len(counts))
+    args = ([scenario] * len(counts), seeds, counts)
+
+    if workers > 1 and len(counts) > 1 and paths >= parallel_min_paths:
+        chunks = list(_get_executor(workers).map(simulate_chunk, *args))
+    else:
+        chunks = list(map(simulate_chunk, *args))
+
+    payback_years = np.concatenate([payback for payback, _ in chunks])
+    roi_annual = np.concatenate([roi for _, roi in chunks])
+    recovered = ~np.isnan(payback_years)
+
+    return {
+        'paths': paths,
+        'seed': seed,
+        'horizon_years': scenario.horizon_years,
+        'model': scenario.model.describe(),
+        'probability_payback_within_horizon': round(float(recovered.mean()), 4),
+        # Paths that never pay back count as +inf, so high percentiles may be None
+        'payback_years': _percentiles(np.where(recovered, payback_years, np.inf)),
+        'roi_annual': _percentiles(roi_annual),
+    }
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, Optional[float]]:
+    results = np.percentile(values, PERCENTILES, method='lower')
+    return {
+        f'p{percentile}': round(float(value), 2) if np.isfinite(value) else None
+        for percentile, value in zip(PERCENTILES, results)
+    }
@@ -0,0 +1,171 @@
+"""
+Pricing inputs for the simulation engine.
+
+A tier table is a sequence of ``(min_panels, price_per_panel_usd)`` pairs sorted
+by ``min_panels``. Pricing is uniform: every panel is charged at the price of the
+tier that the total quantity falls into (e.g. 12 panels -> 12 x $500). Tables are
+compiled to ``TierTable`` (sorted breakpoint arrays, bisect lookups); projects may
+have their own table (``PricingTier`` rows), otherwise the global default applies.
+
+``PricingSnapshot`` bundles every value a calculation depends on (exchange rate,
+energy price, tier table and engine constants) so it is resolved once per request
+and shared by every simulation computed from it.
+"""
+
+import hashlib
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+PriceTier = Tuple[int, Decimal]
+
+
+class TierTable(tuple):
+    """
+    Tier table compiled for lookups: a tuple of ``(min_panels, price)`` pairs
+    sorted by ``min_panels`` plus the breakpoints and prices as separate lists,
+    so the price of a quantity is one ``bisect``. Compares, hashes and prints
+    like the plain tuple of pairs.
+
+    Counts below the first minimum are charged the first tier's price, so the
+    first tier is normalized to start at 1: the lookups and the inverse solvers
+    (max_affordable_panels, tier_candidates) then agree on every count.
+    """
+
+    def __new__(cls, tiers: Iterable[PriceTier]):
+        pairs = sorted((int(min_panels), Decimal(price)) for min_panels, price in tiers)
+        if not pairs:
+            raise ValueError('A tier table needs at least one tier')
+        pairs[0] = (1, pairs[0][1])
+        table = super().__new__(cls, pairs)
+        table.minimums = [min_panels for min_panels, _ in pairs]
+        table.prices = [price for _, price in pairs]
+        return table
+
+    def price(self, number_of_panels: int) -> Decimal:
+        """Price per panel of the tier ``number_of_panels`` falls into (first tier below it)"""
+        return self.prices[max(bisect_right(self.minimums, number_of_panels) - 1, 0)]
+
+
+# Default volume discounts: 1-9 panels $700, 10-99 panels $500, 100+ panels $400
+DEFAULT_PANEL_PRICE_TIERS = TierTable((
+    (1, Decimal('700')),
+    (10, Decimal('500')),
+    (100, Decimal('400')),
+))
+
+
+def tier_price(number_of_panels: int, tiers: Sequence[PriceTier] = DEFAULT_PANEL_PRICE_TIERS) -> Decimal:
+    """Price per panel (USD) for the tier that ``number_of_panels`` falls into"""
+    if not isinstance(tiers, TierTable):
+        tiers = TierTable(tiers)
+    return tiers.price(number_of_panels)
+
+
+def total_investment(number_of_panels: int, tiers: Sequence[PriceTier] = DEFAULT_PANEL_PRICE_TIERS) -> Decimal:
+    """Total cost (USD) of ``number_of_panels`` with uniform tiered pricing"""
+    return number_of_panels * tier_price(number_of_panels, tiers)
+
+
+def max_affordable_panels(budget_usd: Decimal, tiers: Sequence[PriceTier] = DEFAULT_PANEL_PRICE_TIERS) -> int:
+    """
+    Maximum number of panels whose total cost does not exceed ``budget_usd``.
+
+    The cost is linear inside each tier but drops at tier boundaries (9 panels at
+    $700 cost more than 10 at $500), so it is not monotonic in the panel count.
+    Each tier is solved independently - the largest count in ``[min, max]`` with
+    ``count x price <= budget`` - and the best tier wins, in O(number of tiers).
+    """
+    best_panels = 0
+    for index, (min_panels, price_per_panel) in enumerate(tiers):
+        affordable = int(budget_usd // price_per_panel)
+        if index + 1 < len(tiers):
+            affordable = min(affordable, tiers[index + 1][0] - 1)
+        if affordable >= max(min_panels, 1):
+            best_panels = max(best_panels, affordable)
+    return best_panels
+
+
+def tier_candidates(
+    max_panels: int,
+    budget_usd: Optional[Decimal] = None,
+    tiers: Sequence[PriceTier] = DEFAULT_PANEL_PRICE_TIERS
+) -> List[int]:
+    """
+    Largest panel count of each tier that satisfies ``count <= max_panels`` and
+    ``count x price <= budget_usd``, one per reachable tier (ascending).
+
+    Savings grow linearly with the count while the price per panel is constant
+    inside a tier, so ROI and payback are constant within a tier and the best
+    option for a tier is always its largest feasible count.
+    """
+    candidates = []
+    for index, (min_panels, price_per_panel) in enumerate(tiers):
+        highest = max_panels
+        if index + 1 < len(tiers):
+            highest = min(highest, tiers[index + 1][0] - 1)
+        if budget_usd is not None:
+            highest = min(highest, int(budget_usd // price_per_panel))
+        if highest >= max(min_panels, 1):
+            candidates.append(highest)
+    return candidates
+
+
+@dataclass(frozen=True)
+class PricingSnapshot:
+    """
+    Immutable set of pricing values and engine constants used by a calculation
+    """
+    exchange_rate: Decimal
+    energy_price_ars: Decimal
+    price_tiers: Tuple[PriceTier, ...] = DEFAULT_PANEL_PRICE_TIERS
+
+    # Solar generation factors (typical for Argentina)
+    annual_generation_factor: int = 1500  # kWh per kWp per year (average)
+    performance_ratio: Decimal = Decimal('0.85')  # System efficiency
+    system_degradation: Decimal = Decimal('0.005')  # 0.5% annual degradation
+
+    # Savings formula: panels × 0.66 × precio_energia × 24 × 30 × 0.19
+    panel_efficiency_factor: Decimal = Decimal('0.66')
+    hours_per_day: Decimal = Decimal('24')
+    days_per_month: Decimal = Decimal('30')
+    system_performance_factor: Decimal = Decimal('0.19')
+
+    version: str = field(init=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.price_tiers, TierTable):
+            object.__setattr__(self, 'price_tiers', TierTable(self.price_tiers))
+
+        # Content-derived id: equal values always share a version, on any instance
+        values = '|'.join(
+            str(getattr(self, name)) for name in self.__dataclass_fields__ if name != 'version'
+        )
+        object.__setattr__(self, 'version', hashlib.sha1(values.encode()).hexdigest()[:12])
+
+    @property
+    def savings_per_panel_ars(self) -> Decimal:
+        """Monthly savings (ARS) of a single panel: 0.66 × precio_energia × 24 × 30 × 0.19"""
+        return (
+            self.panel_efficiency_factor *
+            self.energy_price_ars *
+            self.hours_per_day *
+            self.days_per_month *
+            self.system_performance_factor
+        )
+
+    @classmethod
+    def load(cls, project=None) -> 'PricingSnapshot':
+        """
+        Resolve the current exchange rate, energy price and the tier table of
+        ``project`` (or the global default table) from the database
+        """
+        # Importar aquí para evitar imports circulares
+        from .models import ExchangeRate, EnergyPrice, PricingTier
+
+        return cls(
+            exchange_rate=Decimal(str(ExchangeRate.get_latest_rate())),
+            energy_price_ars=Decimal(str(EnergyPrice.get_current_price())),
+            price_tiers=PricingTier.table_for(project)
+        )
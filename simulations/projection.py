@@ -0,0 +1,184 @@
+"""
+Multi-year cash-flow projection for simulations
+
+Projects year-by-year generation and savings (with the annual system
+degradation), cumulative and discounted cash flows, payback, NPV and IRR for a
+whole batch of scenarios at once. Every scenario is a row of 2-D NumPy arrays
+(scenarios × years). Cash flows are in USD at the exchange rate of the
+simulation: year 0 is the investment, years 1..N the annual savings.
+"""
+
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+DEFAULT_HORIZON_YEARS = 25
+DEFAULT_DISCOUNT_RATE = 0.08
+
+# IRR search bracket (annual rate) and iterations of the Newton/bisection solver
+IRR_LOWER_BOUND = -0.99
+IRR_UPPER_BOUND = 10.0
+IRR_ITERATIONS = 100
+IRR_TOLERANCE = 1e-10
+
+
+def irr(cash_flows: np.ndarray) -> np.ndarray:
+    """
+    Internal rate of return of each row of ``cash_flows`` (year 0 first).
+
+    All rows are solved together with a safeguarded Newton method: the sign
+    bracket is narrowed at every iterate, and a Newton step is only taken when it
+    lands inside the bracket and is less than half the previous step, otherwise
+    the bracket is bisected. Rows without a sign change, or that do not meet
+    IRR_TOLERANCE within IRR_ITERATIONS, get NaN.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    years = np.arange(cash_flows.shape[1], dtype=np.float64)
+
+    def npv_and_derivative(rate):
+        discount = (1 + rate)[:, np.newaxis] ** -years
+        value = (cash_flows * discount).sum(axis=1)
+        derivative = (-years * cash_flows * discount / (1 + rate)[:, np.newaxis]).sum(axis=1)
+        return value, derivative
+
+    lower = np.full(cash_flows.shape[0], IRR_LOWER_BOUND)
+    upper = np.full(cash_flows.shape[0], IRR_UPPER_BOUND)
+    value_lower, _ = npv_and_derivative(lower)
+    value_upper, _ = npv_and_derivative(upper)
+    solvable = np.sign(value_lower) != np.sign(value_upper)
+
+    rate = np.full(cash_flows.shape[0], 0.1)
+    previous_step = upper - lower
+    converged = ~solvable
+    for _ in range(IRR_ITERATIONS):
+        value, derivative = npv_and_derivative(rate)
+        # Narrow the bracket to the side of the root that keeps the sign change
+        same_sign_as_lower = np.sign(value) == np.sign(value_lower)
+        lower = np.where(same_sign_as_lower, rate, lower)
+        upper = np.where(same_sign_as_lower, upper, rate)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = rate - value / derivative
+        use_newton = (
+            np.isfinite(newton) & (newton > lower) & (newton < upper)
+            & (2 * np.abs(newton - rate) < np.abs(previous_step))
+        )
+        next_rate = np.where(use_newton, newton, (lower + upper) / 2)
+        step = next_rate - rate
+
+        done = (value == 0) | (np.abs(step) < IRR_TOLERANCE) | (upper - lower < IRR_TOLERANCE)
+        rate = np.where(converged | (value == 0), rate, next_rate)
+        previous_step = np.where(converged, previous_step, step)
+        converged = converged | done
+        if np.all(converged):
+            break
+
+    return np.where(solvable & converged, rate, np.nan)
+
+
+def payback_periods(cumulative: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """
+    Fractional period in which each row's cumulative cash flow turns non-negative
+    (NaN when it does not happen within the horizon). ``flows`` are the per-period
+    inflows that make up ``cumulative``.
+    """
+    recovered = cumulative >= 0
+    first_period = recovered.argmax(axis=1)
+    rows = np.arange(cumulative.shape[0])
+    shortfall = -(cumulative[rows, first_period] - flows[rows, first_period])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(flows[rows, first_period] > 0, shortfall / flows[rows, first_period], 0.0)
+    return np.where(recovered.any(axis=1), first_period + fraction, np.nan)
+
+
+class ProjectionEngine:
+    """
+    Vectorized multi-year projection of simulation cash flows
+    """
+
+    def __init__(
+        self,
+        degradation: float,
+        horizon_years: int = DEFAULT_HORIZON_YEARS,
+        discount_rate: float = DEFAULT_DISCOUNT_RATE
+    ):
+        self.degradation = float(degradation)
+        self.horizon_years = int(horizon_years)
+        self.discount_rate = float(discount_rate)
+
+    def project(self, investment_usd, annual_savings_usd, annual_generation_kwh) -> Dict[str, np.ndarray]:
+        """
+        Project every scenario; inputs are 1-D arrays with one value per scenario
+        """
+        investment_usd = np.asarray(investment_usd, dtype=np.float64)
+        annual_savings_usd = np.asarray(annual_savings_usd, dtype=np.float64)
+        annual_generation_kwh = np.asarray(annual_generation_kwh, dtype=np.float64)
+
+        years = np.arange(1, self.horizon_years + 1, dtype=np.float64)
+        output_factor = (1 - self.degradation) ** (years - 1)
+        discount_factor = (1 + self.discount_rate) ** -years
+
+        generation = annual_generation_kwh[:, np.newaxis] * output_factor
+        savings = annual_savings_usd[:, np.newaxis] * output_factor
+        discounted_savings = savings * discount_factor
+
+        cumulative = np.cumsum(savings, axis=1) - investment_usd[:, np.newaxis]
+        discounted_cumulative = np.cumsum(discounted_savings, axis=1) - investment_usd[:, np.newaxis]
+        cash_flows = np.concatenate([-investment_usd[:, np.newaxis], savings], axis=1)
+
+        return {
+            'years': years,
+            'generation_kwh': generation,
+            'savings_usd': savings,
+            'cumulative_cash_flow_usd': cumulative,
+            'discounted_cumulative_cash_flow_usd': discounted_cumulative,
+            'payback_years': payback_periods(cumulative, savings),
+            'discounted_payback_years': payback_periods(discounted_cumulative, discounted_savings),
+            'npv_usd': discounted_cumulative[:, -1],
+            'irr': irr(cash_flows),
+        }
+
+    def project_simulations(self, simulations) -> Dict[str, np.ndarray]:
+        """Project a sequence of InvestmentSimulation instances in one pass"""
+        return self.project(
+            [float(simulation.total_investment_usd) for simulation in simulations],
+            [float(simulation.annual_savings_usd) for simulation in simulations],
+            [float(simulation.annual_generation_kwh) for simulation in simulations]
+        )
+
+    def scenario(self, projection: Dict[str, np.ndarray], index: int) -> Dict[str, Any]:
+        """JSON-ready projection section of one scenario"""
+        return {
+            'horizon_years': self.horizon_years,
+            'discount_rate': self.discount_rate,
+            'annual_degradation': self.degradation,
+            'years': projection['years'].astype(int).tolist(),
+            'generation_kwh': np.round(projection['generation_kwh'][index], 2).tolist(),
+            'savings_usd': np.round(projection['savings_usd'][index], 2).tolist(),
+            'cumulative_cash_flow_usd': np.round(projection['cumulative_cash_flow_usd'][index], 2).tolist(),
+            'discounted_cumulative_cash_flow_usd': np.round(
+                projection['discounted_cumulative_cash_flow_usd'][index], 2
+            ).tolist(),
+            'payback_years': _optional_round(projection['payback_years'][index], 2),
+            'discounted_payback_years': _optional_round(projection['discounted_payback_years'][index], 2),
+            'npv_usd': _optional_round(projection['npv_usd'][index], 2),
+            'irr_percentage': _optional_round(projection['irr'][index] * 100, 2),
+        }
+
+    def summary_columns(self, projection: Dict[str, np.ndarray]) -> Dict[str, list]:
+        """Per-scenario projection metrics in columnar form"""
+        return {
+            name: [_optional_round(value, 2) for value in values]
+            for name, values in (
+                ('payback_years', projection['payback_years']),
+                ('discounted_payback_years', projection['discounted_payback_years']),
+                ('npv_usd', projection['npv_usd']),
+                ('irr_percentage', projection['irr'] * 100),
+            )
+        }
+
+
+def _optional_round(value, decimal_places: int) -> Optional[float]:
+    """Round a float, mapping NaN (not reached / not solvable) to None"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, decimal_places)
@@ -0,0 +1,95 @@
+"""
+Sensitivity (tornado) analysis of a simulation scenario
+
+Every engine parameter in ``SENSITIVITY_PARAMETERS`` is moved by -X% and +X% one
+at a time. The base scenario and all the perturbed variants are stacked as rows
+of a single BatchSimulationEngine call (see ``BatchSimulationEngine.perturbed``),
+so the whole analysis costs one vectorized engine pass.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .batch_engine import BatchSimulationEngine, round_column
+
+# Parameters shown in the tornado chart, in display order
+SENSITIVITY_PARAMETERS = (
+    'energy_price_ars',
+    'exchange_rate',
+    'panel_price',
+    'system_performance_factor',
+)
+
+DEFAULT_VARIATION_PERCENTAGES = (10.0,)
+
+# Result columns reported for the base scenario and every variant
+SENSITIVITY_METRICS = (
+    'number_of_panels',
+    'total_investment_usd',
+    'monthly_savings_ars',
+    'payback_period_years',
+    'roi_annual',
+)
+
+
+def sensitivity_analysis(
+    engine: BatchSimulationEngine,
+    simulation_type: str,
+    monthly_bill_ars: float,
+    parameter,
+    variation_percentages: Sequence[float] = DEFAULT_VARIATION_PERCENTAGES
+) -> Dict[str, Any]:
+    """
+    Tornado data for one scenario.
+
+    ``simulation_type`` is 'bill_coverage', 'panels' or 'investment' and
+    ``parameter`` the matching coverage, panel count or USD amount. Bars are
+    sorted by payback swing (largest first) within each variation.
+    """
+    variation_percentages = list(variation_percentages)
+    simulate = {
+        'bill_coverage': lambda eng, count: eng.simulate_by_bill_coverage(monthly_bill_ars, [parameter] * count),
+        'panels': lambda eng, count: eng.simulate_by_panels(monthly_bill_ars, [parameter] * count),
+        'investment': lambda eng, count: eng.simulate_by_investment(monthly_bill_ars, [parameter] * count),
+    }[simulation_type]
+
+    # Row 0 is the base scenario; then (low, high) pairs per variation and parameter
+    variants = [
+        (variation, name, sign)
+        for variation in variation_percentages
+        for name in SENSITIVITY_PARAMETERS
+        for sign in (-1, 1)
+    ]
+    factors = {name: np.ones(len(variants) + 1) for name in SENSITIVITY_PARAMETERS}
+    for row, (variation, name, sign) in enumerate(variants, start=1):
+        factors[name][row] = 1 + sign * variation / 100
+
+    results = simulate(engine.perturbed(**factors), len(variants) + 1)
+    columns = {name: round_column(name, results[name]) for name in SENSITIVITY_METRICS}
+
+    def row_metrics(row: int) -> Dict[str, Any]:
+        return {name: columns[name][row] for name in SENSITIVITY_METRICS}
+
+    base = row_metrics(0)
+    tornado: List[Dict[str, Any]] = []
+    for index in range(0, len(variants), 2):
+        variation, name, _ = variants[index]
+        low, high = row_metrics(index + 1), row_metrics(index + 2)
+        tornado.append({
+            'parameter': name,
+            'variation_percentage': variation,
+            'low': low,
+            'high': high,
+            'payback_swing_years': round(abs(high['payback_period_years'] - low['payback_period_years']), 2),
+            'roi_swing': round(abs(high['roi_annual'] - low['roi_annual']), 2),
+        })
+
+    tornado.sort(key=lambda bar: (
+        variation_percentages.index(bar['variation_percentage']), -bar['payback_swing_years']
+    ))
+    return {
+        'base': base,
+        'tornado': tornado,
+        'variant_count': len(variants) + 1,
+    }
@@ -1,6 +1,28 @@
+from decimal import Decimal
+
 from rest_framework import serializers
 from .models import InvestmentSimulation, TariffCategory, ExchangeRate
 
+# Maximum scenarios per list accepted by the batch comparison endpoint
+BATCH_MAX_SCENARIOS = 1000
+
+# Maximum panel counts returned by the simulation curve endpoint
+CURVE_MAX_POINTS = 5000
+
+# Monte Carlo risk simulation limits
+MONTE_CARLO_DEFAULT_PATHS = 10000
+MONTE_CARLO_MAX_PATHS = 100000
+
+# Target input field of each target simulation mode
+TARGET_INPUT_FIELDS = {
+    'target_monthly_savings_ars': 'target_monthly_savings',
+    'target_payback_years': 'target_payback_years',
+    'target_roi': 'target_roi',
+}
+
+# Maximum ±X% variations per sensitivity analysis
+SENSITIVITY_MAX_VARIATIONS = 10
+
 
 class TariffCategorySerializer(serializers.ModelSerializer):
     """Serializer for simplified tariff categories"""
@@ -27,6 +49,10 @@ class SimulationInputSerializer(serializers.Serializer):
     user_email = serializers.EmailField(required=False)  # Opcional para usuarios autenticados
     user_phone = serializers.CharField(max_length=20, required=False)  # Opcional para usuarios autenticados
     access_code = serializers.CharField(max_length=50, required=False, help_text="Código de acceso al proyecto")
+    include_projection = serializers.BooleanField(
+        required=False, default=False,
+        help_text="Incluir proyección de flujo de caja a 25 años (VAN, TIR, repago descontado)"
+    )
     
     # One of these three must be provided
     bill_coverage_percentage = serializers.DecimalField(
@@ -39,6 +65,23 @@ class SimulationInputSerializer(serializers.Serializer):
         required=False, allow_null=True
     )
     
+    # Target modes: solve for the panel count that reaches the target
+    target_monthly_savings_ars = serializers.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal('0.01'),
+        required=False, allow_null=True,
+        help_text="Ahorro mensual objetivo (ARS)"
+    )
+    target_payback_years = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=Decimal('0.01'),
+        required=False, allow_null=True,
+        help_text="Período de retorno máximo (años)"
+    )
+    target_roi = serializers.DecimalField(
+        max_digits=6, decimal_places=2, min_value=Decimal('0.01'),
+        required=False, allow_null=True,
+        help_text="ROI anual mínimo (%)"
+    )
+    
     def validate_user_phone(self, value):
         """Validate that phone number starts with +54"""
         if not value.startswith('+54'):
@@ -51,7 +94,7 @@ class SimulationInputSerializer(serializers.Serializer):
             data.get('bill_coverage_percentage'),
             data.get('number_of_panels'),
             data.get('investment_amount_usd')
-        ]
+        ] + [data.get(field) for field in TARGET_INPUT_FIELDS]
         
         # Count non-null parameters
         provided_params = [param for param in simulation_params if param is not None]
@@ -59,7 +102,8 @@ class SimulationInputSerializer(serializers.Serializer):
         if len(provided_params) != 1:
             raise serializers.ValidationError(
                 "Debe proporcionar exactamente uno de los siguientes parámetros: "
-                "bill_coverage_percentage, number_of_panels, o investment_amount_usd"
+                "bill_coverage_percentage, number_of_panels, investment_amount_usd, "
+                "target_monthly_savings_ars, target_payback_years, o target_roi"
             )
         
         return data
@@ -83,7 +127,7 @@ class InvestmentSimulationSerializer(serializers.ModelSerializer):
             'id', 'project_name', 'project_location', 'project_commercial_whatsapp', 'tariff_category_name',
             'user_email', 'user_phone',
             'monthly_bill_ars', 'simulation_type',
-            'bill_coverage_percentage', 'number_of_panels', 'investment_amount_usd',
+            'bill_coverage_percentage', 'number_of_panels', 'investment_amount_usd', 'target_value',
             'total_investment_usd', 'total_investment_ars',
             'installed_power_kw', 'annual_generation_kwh', 'monthly_generation_kwh',
             'monthly_savings_ars', 'annual_savings_ars',
@@ -93,6 +137,56 @@ class InvestmentSimulationSerializer(serializers.ModelSerializer):
         ]
 
 
+class SimulationResultSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for core SimulationResult records (ephemeral simulations).
+    
+    Renders the same fields as InvestmentSimulationSerializer without building a
+    model instance; project and tariff names come from the ``project`` and
+    ``tariff_category`` context entries. Unsaved results have no id or created_at.
+    """
+    
+    value_fields = {
+        'monthly_bill_ars': serializers.DecimalField(max_digits=10, decimal_places=2),
+        'simulation_type': serializers.CharField(),
+        'bill_coverage_percentage': serializers.DecimalField(max_digits=5, decimal_places=2),
+        'number_of_panels': serializers.IntegerField(),
+        'investment_amount_usd': serializers.DecimalField(max_digits=10, decimal_places=2),
+        'target_value': serializers.DecimalField(max_digits=12, decimal_places=2),
+        'total_investment_usd': serializers.DecimalField(max_digits=10, decimal_places=2),
+        'total_investment_ars': serializers.DecimalField(max_digits=15, decimal_places=2),
+        'installed_power_kw': serializers.DecimalField(max_digits=8, decimal_places=3),
+        'annual_generation_kwh': serializers.DecimalField(max_digits=10, decimal_places=2),
+        'monthly_generation_kwh': serializers.DecimalField(max_digits=8, decimal_places=2),
+        'monthly_savings_ars': serializers.DecimalField(max_digits=10, decimal_places=2),
+        'annual_savings_ars': serializers.DecimalField(max_digits=12, decimal_places=2),
+        'monthly_savings_usd': serializers.ReadOnlyField(),
+        'annual_savings_usd': serializers.ReadOnlyField(),
+        'payback_period_years': serializers.DecimalField(max_digits=5, decimal_places=2),
+        'bill_coverage_achieved': serializers.DecimalField(max_digits=5, decimal_places=2),
+        'roi_annual': serializers.DecimalField(max_digits=6, decimal_places=2),
+        'exchange_rate_used': serializers.DecimalField(max_digits=8, decimal_places=2),
+    }
+    
+    def to_representation(self, result):
+        project = self.context.get('project')
+        tariff_category = self.context.get('tariff_category')
+        data = {
+            'id': None,
+            'project_name': project.name if project else None,
+            'project_location': project.location if project else None,
+            'project_commercial_whatsapp': project.commercial_whatsapp if project else None,
+            'tariff_category_name': tariff_category.name if tariff_category else None,
+            'user_email': '',
+            'user_phone': '',
+        }
+        for name, field in self.value_fields.items():
+            value = getattr(result, name)
+            data[name] = None if value is None else field.to_representation(value)
+        data['created_at'] = None
+        return data
+
+
 class SimulationSummarySerializer(serializers.ModelSerializer):
     """Serializer for simulation summary (minimal fields)"""
     
@@ -118,6 +212,7 @@ class SimulationComparisonSerializer(serializers.Serializer):
     project_id = serializers.IntegerField()
     monthly_bill_ars = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
     tariff_category_id = serializers.IntegerField()
+    include_projection = serializers.BooleanField(required=False, default=False)
     
     # Multiple scenarios to compare
     bill_coverage_percentages = serializers.ListField(
@@ -149,4 +244,118 @@ class SimulationComparisonSerializer(serializers.Serializer):
                 "Debe proporcionar al menos una lista de escenarios para comparar."
             )
         
-        return data
\ No newline at end of file
+        return data
+
+
+class BatchSimulationComparisonSerializer(SimulationComparisonSerializer):
+    """Serializer for batch scenario comparison (vectorized engine, columnar results)"""
+    
+    bill_coverage_percentages = serializers.ListField(
+        child=serializers.FloatField(min_value=0, max_value=100),
+        required=False,
+        allow_empty=False,
+        max_length=BATCH_MAX_SCENARIOS
+    )
+    panel_quantities = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=BATCH_MAX_SCENARIOS
+    )
+    investment_amounts = serializers.ListField(
+        child=serializers.FloatField(min_value=0),
+        required=False,
+        allow_empty=False,
+        max_length=BATCH_MAX_SCENARIOS
+    )
+
+
+class SimulationCurveInputSerializer(serializers.Serializer):
+    """Serializer for the panel-count curve input parameters"""
+    
+    project_id = serializers.IntegerField()
+    monthly_bill_ars = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    tariff_category_id = serializers.IntegerField()
+
+
+class SimulationScenarioSerializer(serializers.Serializer):
+    """Serializer for a single unsaved simulation scenario (analysis endpoints)"""
+    
+    project_id = serializers.IntegerField()
+    # Savings are measured against the bill, so it cannot be zero
+    monthly_bill_ars = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+    tariff_category_id = serializers.IntegerField()
+    
+    # One of these three must be provided
+    bill_coverage_percentage = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, max_value=100,
+        required=False, allow_null=True
+    )
+    number_of_panels = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    investment_amount_usd = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0,
+        required=False, allow_null=True
+    )
+    
+    def validate(self, data):
+        """Validate that exactly one simulation parameter is provided"""
+        simulation_params = [
+            data.get('bill_coverage_percentage'),
+            data.get('number_of_panels'),
+            data.get('investment_amount_usd')
+        ]
+        
+        if len([param for param in simulation_params if param is not None]) != 1:
+            raise serializers.ValidationError(
+                "Debe proporcionar exactamente uno de los siguientes parámetros: "
+                "bill_coverage_percentage, number_of_panels, o investment_amount_usd"
+            )
+        
+        return data
+
+
+class MonteCarloInputSerializer(SimulationScenarioSerializer):
+    """Serializer for the Monte Carlo risk simulation input parameters"""
+    
+    paths = serializers.IntegerField(
+        min_value=100, max_value=MONTE_CARLO_MAX_PATHS, default=MONTE_CARLO_DEFAULT_PATHS,
+        help_text="Cantidad de trayectorias de tipo de cambio y precio de energía"
+    )
+    seed = serializers.IntegerField(
+        min_value=0, required=False, allow_null=True,
+        help_text="Semilla para reproducir una corrida"
+    )
+    horizon_years = serializers.IntegerField(min_value=1, max_value=40, required=False)
+
+
+class SensitivityInputSerializer(SimulationScenarioSerializer):
+    """Serializer for the sensitivity (tornado) analysis input parameters"""
+    
+    variation_percentages = serializers.ListField(
+        child=serializers.FloatField(min_value=0, max_value=90),
+        required=False,
+        allow_empty=False,
+        max_length=SENSITIVITY_MAX_VARIATIONS,
+        help_text="Variaciones ±X% a aplicar a cada parámetro (por defecto ±10%)"
+    )
+
+
+class OptimizationInputSerializer(serializers.Serializer):
+    """Serializer for the panel-count optimizer input parameters"""
+    
+    project_id = serializers.IntegerField()
+    monthly_bill_ars = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    tariff_category_id = serializers.IntegerField()
+    objective = serializers.ChoiceField(
+        choices=[('roi', 'Máximo ROI'), ('payback', 'Mínimo repago')],
+        default='roi'
+    )
+    max_budget_usd = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0,
+        required=False, allow_null=True
+    )
+    max_coverage_percentage = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, max_value=100,
+        required=False, allow_null=True
+    )
+    respect_available_power = serializers.BooleanField(required=False, default=True)
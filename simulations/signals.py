@@ -0,0 +1,78 @@
+"""
+Signal handlers for the simulations app
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from projects.models import SolarProject
+from .cache import current_values, project_economics, simulation_results
+from .models import (
+    ExchangeRate, EnergyPrice, InvestmentSimulation, PricingTier, SimulationStats, TariffCategory
+)
+
+
+@receiver([post_save, post_delete], sender=ExchangeRate)
+def invalidate_exchange_rate(sender, **kwargs):
+    """Drop the cached current exchange rate when any rate changes"""
+    current_values.invalidate('exchange_rate')
+    simulation_results.clear()
+    project_economics.clear()
+
+
+@receiver([post_save, post_delete], sender=EnergyPrice)
+def invalidate_energy_price(sender, **kwargs):
+    """Drop the cached current energy price when any price changes"""
+    current_values.invalidate('energy_price')
+    simulation_results.clear()
+    project_economics.clear()
+
+
+@receiver([post_save, post_delete], sender=PricingTier)
+def invalidate_pricing_tiers(sender, **kwargs):
+    """Recompile the tier tables when any tier changes"""
+    current_values.invalidate('price_tiers')
+    simulation_results.clear()
+    project_economics.clear()
+
+
+@receiver([post_save, post_delete], sender=SolarProject)
+def invalidate_project(sender, instance, **kwargs):
+    """Drop the cached engine fields of a project (see get_cached_project)"""
+    current_values.invalidate(f'project:{instance.pk}')
+
+
+@receiver([post_save, post_delete], sender=TariffCategory)
+def invalidate_tariff_categories(sender, **kwargs):
+    """Reload the set of tariff category ids when any category changes"""
+    current_values.invalidate('tariff_category_ids')
+
+
+def _stats_summary_enabled():
+    return getattr(settings, 'SIMULATION_STATS_SUMMARY', True)
+
+
+@receiver(pre_save, sender=InvestmentSimulation)
+def remember_simulation_totals(sender, instance, raw=False, **kwargs):
+    """Keep the stored values of an edited simulation to update the totals by difference"""
+    if _stats_summary_enabled() and not raw and not instance._state.adding:
+        instance._stats_previous = sender.objects.filter(pk=instance.pk).values(
+            *SimulationStats.SUMMED_FIELDS.values()
+        ).first()
+
+
+@receiver(post_save, sender=InvestmentSimulation)
+def add_simulation_to_stats(sender, instance, created, raw=False, **kwargs):
+    if not _stats_summary_enabled() or raw:
+        return
+    if created:
+        SimulationStats.apply(1, instance)
+    elif getattr(instance, '_stats_previous', None) is not None:
+        SimulationStats.apply(0, instance, previous=instance._stats_previous)
+
+
+@receiver(post_delete, sender=InvestmentSimulation)
+def remove_simulation_from_stats(sender, instance, **kwargs):
+    if _stats_summary_enabled():
+        SimulationStats.apply(-1, instance, sign=-1)
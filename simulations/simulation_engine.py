@@ -3,28 +3,108 @@ Investment Simulation Engine for Solar Projects
 
 This module contains the core logic for calculating solar investment returns
 based on user monthly bill, tariff category, and investment parameters.
+
+The formulas live in the ORM-free simulations.core module; SolarInvestmentCalculator
+adapts its results to InvestmentSimulation instances and caches them.
 """
 
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from typing import Dict, Any, Optional
-from .models import InvestmentSimulation, TariffCategory, ExchangeRate, EnergyPrice, ENERGY_PRICE_ARS_PER_KWH
+from django.conf import settings
+from .cache import current_values, project_economics, simulation_results
+from .core import ProjectEconomics, SimulationCore, SimulationResult
+from .models import InvestmentSimulation, TariffCategory
+from .pricing import PricingSnapshot, max_affordable_panels, tier_candidates
 from projects.models import SolarProject
 
+# Inputs are quantized to the precision of the API fields before computing and caching
+INPUT_QUANTUM = Decimal('0.01')
+
+# Core method of each simulation type
+SIMULATION_METHODS = {
+    'bill_coverage': 'simulate_by_bill_coverage',
+    'panels': 'simulate_by_panels',
+    'investment': 'simulate_by_investment',
+    'target_monthly_savings': 'simulate_by_target_monthly_savings',
+    'target_payback_years': 'simulate_by_target_payback_years',
+    'target_roi': 'simulate_by_target_roi',
+}
+
+# Objectives accepted by SolarInvestmentCalculator.optimize_panels
+OPTIMIZATION_OBJECTIVES = ('roi', 'payback')
+
+
+def _quantize_input(value):
+    if isinstance(value, int):
+        return value
+    return Decimal(str(value)).quantize(INPUT_QUANTUM)
+
+
+def get_cached_project(project_id: int) -> Optional[SolarProject]:
+    """
+    Project with only the fields the engine reads (id, panel power, updated_at),
+    or None when it does not exist. Cached in current_values and invalidated by
+    the SolarProject signals, so steady-state lookups do not query the database.
+    Unknown ids are not cached (the id comes from the request).
+    """
+    def load():
+        return SolarProject.objects.only('id', 'panel_power_wp', 'updated_at').filter(pk=project_id).first()
+    
+    return current_values.get(f'project:{project_id}', load, cache_none=False)
+
+
+def get_project_economics(project: SolarProject, pricing: PricingSnapshot) -> ProjectEconomics:
+    """
+    Per-panel economics of ``project`` under ``pricing``, cached by project
+    version and pricing version (unsaved projects are not cached)
+    """
+    if project.pk is None:
+        return ProjectEconomics.build(project.panel_power_wp, pricing)
+    key = (project.pk, project.updated_at, pricing.version)
+    economics = project_economics.get(key)
+    if economics is None:
+        economics = ProjectEconomics.build(project.panel_power_wp, pricing)
+        project_economics.put(key, economics)
+    return economics
+
 
 class SolarInvestmentCalculator:
     """
     Calculator for solar investment simulations
+    
+    All pricing values come from a PricingSnapshot, loaded once when not given,
+    so every simulation run with the same calculator shares one consistent set
+    of values without further database queries.
+    
+    With ``fixed_point=True`` (default: the SIMULATION_FIXED_POINT setting) the
+    simulate_* methods compute in scaled integers through FixedPointEngine and
+    return the same values as the Decimal path at the stored decimal places.
+    It is an exact-arithmetic alternative, not a faster one (see fixed_point).
     """
     
-    def __init__(self, project: SolarProject, tariff_category: TariffCategory):
+    def __init__(
+        self,
+        project: SolarProject,
+        tariff_category: TariffCategory,
+        pricing: Optional[PricingSnapshot] = None,
+        fixed_point: Optional[bool] = None
+    ):
         self.project = project
         self.tariff_category = tariff_category
-        self.exchange_rate = ExchangeRate.get_latest_rate()
+        self.pricing = pricing or PricingSnapshot.load(project)
+        if fixed_point is None:
+            fixed_point = getattr(settings, 'SIMULATION_FIXED_POINT', False)
+        self.fixed_point = fixed_point
+        self.exchange_rate = self.pricing.exchange_rate
+        self.price_tiers = self.pricing.price_tiers
         
         # Solar generation factors (typical for Argentina)
-        self.annual_generation_factor = 1500  # kWh per kWp per year (average)
-        self.system_degradation = Decimal('0.005')  # 0.5% annual degradation
-        self.performance_ratio = Decimal('0.85')  # System efficiency
+        self.annual_generation_factor = self.pricing.annual_generation_factor
+        self.system_degradation = self.pricing.system_degradation
+        self.performance_ratio = self.pricing.performance_ratio
+        
+        self.economics = get_project_economics(project, self.pricing)
+        self.core = SimulationCore(project.panel_power_wp, self.pricing, fixed_point, self.economics)
     
     def simulate_by_bill_coverage(
         self, 
@@ -40,69 +120,8 @@ class SolarInvestmentCalculator:
         - potencia = energia_generada / 24 / 0.19 / 30
         - paneles = potencia / 0.66
         """
-        # Calculate target monthly savings in ARS
-        target_monthly_savings_ars = monthly_bill_ars * (bill_coverage_percentage / 100)
-        
-        # Nueva fórmula: energía_generada = monto_factura_total / precio_energia
-        # target_monthly_savings_ars es el equivalente al "monto de factura" que queremos cubrir
-        energy_price_ars = Decimal(str(EnergyPrice.get_current_price()))
-        required_monthly_generation_kwh = target_monthly_savings_ars / energy_price_ars
-        
-        # Nueva fórmula: potencia = energia_generada / 24 / 0.19 / 30
-        required_power_kw = required_monthly_generation_kwh / Decimal('24') / Decimal('0.19') / Decimal('30')
-        
-        # Nueva fórmula: paneles = potencia / 0.66
-        number_of_panels = int((required_power_kw / Decimal('0.66')).to_integral_value(ROUND_HALF_UP))
-        
-        # Recalculate actual power based on number of panels calculated
-        # actual_power_kw already calculated above as required_power_kw 
-        actual_power_kw = required_power_kw
-        
-        # Calculate actual generation based on the new formula
-        actual_monthly_generation = required_monthly_generation_kwh
-        actual_annual_generation = actual_monthly_generation * 12
-        
-        # Calculate investment using tiered pricing
-        total_investment_usd = self._calculate_total_investment_tiered(number_of_panels)
-        total_investment_ars = total_investment_usd * self.exchange_rate
-        
-        # Calculate savings using new formula (based on number of panels)
-        monthly_savings_ars = self._calculate_monthly_savings(number_of_panels)
-        annual_savings_ars = monthly_savings_ars * 12
-        
-        # Calculate annual savings in USD using blue exchange rate
-        # Formula: (monthly_savings_ars / exchange_rate_blue) * 12
-        annual_savings_usd = (monthly_savings_ars / self.exchange_rate) * 12
-        
-        # Calculate metrics
-        payback_period = total_investment_ars / annual_savings_ars if annual_savings_ars > 0 else Decimal('999')
-        roi_annual = (annual_savings_ars / total_investment_ars) * 100 if total_investment_ars > 0 else Decimal('0')
-        actual_bill_coverage = (monthly_savings_ars / monthly_bill_ars) * 100
-        
-        # Create simulation object
-        simulation = InvestmentSimulation(
-            project=self.project,
-            user_email=user_email,
-            user_phone=user_phone,
-            monthly_bill_ars=monthly_bill_ars,
-            tariff_category=self.tariff_category,
-            simulation_type='bill_coverage',
-            bill_coverage_percentage=bill_coverage_percentage,
-            number_of_panels=number_of_panels,
-            total_investment_usd=total_investment_usd,
-            total_investment_ars=total_investment_ars,
-            installed_power_kw=actual_power_kw,
-            annual_generation_kwh=actual_annual_generation,
-            monthly_generation_kwh=actual_monthly_generation,
-            monthly_savings_ars=monthly_savings_ars,
-            annual_savings_ars=annual_savings_ars,
-            payback_period_years=payback_period,
-            bill_coverage_achieved=actual_bill_coverage,
-            roi_annual=roi_annual,
-            exchange_rate_used=self.exchange_rate
-        )
-        
-        return simulation
+        result = self.calculate('bill_coverage', monthly_bill_ars, bill_coverage_percentage)
+        return self._to_simulation(result, user_email, user_phone)
     
     def simulate_by_panels(
         self, 
@@ -119,56 +138,8 @@ class SolarInvestmentCalculator:
         
         Applies bill-based restrictions to prevent excessive installations.
         """
-        # Apply bill-based restrictions to number of panels
-        original_panels = number_of_panels
-        number_of_panels = self._apply_bill_restrictions(number_of_panels, monthly_bill_ars)
-        
-        # Calculate system specifications
-        panel_power_kw = self.project.panel_power_wp / 1000
-        actual_power_kw = number_of_panels * panel_power_kw
-        actual_annual_generation = actual_power_kw * self.annual_generation_factor * self.performance_ratio
-        actual_monthly_generation = actual_annual_generation / 12
-        
-        # Calculate investment using tiered pricing
-        total_investment_usd = self._calculate_total_investment_tiered(number_of_panels)
-        total_investment_ars = total_investment_usd * self.exchange_rate
-        
-        # Calculate savings using new formula (based on number of panels)
-        monthly_savings_ars = self._calculate_monthly_savings(number_of_panels)
-        annual_savings_ars = monthly_savings_ars * 12
-        
-        # Calculate annual savings in USD using blue exchange rate
-        # Formula: (monthly_savings_ars / exchange_rate_blue) * 12
-        annual_savings_usd = (monthly_savings_ars / self.exchange_rate) * 12
-        
-        # Calculate metrics
-        payback_period = total_investment_ars / annual_savings_ars if annual_savings_ars > 0 else Decimal('999')
-        roi_annual = (annual_savings_ars / total_investment_ars) * 100 if total_investment_ars > 0 else Decimal('0')
-        bill_coverage_achieved = (monthly_savings_ars / monthly_bill_ars) * 100
-        
-        # Create simulation object
-        simulation = InvestmentSimulation(
-            project=self.project,
-            user_email=user_email,
-            user_phone=user_phone,
-            monthly_bill_ars=monthly_bill_ars,
-            tariff_category=self.tariff_category,
-            simulation_type='panels',
-            number_of_panels=number_of_panels,
-            total_investment_usd=total_investment_usd,
-            total_investment_ars=total_investment_ars,
-            installed_power_kw=actual_power_kw,
-            annual_generation_kwh=actual_annual_generation,
-            monthly_generation_kwh=actual_monthly_generation,
-            monthly_savings_ars=monthly_savings_ars,
-            annual_savings_ars=annual_savings_ars,
-            payback_period_years=payback_period,
-            bill_coverage_achieved=bill_coverage_achieved,
-            roi_annual=roi_annual,
-            exchange_rate_used=self.exchange_rate
-        )
-        
-        return simulation
+        result = self.calculate('panels', monthly_bill_ars, number_of_panels)
+        return self._to_simulation(result, user_email, user_phone)
     
     def simulate_by_investment(
         self, 
@@ -181,126 +152,83 @@ class SolarInvestmentCalculator:
         Simulate investment based on investment amount
         Applies bill-based restrictions to prevent excessive investments.
         """
-        # Check investment limits based on bill (100% coverage limit)
-        limits = self._calculate_bill_based_limits(monthly_bill_ars)
-        max_panels_100_coverage = limits['max_panels_for_bill_coverage']
-        
-        # Calculate maximum investment based on 100% coverage
-        max_investment_usd_100_coverage = self._calculate_total_investment_tiered(max_panels_100_coverage)
-        
-        # Apply investment restriction to 100% coverage limit
-        original_investment = investment_amount_usd
-        investment_amount_usd = min(investment_amount_usd, max_investment_usd_100_coverage)
-        
-        # Calculate how many panels can be bought with the investment using tiered pricing
-        # We need to reverse-engineer from investment to panels using tiered pricing
-        
-        # Try different quantities to find how many panels this investment can buy
-        max_panels_possible = 1000  # Reasonable upper limit
-        best_panels = 0
-        
-        for test_panels in range(1, max_panels_possible + 1):
-            cost_for_panels = self._calculate_total_investment_tiered(test_panels)
-            if cost_for_panels <= investment_amount_usd:
-                best_panels = test_panels
-            else:
-                break
-        
-        # Use the exact number of panels that can be afforded with tiered pricing
-        equivalent_panels = Decimal(str(best_panels))
-        number_of_panels = best_panels
-        
-        # Calculate actual power based on the panels we can afford
-        panel_power_kw = self.project.panel_power_wp / 1000
-        actual_power_kw = equivalent_panels * panel_power_kw
+        result = self.calculate('investment', monthly_bill_ars, investment_amount_usd)
+        return self._to_simulation(result, user_email, user_phone)
+    
+    def simulate_by_target(
+        self,
+        simulation_type: str,
+        monthly_bill_ars: Decimal,
+        target_value: Decimal,
+        user_email: str = "",
+        user_phone: str = ""
+    ) -> InvestmentSimulation:
+        """
+        Simulate the fewest panels that reach a target: 'target_monthly_savings'
+        (ARS per month), 'target_payback_years' (years) or 'target_roi' (% per year).
         
-        # Keep the user's exact investment amount
-        actual_investment_usd = investment_amount_usd
-        actual_investment_ars = actual_investment_usd * self.exchange_rate
+        Raises TargetNotReachable when no count within the bill limit reaches it.
+        """
+        result = self.calculate(simulation_type, monthly_bill_ars, target_value)
+        return self._to_simulation(result, user_email, user_phone)
+    
+    def calculate(self, simulation_type: str, monthly_bill_ars, parameter) -> SimulationResult:
+        """
+        Run a core simulation, serving repeated scenarios from the result cache.
         
-        # Calculate generation based on actual power (not rounded panels)
-        actual_annual_generation = actual_power_kw * self.annual_generation_factor * self.performance_ratio
-        actual_monthly_generation = actual_annual_generation / 12
+        Returns the immutable SimulationResult record (no model instance): use it
+        for calculations that are not persisted, with SimulationResultSerializer.
         
-        # Calculate savings using the same formula as _calculate_monthly_savings
-        # But with equivalent fractional panels instead of whole panels
-        # Formula: equivalent_panels × 0.66 × precio_energia × 24 × 30 × 0.19
-        energy_price_ars = Decimal(str(EnergyPrice.get_current_price()))
-        monthly_savings_ars = (
-            equivalent_panels * 
-            Decimal('0.66') * 
-            energy_price_ars * 
-            Decimal('24') * 
-            Decimal('30') * 
-            Decimal('0.19')
+        The key is (project id, project updated_at, tariff, mode, quantized inputs,
+        pricing version), so editing the project or changing the exchange rate or
+        energy price never returns an outdated result.
+        """
+        simulate = getattr(self.core, SIMULATION_METHODS[simulation_type])
+        monthly_bill_ars = _quantize_input(monthly_bill_ars)
+        parameter = _quantize_input(parameter)
+        
+        if self.project.pk is None:
+            # Unsaved projects have no stable identity to key on
+            return simulate(monthly_bill_ars, parameter)
+        
+        key = (
+            self.project.pk, self.project.updated_at, self.tariff_category.pk,
+            simulation_type, monthly_bill_ars, parameter, self.pricing.version,
+            self.fixed_point
         )
-        annual_savings_ars = monthly_savings_ars * 12
-        
-        # Calculate annual savings in USD using blue exchange rate
-        # Formula: (monthly_savings_ars / exchange_rate_blue) * 12
-        annual_savings_usd = (monthly_savings_ars / self.exchange_rate) * 12
-        
-        # Calculate metrics
-        payback_period = actual_investment_ars / annual_savings_ars if annual_savings_ars > 0 else Decimal('999')
-        roi_annual = (annual_savings_ars / actual_investment_ars) * 100 if actual_investment_ars > 0 else Decimal('0')
-        bill_coverage_achieved = (monthly_savings_ars / monthly_bill_ars) * 100
-        
-        # Create simulation object
-        simulation = InvestmentSimulation(
+        result = simulation_results.get(key)
+        if result is None:
+            result = simulate(monthly_bill_ars, parameter)
+            simulation_results.put(key, result)
+        return result
+    
+    def _to_simulation(self, result: SimulationResult, user_email: str, user_phone: str) -> InvestmentSimulation:
+        """Unsaved InvestmentSimulation holding a core result"""
+        return InvestmentSimulation(
             project=self.project,
+            tariff_category=self.tariff_category,
             user_email=user_email,
             user_phone=user_phone,
-            monthly_bill_ars=monthly_bill_ars,
-            tariff_category=self.tariff_category,
-            simulation_type='investment',
-            investment_amount_usd=investment_amount_usd,
-            number_of_panels=number_of_panels,
-            total_investment_usd=actual_investment_usd,
-            total_investment_ars=actual_investment_ars,
-            installed_power_kw=actual_power_kw,
-            annual_generation_kwh=actual_annual_generation,
-            monthly_generation_kwh=actual_monthly_generation,
-            monthly_savings_ars=monthly_savings_ars,
-            annual_savings_ars=annual_savings_ars,
-            payback_period_years=payback_period,
-            bill_coverage_achieved=bill_coverage_achieved,
-            roi_annual=roi_annual,
-            exchange_rate_used=self.exchange_rate
+            **result.as_dict()
         )
-        
-        return simulation
+    
+    @property
+    def fixed_point_engine(self):
+        return self.core.fixed_point_engine
     
     def _calculate_tiered_panel_price(self, number_of_panels: int) -> Decimal:
         """
-        Calculate panel price based on tiered pricing:
-        - 1-9 panels: $700 USD per panel
-        - 10-99 panels: $500 USD per panel  
-        - 100+ panels: $400 USD per panel
+        Calculate panel price with the project's tier table (PricingTier rows,
+        default: 1-9 panels $700, 10-99 panels $500, 100+ panels $400 USD)
         """
-        if number_of_panels <= 9:
-            return Decimal('700')
-        elif number_of_panels <= 99:
-            return Decimal('500')
-        else:
-            return Decimal('400')
+        return self.core.tier_price(number_of_panels)
     
     def _calculate_total_investment_tiered(self, number_of_panels: int) -> Decimal:
         """
-        Calculate total investment using uniform pricing based on tier:
-        - 1-9 panels: $700 USD per panel (ALL panels at $700)
-        - 10-99 panels: $500 USD per panel (ALL panels at $500)
-        - 100+ panels: $400 USD per panel (ALL panels at $400)
+        Calculate total investment using uniform pricing based on tier
+        (ALL panels at the price of the tier the quantity falls into)
         """
-        # Determine the price per panel based on total quantity
-        if number_of_panels <= 9:
-            price_per_panel = Decimal('700')
-        elif number_of_panels <= 99:
-            price_per_panel = Decimal('500')
-        else:
-            price_per_panel = Decimal('400')
-        
-        total_cost = number_of_panels * price_per_panel
-        return total_cost
+        return self.core.total_investment(number_of_panels)
 
     def _calculate_monthly_savings(self, number_of_panels: int) -> Decimal:
         """
@@ -310,23 +238,62 @@ class SolarInvestmentCalculator:
         Where:
         - cant_paneles: Number of panels
         - 0.66: Panel efficiency factor
-        - precio_energia: Energy price in ARS/kWh (102.25)
+        - precio_energia: Energy price in ARS/kWh (from the pricing snapshot)
         - 24: Hours per day
         - 30: Days per month
         - 0.19: System performance factor
         """
-        energy_price_ars = Decimal(str(EnergyPrice.get_current_price()))
+        return self.core.monthly_savings(number_of_panels)
+    
+    def optimize_panels(
+        self,
+        monthly_bill_ars: Decimal,
+        objective: str = 'roi',
+        max_budget_usd: Optional[Decimal] = None,
+        max_coverage_percentage: Optional[Decimal] = None,
+        respect_available_power: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Find the panel count that maximizes ROI ('roi') or minimizes payback
+        ('payback') subject to a USD budget, a maximum bill coverage and the
+        available power of the project.
         
-        monthly_savings_ars = (
-            Decimal(str(number_of_panels)) * 
-            Decimal('0.66') * 
-            energy_price_ars * 
-            Decimal('24') * 
-            Decimal('30') * 
-            Decimal('0.19')
+        Only the largest feasible count of each price tier is evaluated (see
+        pricing.tier_candidates), so the search is O(number of tiers). Ties are
+        resolved in favour of more panels (higher savings).
+        """
+        if objective not in OPTIMIZATION_OBJECTIVES:
+            raise ValueError(f'Objetivo de optimización inválido: {objective}')
+        
+        savings_per_panel = self.pricing.savings_per_panel_ars
+        limits = {'bill_coverage': self._calculate_bill_based_limits(monthly_bill_ars)['max_panels_for_bill_coverage']}
+        if max_coverage_percentage is not None:
+            limits['max_coverage'] = int(monthly_bill_ars * max_coverage_percentage / 100 // savings_per_panel)
+        if respect_available_power and self.project.panel_power_wp > 0:
+            limits['available_power'] = int(self.project.available_power * 1000 // self.project.panel_power_wp)
+        if max_budget_usd is not None:
+            limits['max_budget'] = max_affordable_panels(max_budget_usd, self.price_tiers)
+        
+        candidates = [
+            self.simulate_by_panels(monthly_bill_ars, number_of_panels)
+            for number_of_panels in tier_candidates(min(limits.values()), max_budget_usd, self.price_tiers)
+        ]
+        
+        # Compare at the stored precision so equal tiers tie and more panels win
+        metric = 'roi_annual' if objective == 'roi' else 'payback_period_years'
+        sign = 1 if objective == 'roi' else -1
+        rank = lambda simulation: (
+            sign * Decimal(getattr(simulation, metric)).quantize(Decimal('0.01')),
+            simulation.number_of_panels
         )
         
-        return monthly_savings_ars
+        return {
+            'objective': objective,
+            'simulation': max(candidates, key=rank) if candidates else None,
+            'candidates': candidates,
+            'panel_limits': limits,
+            'binding_constraint': min(limits, key=limits.get),
+        }
     
     def get_project_capacity_check(self, required_power_kw: Decimal) -> Dict[str, Any]:
         """
@@ -346,46 +313,11 @@ class SolarInvestmentCalculator:
         Calculate maximum investment and panels based on monthly bill
         The investment should not exceed what can be recovered through bill savings
         """
-        # Calculate maximum reasonable payback period (e.g., 10 years)
-        max_payback_years = 10
-        max_total_savings = monthly_bill_ars * 12 * max_payback_years  # 10 years of bills
-        
-        # Convert to USD for investment comparison
-        max_investment_ars = max_total_savings
-        max_investment_usd = max_investment_ars / self.exchange_rate
-        
-        # Calculate maximum panels based on what would generate savings equal to the bill
-        # For 100% coverage, we need panels that generate monthly_bill_ars in savings
-        energy_price_ars = Decimal(str(EnergyPrice.get_current_price()))
-        
-        # Use the new coverage formula in reverse
-        # monthly_bill_ars = number_of_panels * ahorro_por_panel
-        # ahorro_por_panel = 0.66 × 101.25 × 24 × 30 × 0.19 = 9,141.66
-        ahorro_por_panel = (
-            Decimal('0.66') * 
-            energy_price_ars * 
-            Decimal('24') * 
-            Decimal('30') * 
-            Decimal('0.19')
-        )
-        
-        max_panels_for_bill = int((monthly_bill_ars / ahorro_por_panel).to_integral_value())
-        
-        return {
-            'max_investment_usd': max_investment_usd,
-            'max_investment_ars': max_investment_ars,
-            'max_panels_for_bill_coverage': max_panels_for_bill,
-            'max_payback_years': max_payback_years,
-            'savings_per_panel_ars': ahorro_por_panel
-        }
+        return self.core.bill_based_limits(monthly_bill_ars)
     
     def _apply_bill_restrictions(self, number_of_panels: int, monthly_bill_ars: Decimal) -> int:
         """
         Apply bill-based restrictions to limit number of panels
         Maximum = exactly what's needed for 100% bill coverage (factura total = ahorro mensual)
         """
-        limits = self._calculate_bill_based_limits(monthly_bill_ars)
-        max_panels = limits['max_panels_for_bill_coverage']
-        
-        # Limit to exactly 100% coverage: factura_total = ahorro_mensual_ars
-        return min(number_of_panels, max_panels)
\ No newline at end of file
+        return self.core.apply_bill_restrictions(number_of_panels, monthly_bill_ars)
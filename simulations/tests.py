@@ -0,0 +1,892 @@
+import multiprocessing
+import os
+import pickle
+import random
+import subprocess
+import sys
+from dataclasses import replace
+from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import numpy as np
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Avg
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import ProjectAccess
+from projects.models import SolarProject
+from .core import SimulationCore, TargetNotReachable, simulate as core_simulate
+from .fixed_point import RESULT_DECIMAL_PLACES, FixedPointEngine
+from . import monte_carlo, projection
+from .models import EnergyPrice, ExchangeRate, InvestmentSimulation, SimulationStats, TariffCategory
+from .pricing import (
+    DEFAULT_PANEL_PRICE_TIERS, PricingSnapshot, TierTable, max_affordable_panels, tier_candidates, total_investment
+)
+from .batch_engine import CURVE_COLUMNS, RESULT_COLUMNS, BatchSimulationEngine
+from .cache import current_values, project_economics, simulation_results
+from .serializers import CURVE_MAX_POINTS
+from .simulation_engine import SIMULATION_METHODS, SolarInvestmentCalculator, get_cached_project
+
+
+def create_project(**fields):
+    """Minimal valid SolarProject with 550 Wp panels; ``fields`` override the defaults"""
+    return SolarProject.objects.create(**{
+        'name': 'Proyecto',
+        'description': '',
+        'location': 'Córdoba',
+        'total_power_installed': Decimal('0'),
+        'total_power_projected': Decimal('100'),
+        'available_power': Decimal('100'),
+        'price_per_wp_usd': Decimal('1'),
+        'owners': 'Prueba',
+        'panel_power_wp': Decimal('550'),
+        **fields
+    })
+
+
+class FixedPointEngineDifferentialTests(SimpleTestCase):
+    """
+    The fixed-point engine must agree with the Decimal engine at the stored
+    decimal places over a randomized corpus of inputs
+    """
+    
+    SCENARIOS_PER_MODE = 2000
+    PANEL_POWERS_WP = [Decimal('400'), Decimal('450.50'), Decimal('550'), Decimal('665.25')]
+    
+    def setUp(self):
+        self.random = random.Random(20250826)
+        self.tariff_category = TariffCategory(name='Residencial', code='T1')
+    
+    def _money(self, low, high):
+        return Decimal(self.random.randint(int(low * 100), int(high * 100))).scaleb(-2)
+    
+    def _calculators(self, pricing=None, panel_power_wp=None):
+        pricing = pricing or PricingSnapshot(
+            exchange_rate=self._money(100, 3000),
+            energy_price_ars=self._money(10, 500)
+        )
+        project = SolarProject(
+            name='Proyecto de prueba',
+            panel_power_wp=panel_power_wp or self.random.choice(self.PANEL_POWERS_WP)
+        )
+        return (
+            SolarInvestmentCalculator(project, self.tariff_category, pricing, fixed_point=False),
+            SolarInvestmentCalculator(project, self.tariff_category, pricing, fixed_point=True),
+        )
+    
+    def _stored(self, value, places):
+        if value is None or places == 0:
+            return value
+        return value.quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_EVEN)
+    
+    def _assert_same_results(self, method, *args):
+        decimal_calculator, fixed_calculator = self._calculators()
+        self._assert_calculators_agree(decimal_calculator, fixed_calculator, method, *args)
+    
+    def _assert_calculators_agree(self, decimal_calculator, fixed_calculator, method, *args):
+        expected = getattr(decimal_calculator, method)(*args)
+        actual = getattr(fixed_calculator, method)(*args)
+        for name, places in RESULT_DECIMAL_PLACES.items():
+            self.assertEqual(
+                self._stored(getattr(expected, name), places),
+                getattr(actual, name),
+                f'{method}{args} {name} (pricing {decimal_calculator.pricing})'
+            )
+    
+    def test_bill_coverage_corpus(self):
+        for _ in range(self.SCENARIOS_PER_MODE):
+            coverage = Decimal(self.random.randint(1, 10000)).scaleb(-2)
+            self._assert_same_results('simulate_by_bill_coverage', self._money(1000, 5000000), coverage)
+    
+    def test_panels_corpus(self):
+        for _ in range(self.SCENARIOS_PER_MODE):
+            panels = self.random.randint(1, 2000)
+            self._assert_same_results('simulate_by_panels', self._money(1000, 5000000), panels)
+    
+    def test_investment_corpus(self):
+        for _ in range(self.SCENARIOS_PER_MODE):
+            self._assert_same_results(
+                'simulate_by_investment', self._money(1000, 5000000), self._money(0, 1000000)
+            )
+    
+    def test_rounding_ties(self):
+        # Savings per panel is 9028.80 ARS at 100 ARS/kWh: 22572 ARS is exactly 2.5 panels
+        pricing = PricingSnapshot(exchange_rate=Decimal('1000'), energy_price_ars=Decimal('100'))
+        decimal_calculator, fixed_calculator = self._calculators(pricing, Decimal('550'))
+        for method, bill, mode_input in [
+            ('simulate_by_panels', Decimal('22572'), 10),
+            ('simulate_by_panels', Decimal('31600.80'), 10),
+            ('simulate_by_bill_coverage', Decimal('22572'), Decimal('100')),
+            ('simulate_by_bill_coverage', Decimal('45144'), Decimal('50')),
+            ('simulate_by_investment', Decimal('903000'), Decimal('5000')),
+            ('simulate_by_investment', Decimal('903000'), Decimal('40000')),
+        ]:
+            self._assert_calculators_agree(decimal_calculator, fixed_calculator, method, bill, mode_input)
+
+
+class TargetSimulationTests(SimpleTestCase):
+    """
+    Target modes must return the fewest panels that reach the target, as found
+    by scanning every panel count up to the bill limit
+    """
+    
+    SCENARIOS = 300
+    
+    def setUp(self):
+        self.random = random.Random(20261017)
+        self.core = SimulationCore(
+            Decimal('550'), PricingSnapshot(exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25'))
+        )
+    
+    def _scan(self, monthly_bill_ars, reached):
+        max_panels = self.core.bill_based_limits(monthly_bill_ars)['max_panels_for_bill_coverage']
+        for number_of_panels in range(1, max_panels + 1):
+            if reached(self.core.simulate_by_panels(monthly_bill_ars, number_of_panels)):
+                return number_of_panels
+        return None
+    
+    def _solve(self, method, monthly_bill_ars, target_value):
+        try:
+            return getattr(self.core, method)(monthly_bill_ars, target_value).number_of_panels
+        except TargetNotReachable:
+            return None
+    
+    def test_targets_match_scan(self):
+        for _ in range(self.SCENARIOS):
+            bill = Decimal(self.random.randint(1000000, 200000000)).scaleb(-2)
+            savings = Decimal(self.random.randint(100, 300000000)).scaleb(-2)
+            payback = Decimal(self.random.randint(100, 1500)).scaleb(-2)
+            roi = Decimal(self.random.randint(100, 4000)).scaleb(-2)
+            for method, target, reached in [
+                ('simulate_by_target_monthly_savings', savings, lambda result: result.monthly_savings_ars >= savings),
+                ('simulate_by_target_payback_years', payback, lambda result: result.payback_period_years <= payback),
+                ('simulate_by_target_roi', roi, lambda result: result.roi_annual >= roi),
+            ]:
+                self.assertEqual(
+                    self._solve(method, bill, target), self._scan(bill, reached), f'{method}({bill}, {target})'
+                )
+    
+    def test_result_records_target(self):
+        result = self.core.simulate_by_target_payback_years(Decimal('5000000'), Decimal('8'))
+        self.assertEqual(result.simulation_type, 'target_payback_years')
+        self.assertEqual(result.target_value, Decimal('8'))
+        self.assertLessEqual(result.payback_period_years, Decimal('8'))
+
+
+@override_settings(SIMULATION_STATS_SUMMARY=True)
+class SimulationStatsSummaryTests(TestCase):
+    """
+    The summary row must match the simulation table after creates, edits and
+    deletes, and stats reads must not scan the table
+    """
+    
+    def setUp(self):
+        project = create_project()
+        tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        self.calculator = SolarInvestmentCalculator(
+            project, tariff_category,
+            PricingSnapshot(exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25'))
+        )
+    
+    def _simulate(self, number_of_panels):
+        simulation = self.calculator.simulate_by_panels(Decimal('500000'), number_of_panels, 'a@b.com', '+54')
+        simulation.save()
+        return simulation
+    
+    def _assert_summary_matches(self):
+        stats = SimulationStats.objects.get(pk=1)
+        for name, value in SimulationStats.compute().items():
+            self.assertEqual(getattr(stats, name), value, name)
+    
+    def test_incremental_updates(self):
+        simulations = [self._simulate(number_of_panels) for number_of_panels in (1, 5, 12)]
+        self._assert_summary_matches()
+        
+        simulations[0].roi_annual = Decimal('99.99')
+        simulations[0].save()
+        self._assert_summary_matches()
+        
+        simulations[1].delete()
+        InvestmentSimulation.objects.filter(pk=simulations[2].pk).delete()
+        self._assert_summary_matches()
+        self.assertEqual(SimulationStats.objects.get(pk=1).total_simulations, 1)
+    
+    def test_stats_view_reads_summary(self):
+        for number_of_panels in (2, 4):
+            self._simulate(number_of_panels)
+        client = APIClient(HTTP_HOST='localhost')
+        with self.assertNumQueries(1):
+            response = client.get('/api/v1/simulations/stats/')
+        data = response.json()
+        self.assertEqual(data['total_simulations'], 2)
+        averages = InvestmentSimulation.objects.aggregate(Avg('total_investment_usd'), Avg('roi_annual'))
+        self.assertAlmostEqual(data['average_investment_usd'], float(averages['total_investment_usd__avg']))
+        self.assertAlmostEqual(data['average_roi_annual'], float(averages['roi_annual__avg']))
+
+
+class IrrTests(SimpleTestCase):
+    """
+    The vectorized IRR solver must match a plain bisection on every row, or
+    return NaN
+    """
+    
+    def _reference_irr(self, cash_flows):
+        npv = lambda rate: sum(flow * (1 + rate) ** -year for year, flow in enumerate(cash_flows))
+        lower, upper = projection.IRR_LOWER_BOUND, projection.IRR_UPPER_BOUND
+        if np.sign(npv(lower)) == np.sign(npv(upper)):
+            return np.nan
+        for _ in range(200):
+            middle = (lower + upper) / 2
+            if np.sign(npv(middle)) == np.sign(npv(lower)):
+                lower = middle
+            else:
+                upper = middle
+        return (lower + upper) / 2
+    
+    def _flows(self, savings_ratio, years=25, degradation=0.005):
+        return [-1000.0] + [1000 * savings_ratio * (1 - degradation) ** year for year in range(years)]
+    
+    def _assert_matches_reference(self, rows):
+        rows = np.array(rows)
+        expected = np.array([self._reference_irr(row) for row in rows])
+        np.testing.assert_allclose(projection.irr(rows), expected, rtol=0, atol=1e-8)
+    
+    def test_low_return_flows(self):
+        # Savings of ~1.3% of the investment a year: IRR around -8%
+        generator = np.random.default_rng(20261017)
+        self._assert_matches_reference([self._flows(ratio) for ratio in generator.uniform(0.0125, 0.0133, 100)])
+    
+    def test_random_flows(self):
+        generator = np.random.default_rng(8)
+        self._assert_matches_reference([
+            self._flows(ratio, degradation=degradation)
+            for ratio, degradation in zip(generator.uniform(0.001, 2, 300), generator.uniform(0, 0.05, 300))
+        ])
+    
+    def test_no_sign_change(self):
+        result = projection.irr(np.array([[1000.0] + [10.0] * 25, [0.0] * 26]))
+        self.assertTrue(np.isnan(result).all())
+    
+    def test_unconverged_rows_are_nan(self):
+        with mock.patch.object(projection, 'IRR_ITERATIONS', 2):
+            self.assertTrue(np.isnan(projection.irr(np.array([self._flows(0.013)]))).all())
+
+
+class TierSolverTests(SimpleTestCase):
+    """
+    The O(tiers) inverse solvers must agree with a brute-force scan of
+    total_investment, for random tables (including ones whose first tier
+    starts above 1 panel)
+    """
+    
+    TABLES = 500
+    
+    def setUp(self):
+        self.random = random.Random(17)
+    
+    def _random_table(self):
+        minimums = sorted(self.random.sample(range(1, 60), self.random.randint(1, 5)))
+        return TierTable(
+            (minimum, Decimal(self.random.randint(10000, 90000)).scaleb(-2)) for minimum in minimums
+        )
+    
+    def _brute_force(self, budget_usd, max_panels, tiers):
+        best_by_tier = {}
+        for number_of_panels in range(1, max_panels + 1):
+            if total_investment(number_of_panels, tiers) <= budget_usd:
+                tier = max(index for index, minimum in enumerate(tiers.minimums) if minimum <= number_of_panels)
+                best_by_tier[tier] = number_of_panels
+        return sorted(best_by_tier.values())
+    
+    def test_first_tier_starts_at_one(self):
+        self.assertEqual(TierTable([(5, Decimal('700')), (10, Decimal('500'))]).minimums, [1, 10])
+    
+    def test_solvers_match_brute_force(self):
+        for _ in range(self.TABLES):
+            tiers = self._random_table()
+            budget_usd = Decimal(self.random.randint(0, 5000000)).scaleb(-2)
+            max_panels = self.random.randint(0, 120)
+            fixed_point = FixedPointEngine(
+                Decimal('550'),
+                PricingSnapshot(exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25'), price_tiers=tiers)
+            )
+            
+            # Only the budget limits the count: no table sells more than budget // cheapest price
+            unlimited = self._brute_force(budget_usd, int(budget_usd // min(tiers.prices)) + 1, tiers)
+            expected_max = max(unlimited, default=0)
+            self.assertEqual(max_affordable_panels(budget_usd, tiers), expected_max, (tiers, budget_usd))
+            self.assertEqual(fixed_point._max_affordable_panels(int(budget_usd * 100)), expected_max)
+            self.assertEqual(
+                tier_candidates(max_panels, budget_usd, tiers),
+                self._brute_force(budget_usd, max_panels, tiers),
+                (tiers, budget_usd, max_panels)
+            )
+
+
+class CachedProjectTests(TestCase):
+    """
+    get_cached_project serves known projects without queries and does not
+    keep unknown ids (they come from request input)
+    """
+    
+    def setUp(self):
+        current_values.clear()
+        self.addCleanup(current_values.clear)
+        self.project = create_project()
+    
+    def test_second_lookup_runs_no_queries(self):
+        self.assertEqual(get_cached_project(self.project.pk).pk, self.project.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_project(self.project.pk).pk, self.project.pk)
+    
+    def test_unknown_ids_are_not_retained(self):
+        entries = len(current_values._entries)
+        for project_id in range(10 ** 6, 10 ** 6 + 50):
+            self.assertIsNone(get_cached_project(project_id))
+        self.assertEqual(len(current_values._entries), entries)
+
+
+class MonteCarloTests(TestCase):
+    """
+    Risk runs are reproducible from their seed wherever the chunks run, and
+    the endpoint rejects inputs the engine cannot simulate
+    """
+    
+    def setUp(self):
+        self.project = create_project()
+        self.tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.scenario = monte_carlo.RiskScenario(
+            investment_usd=5000.0,
+            monthly_savings_ars=150000.0,
+            exchange_rate=1330.0,
+            degradation=0.005,
+            model=monte_carlo.RiskModel(
+                exchange_rate=monte_carlo.PriceProcess(0.3, 0.3),
+                energy_price=monte_carlo.PriceProcess(0.25, 0.2),
+            ),
+        )
+    
+    def _post(self, **data):
+        payload = {
+            'project_id': self.project.pk,
+            'tariff_category_id': self.tariff_category.pk,
+            'monthly_bill_ars': '500000',
+            'number_of_panels': 10,
+            'paths': 1000,
+            **data
+        }
+        return self.client.post('/api/v1/simulations/risk/', payload, format='json')
+    
+    def test_seed_reproduces_run_in_process_and_in_pool(self):
+        paths = monte_carlo.CHUNK_PATHS * 2 + 10
+        expected = monte_carlo.run(self.scenario, paths, seed=42)
+        self.assertEqual(monte_carlo.run(self.scenario, paths, seed=42), expected)
+        
+        self.addCleanup(monte_carlo.shutdown)
+        self.assertEqual(monte_carlo.run(self.scenario, paths, seed=42, workers=2, parallel_min_paths=0), expected)
+        self.assertNotEqual(monte_carlo.run(self.scenario, paths, seed=43), expected)
+    
+    def test_small_runs_stay_in_process(self):
+        with mock.patch.object(monte_carlo, '_get_executor') as get_executor:
+            monte_carlo.run(self.scenario, monte_carlo.CHUNK_PATHS * 2, seed=1, workers=4)
+        get_executor.assert_not_called()
+    
+    def test_endpoint_is_reproducible(self):
+        first = self._post(seed=7)
+        self.assertEqual(first.status_code, 200)
+        data = first.json()
+        self.assertEqual(data['risk']['paths'], 1000)
+        self.assertEqual(data['risk']['seed'], 7)
+        self.assertEqual(data['simulation']['number_of_panels'], 10)
+        self.assertEqual(self._post(seed=7).json()['risk'], data['risk'])
+    
+    def test_zero_bill_is_rejected(self):
+        response = self._post(monthly_bill_ars='0')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('monthly_bill_ars', response.json()['errors'])
+    
+    def test_zero_savings_never_pay_back(self):
+        response = self._post(number_of_panels=None, investment_amount_usd='0', seed=3)
+        self.assertEqual(response.status_code, 200)
+        risk = response.json()['risk']
+        self.assertEqual(risk['probability_payback_within_horizon'], 0.0)
+        self.assertIsNone(risk['payback_years']['p50'])
+
+
+class SensitivityViewTests(TestCase):
+    """The sensitivity endpoint answers valid scenarios and rejects a zero bill"""
+    
+    def setUp(self):
+        self.project = create_project()
+        self.tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        self.client = APIClient(HTTP_HOST='localhost')
+    
+    def _post(self, monthly_bill_ars, **data):
+        payload = {
+            'project_id': self.project.pk,
+            'tariff_category_id': self.tariff_category.pk,
+            'monthly_bill_ars': monthly_bill_ars,
+            **data
+        }
+        return self.client.post('/api/v1/simulations/sensitivity/', payload, format='json')
+    
+    def test_valid_scenario(self):
+        response = self._post('500000', bill_coverage_percentage='80')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['simulation_type'], 'bill_coverage')
+    
+    def test_zero_bill_is_rejected(self):
+        for data in ({'bill_coverage_percentage': '80'}, {'number_of_panels': 4}, {'investment_amount_usd': '1000'}):
+            response = self._post('0', **data)
+            self.assertEqual(response.status_code, 400, data)
+            self.assertIn('monthly_bill_ars', response.json()['errors'])
+
+
+class CreateSimulationTargetTests(TestCase):
+    """
+    The create endpoint saves target simulations with their mode and target,
+    answers 400 for unreachable targets and accepts a single target only
+    """
+    
+    def setUp(self):
+        self.project = create_project()
+        self.tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        user = User.objects.create_user('cliente', 'cliente@example.com', 'clave-segura')
+        ProjectAccess.objects.create(user=user, project=self.project)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(user)
+    
+    def _post(self, **data):
+        payload = {
+            'project_id': self.project.pk,
+            'tariff_category_id': self.tariff_category.pk,
+            'monthly_bill_ars': '500000',
+            **data
+        }
+        return self.client.post('/api/v1/simulations/create/', payload, format='json')
+    
+    def test_targets_are_saved(self):
+        for field, simulation_type, target in [
+            ('target_monthly_savings_ars', 'target_monthly_savings', '100000.00'),
+            ('target_payback_years', 'target_payback_years', '12.00'),
+            ('target_roi', 'target_roi', '5.00'),
+        ]:
+            response = self._post(**{field: target})
+            self.assertEqual(response.status_code, 201, response.content)
+            simulation = InvestmentSimulation.objects.get(pk=response.json()['simulation']['id'])
+            self.assertEqual(simulation.simulation_type, simulation_type)
+            self.assertEqual(simulation.target_value, Decimal(target))
+            self.assertGreater(simulation.number_of_panels, 0)
+    
+    def test_unreachable_target_is_rejected(self):
+        # Savings above the bill need more panels than 100% coverage allows
+        response = self._post(target_monthly_savings_ars='600000')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+        self.assertFalse(InvestmentSimulation.objects.exists())
+    
+    def test_single_target_only(self):
+        response = self._post(target_payback_years='12', target_roi='5')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('non_field_errors', response.json()['errors'])
+        self.assertFalse(InvestmentSimulation.objects.exists())
+
+
+class UserSimulationsPaginationTests(TestCase):
+    """
+    The user's simulation list keeps page-number pagination by default and
+    walks every simulation once with ?pagination=cursor, even on created_at ties
+    """
+    
+    def setUp(self):
+        project = create_project()
+        tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        calculator = SolarInvestmentCalculator(
+            project, tariff_category,
+            PricingSnapshot(exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25'))
+        )
+        self.user = User.objects.create_user('cliente', 'cliente@example.com', 'clave-segura')
+        other = User.objects.create_user('otro', 'otro@example.com', 'clave-segura')
+        for index in range(45):
+            simulation = calculator.simulate_by_panels(Decimal('500000'), index % 30 + 1)
+            simulation.user = self.user if index % 9 else other
+            simulation.save()
+        # Two groups of identical timestamps spanning page boundaries
+        simulations = InvestmentSimulation.objects.order_by('id')
+        simulations.filter(pk__in=[simulation.pk for simulation in simulations[:25]]).update(
+            created_at=timezone.now()
+        )
+        simulations.filter(pk__in=[simulation.pk for simulation in simulations[25:]]).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.user)
+    
+    def test_page_number_is_default(self):
+        data = self.client.get('/api/v1/simulations/user/').json()
+        self.assertEqual(data['count'], InvestmentSimulation.objects.filter(user=self.user).count())
+        self.assertEqual(len(data['results']), 20)
+    
+    def test_cursor_walks_every_simulation_once(self):
+        response = self.client.get('/api/v1/simulations/user/', {'pagination': 'cursor'})
+        ids = []
+        while True:
+            data = response.json()
+            self.assertNotIn('count', data)
+            ids.extend(simulation['id'] for simulation in data['results'])
+            if not data['next']:
+                break
+            response = self.client.get(data['next'])
+        expected = InvestmentSimulation.objects.filter(user=self.user).order_by('-created_at', '-id')
+        self.assertEqual(ids, [str(simulation.pk) for simulation in expected])
+
+
+class InvestmentSimulationTests(SimpleTestCase):
+    """
+    simulate_by_investment must buy the most panels the (bill-capped) budget
+    affords, as found by scanning every panel count, in both engines
+    """
+    
+    SCENARIOS = 300
+    
+    def setUp(self):
+        self.random = random.Random(1)
+        self.tariff_category = TariffCategory(name='Residencial', code='T1')
+    
+    def _calculators(self, tiers):
+        pricing = PricingSnapshot(
+            exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25'), price_tiers=tiers
+        )
+        project = SolarProject(name='Proyecto', panel_power_wp=Decimal('550'))
+        return [
+            SolarInvestmentCalculator(project, self.tariff_category, pricing, fixed_point=fixed_point)
+            for fixed_point in (False, True)
+        ]
+    
+    def _scan(self, calculator, monthly_bill_ars, investment_amount_usd):
+        max_panels = calculator._calculate_bill_based_limits(monthly_bill_ars)['max_panels_for_bill_coverage']
+        budget_usd = min(investment_amount_usd, calculator._calculate_total_investment_tiered(max_panels))
+        highest = int(budget_usd // min(price for _, price in calculator.price_tiers)) + 1
+        return max(
+            (
+                number_of_panels for number_of_panels in range(highest + 1)
+                if calculator._calculate_total_investment_tiered(number_of_panels) <= budget_usd
+            ),
+            default=0
+        )
+    
+    def test_matches_scan(self):
+        tables = [
+            DEFAULT_PANEL_PRICE_TIERS,
+            TierTable([(1, Decimal('650.50')), (8, Decimal('610')), (40, Decimal('399.99'))]),
+        ]
+        for _ in range(self.SCENARIOS):
+            tiers = self.random.choice(tables)
+            bill = Decimal(self.random.randint(1000000, 100000000)).scaleb(-2)
+            investment = Decimal(self.random.randint(0, 6000000)).scaleb(-2)
+            for calculator in self._calculators(tiers):
+                self.assertEqual(
+                    calculator.simulate_by_investment(bill, investment).number_of_panels,
+                    self._scan(calculator, bill, investment),
+                    (tiers, bill, investment, calculator.fixed_point)
+                )
+    
+    def test_no_panel_ceiling(self):
+        for calculator in self._calculators(DEFAULT_PANEL_PRICE_TIERS):
+            simulation = calculator.simulate_by_investment(Decimal('99999999'), Decimal('600000'))
+            self.assertEqual(simulation.number_of_panels, 1500)
+
+
+class BatchEngineDifferentialTests(TestCase):
+    """
+    The vectorized batch engine (compare/batch and curve endpoints) must agree
+    with the Decimal engine scenario by scenario
+    """
+    
+    SCENARIOS = 400
+    
+    def setUp(self):
+        self.random = random.Random(2)
+        self.pricing = PricingSnapshot(exchange_rate=Decimal('1330.50'), energy_price_ars=Decimal('101.25'))
+        self.core = SimulationCore(Decimal('550'), self.pricing)
+        self.engine = BatchSimulationEngine(Decimal('550'), self.pricing)
+    
+    def _assert_close(self, expected, actual, message, places=None):
+        expected = float(expected)
+        if places is None:
+            self.assertAlmostEqual(actual, expected, delta=max(abs(expected) * 1e-9, 1e-9), msg=message)
+        else:
+            # Float and Decimal rounding may land on either side of a half unit
+            self.assertAlmostEqual(actual, expected, delta=10 ** -places * 1.001, msg=message)
+    
+    def _assert_matches_core(self, method, bill, parameters, results, places=None):
+        for index, parameter in enumerate(parameters):
+            expected = getattr(self.core, method)(bill, parameter)
+            message = f'{method}({bill}, {parameter})'
+            self.assertEqual(results['number_of_panels'][index], expected.number_of_panels, message)
+            for name, decimal_places in RESULT_COLUMNS.items():
+                if name != 'number_of_panels':
+                    self._assert_close(
+                        getattr(expected, name), results[name][index], f'{message} {name}',
+                        decimal_places if places else None
+                    )
+    
+    def test_modes_match_decimal_engine(self):
+        for method, parameter in [
+            ('simulate_by_bill_coverage', lambda: Decimal(self.random.randint(0, 10000)).scaleb(-2)),
+            ('simulate_by_panels', lambda: self.random.randint(1, 400)),
+            ('simulate_by_investment', lambda: Decimal(self.random.randint(0, 8000000)).scaleb(-2)),
+        ]:
+            bill = Decimal(self.random.randint(100000, 300000000)).scaleb(-2)
+            parameters = [parameter() for _ in range(self.SCENARIOS)]
+            results = getattr(self.engine, method)(float(bill), [float(value) for value in parameters])
+            self._assert_matches_core(method, bill, parameters, {name: list(values) for name, values in results.items()})
+    
+    def test_curve_matches_decimal_engine(self):
+        bill = Decimal('2345678.90')
+        curve = self.engine.curve(float(bill), max_points=CURVE_MAX_POINTS)
+        max_panels = self.core.bill_based_limits(bill)['max_panels_for_bill_coverage']
+        self.assertEqual(curve['max_panels_for_bill_coverage'], max_panels)
+        self.assertFalse(curve['truncated'])
+        self.assertEqual(curve['number_of_panels'], list(range(1, max_panels + 1)))
+        for number_of_panels in curve['number_of_panels']:
+            expected = self.core.simulate_by_panels(bill, number_of_panels)
+            for name in CURVE_COLUMNS:
+                self._assert_close(
+                    getattr(expected, name), curve[name][number_of_panels - 1],
+                    f'{number_of_panels} panels {name}', RESULT_COLUMNS[name]
+                )
+        
+        truncated = self.engine.curve(float(bill), max_points=10)
+        self.assertTrue(truncated['truncated'])
+        self.assertEqual(truncated['number_of_panels'], list(range(1, 11)))
+    
+    def test_batch_endpoint_matches_compare_endpoint(self):
+        project = create_project()
+        tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        payload = {
+            'project_id': project.pk,
+            'tariff_category_id': tariff_category.pk,
+            'monthly_bill_ars': '750000.00',
+            'bill_coverage_percentages': ['12.50', '50.00', '100.00'],
+            'panel_quantities': [1, 9, 10, 60, 500],
+            'investment_amounts': ['0.00', '699.99', '5000.00', '31234.56'],
+        }
+        client = APIClient(HTTP_HOST='localhost')
+        batch = client.post('/api/v1/simulations/compare/batch/', payload, format='json').json()['results']
+        scenarios = client.post('/api/v1/simulations/compare/', payload, format='json').json()['comparison_results']
+        
+        self.assertEqual(batch['simulation_type'], [scenario['type'] for scenario in scenarios])
+        for index, scenario in enumerate(scenarios):
+            simulation = scenario['simulation']
+            self.assertEqual(batch['number_of_panels'][index], simulation['number_of_panels'])
+            for name, decimal_places in RESULT_COLUMNS.items():
+                self._assert_close(simulation[name], batch[name][index], f'{scenario} {name}', decimal_places)
+
+
+class OptimizerTests(SimpleTestCase):
+    """
+    optimize_panels must pick the same panel count as a scan of every count
+    that satisfies the budget, coverage, available power and bill limits
+    """
+    
+    SCENARIOS = 300
+    
+    def setUp(self):
+        self.random = random.Random(11)
+        self.tariff_category = TariffCategory(name='Residencial', code='T1')
+    
+    def _random_calculator(self):
+        minimums = sorted(self.random.sample(range(1, 80), self.random.randint(1, 4)))
+        tiers = TierTable(
+            (minimum, Decimal(self.random.randint(30000, 90000)).scaleb(-2)) for minimum in minimums
+        )
+        project = SolarProject(
+            name='Proyecto', panel_power_wp=Decimal('550'),
+            available_power=Decimal(self.random.randint(0, 100000)).scaleb(-3)
+        )
+        pricing = PricingSnapshot(
+            exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25'), price_tiers=tiers
+        )
+        return SolarInvestmentCalculator(project, self.tariff_category, pricing)
+    
+    def _scan(self, calculator, bill, objective, budget, coverage):
+        limit = calculator._calculate_bill_based_limits(bill)['max_panels_for_bill_coverage']
+        limit = min(limit, int(calculator.project.available_power * 1000 // calculator.project.panel_power_wp))
+        if coverage is not None:
+            limit = min(limit, int(bill * coverage / 100 // calculator.pricing.savings_per_panel_ars))
+        
+        best = None
+        for number_of_panels in range(1, limit + 1):
+            if budget is not None and calculator._calculate_total_investment_tiered(number_of_panels) > budget:
+                continue
+            simulation = calculator.simulate_by_panels(bill, number_of_panels)
+            if objective == 'roi':
+                score = simulation.roi_annual.quantize(Decimal('0.01'))
+            else:
+                score = -simulation.payback_period_years.quantize(Decimal('0.01'))
+            if best is None or (score, number_of_panels) > best:
+                best = (score, number_of_panels)
+        return best[1] if best else None
+    
+    def test_matches_scan(self):
+        for _ in range(self.SCENARIOS):
+            calculator = self._random_calculator()
+            bill = Decimal(self.random.randint(1000000, 100000000)).scaleb(-2)
+            objective = self.random.choice(['roi', 'payback'])
+            budget = self.random.choice([None, Decimal(self.random.randint(0, 6000000)).scaleb(-2)])
+            coverage = self.random.choice([None, Decimal(self.random.randint(0, 10000)).scaleb(-2)])
+            
+            result = calculator.optimize_panels(bill, objective, budget, coverage)
+            optimal = result['simulation']
+            self.assertEqual(
+                optimal.number_of_panels if optimal is not None else None,
+                self._scan(calculator, bill, objective, budget, coverage),
+                (calculator.price_tiers, calculator.project.available_power, bill, objective, budget, coverage)
+            )
+
+
+class SimulationCoreTests(TestCase):
+    """
+    The core runs without Django and its results survive pickling; the
+    calculator adapter returns exactly the core results, cached or not
+    """
+    
+    SCENARIOS = 200
+    
+    def setUp(self):
+        self.random = random.Random(13)
+        self.pricing = PricingSnapshot(exchange_rate=Decimal('1330.50'), energy_price_ars=Decimal('101.25'))
+    
+    def _scenarios(self):
+        for _ in range(self.SCENARIOS):
+            bill = Decimal(self.random.randint(100000, 300000000)).scaleb(-2)
+            method, parameter = self.random.choice([
+                ('bill_coverage', Decimal(self.random.randint(0, 10000)).scaleb(-2)),
+                ('panels', self.random.randint(1, 400)),
+                ('investment', Decimal(self.random.randint(0, 8000000)).scaleb(-2)),
+            ])
+            yield method, bill, parameter
+    
+    def test_imports_without_django(self):
+        code = (
+            'import sys, simulations.core; '
+            'sys.exit(any(name.split(".")[0] == "django" for name in sys.modules))'
+        )
+        environment = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+        completed = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, env=environment, capture_output=True
+        )
+        self.assertEqual(completed.returncode, 0, completed.stderr.decode())
+    
+    def test_runs_in_spawned_worker(self):
+        scenarios = list(self._scenarios())[:20]
+        arguments = [
+            (Decimal('550'), self.pricing, SIMULATION_METHODS[method], bill, parameter)
+            for method, bill, parameter in scenarios
+        ]
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(core_simulate, *zip(*arguments)))
+        for args, result in zip(arguments, results):
+            self.assertEqual(result.as_dict(), core_simulate(*args).as_dict())
+    
+    def test_results_pickle(self):
+        result = SimulationCore(Decimal('550'), self.pricing).simulate_by_panels(Decimal('500000'), 12)
+        self.assertEqual(pickle.loads(pickle.dumps(result)).as_dict(), result.as_dict())
+        with self.assertRaises(AttributeError):
+            result.number_of_panels = 13
+    
+    @override_settings(SIMULATION_CACHE_SIZE=1024)
+    def test_calculator_returns_core_results(self):
+        project = create_project()
+        tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        for fixed_point in (False, True):
+            calculator = SolarInvestmentCalculator(project, tariff_category, self.pricing, fixed_point=fixed_point)
+            for method, bill, parameter in self._scenarios():
+                expected = core_simulate(
+                    Decimal('550'), self.pricing, SIMULATION_METHODS[method], bill, parameter, fixed_point
+                ).as_dict()
+                self.assertEqual(calculator.calculate(method, bill, parameter).as_dict(), expected)
+                # Second call is served from the result cache
+                self.assertEqual(calculator.calculate(method, bill, parameter).as_dict(), expected)
+
+
+class ProjectEconomicsTests(TestCase):
+    """
+    Cached per-project economics follow the pricing snapshot version and the
+    project version, and give the same results as the plain formulas
+    """
+    
+    def setUp(self):
+        for cache in (current_values, project_economics, simulation_results):
+            cache.clear()
+            self.addCleanup(cache.clear)
+        self.project = create_project()
+        self.tariff_category = TariffCategory.objects.create(name='Residencial', code='T1')
+        ExchangeRate.objects.create(rate=Decimal('1330.00'), date=date(2026, 1, 1))
+        EnergyPrice.objects.create(price_ars_per_kwh=Decimal('101.25'), effective_date=date(2026, 1, 1))
+    
+    def _calculator(self):
+        return SolarInvestmentCalculator(self.project, self.tariff_category)
+    
+    def _assert_uncached(self, calculator, number_of_panels):
+        # Same result as a core built from scratch (fresh economics, no result cache)
+        expected = SimulationCore(self.project.panel_power_wp, calculator.pricing).simulate_by_panels(
+            Decimal('900000'), number_of_panels
+        )
+        self.assertEqual(calculator.calculate('panels', Decimal('900000'), number_of_panels).as_dict(), expected.as_dict())
+    
+    def test_version_tracks_every_value(self):
+        pricing = PricingSnapshot(exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25'))
+        self.assertEqual(
+            PricingSnapshot(exchange_rate=Decimal('1330'), energy_price_ars=Decimal('101.25')).version,
+            pricing.version
+        )
+        for change in [
+            {'exchange_rate': Decimal('1331')},
+            {'energy_price_ars': Decimal('101.26')},
+            {'price_tiers': TierTable([(1, Decimal('700')), (10, Decimal('499'))])},
+            {'performance_ratio': Decimal('0.86')},
+            {'system_performance_factor': Decimal('0.2')},
+        ]:
+            self.assertNotEqual(replace(pricing, **change).version, pricing.version, change)
+    
+    def test_economics_match_formulas(self):
+        economics = self._calculator().economics
+        self.assertEqual(economics.savings_per_panel_ars, Decimal('0.66') * Decimal('101.25') * 24 * 30 * Decimal('0.19'))
+        self.assertEqual(economics.annual_generation_per_panel_kwh, Decimal('0.55') * 1500 * Decimal('0.85'))
+        self.assertEqual(economics.exchange_rate, Decimal('1330.00'))
+    
+    def test_reused_until_pricing_changes(self):
+        calculator = self._calculator()
+        self._assert_uncached(calculator, 12)
+        self.assertIs(self._calculator().economics, calculator.economics)
+        
+        ExchangeRate.objects.create(rate=Decimal('1500.00'), date=date(2026, 2, 1))
+        updated = self._calculator()
+        self.assertNotEqual(updated.pricing.version, calculator.pricing.version)
+        self.assertEqual(updated.economics.exchange_rate, Decimal('1500.00'))
+        self._assert_uncached(updated, 12)
+        
+        EnergyPrice.objects.update(is_active=False)
+        EnergyPrice.objects.create(price_ars_per_kwh=Decimal('120.00'), effective_date=date(2026, 2, 1))
+        updated = self._calculator()
+        self.assertEqual(updated.economics.savings_per_panel_ars, updated.pricing.savings_per_panel_ars)
+        self.assertNotEqual(updated.economics.savings_per_panel_ars, calculator.economics.savings_per_panel_ars)
+        self._assert_uncached(updated, 12)
+    
+    def test_rebuilt_when_project_changes(self):
+        economics = self._calculator().economics
+        self.project.panel_power_wp = Decimal('600')
+        self.project.save()
+        calculator = self._calculator()
+        self.assertIsNot(calculator.economics, economics)
+        self.assertEqual(calculator.economics.panel_power_kw, Decimal('0.6'))
+        self._assert_uncached(calculator, 12)
@@ -1,18 +1,24 @@
 from django.urls import path
+from core.response_cache import cache_response
 from . import views
 
 app_name = 'simulations'
 
 urlpatterns = [
     # Tariff categories and exchange rates
-    path('tariff-categories/', views.TariffCategoryListView.as_view(), name='tariff-categories'),
+    path('tariff-categories/', cache_response('tariff_categories')(views.TariffCategoryListView.as_view()), name='tariff-categories'),
     path('exchange-rates/', views.ExchangeRateListView.as_view(), name='exchange-rates'),
-    path('exchange-rate/current/', views.current_exchange_rate_view, name='current-exchange-rate'),
+    path('exchange-rate/current/', cache_response('pricing')(views.current_exchange_rate_view), name='current-exchange-rate'),
     path('calculate-limits/', views.calculate_limits_view, name='calculate-limits'),
     
     # Simulation endpoints
     path('simulations/create/', views.create_simulation_view, name='create-simulation'),
     path('simulations/compare/', views.compare_simulations_view, name='compare-simulations'),
+    path('simulations/compare/batch/', views.batch_compare_simulations_view, name='compare-simulations-batch'),
+    path('simulations/curve/', views.simulation_curve_view, name='simulation-curve'),
+    path('simulations/optimize/', views.optimize_simulation_view, name='simulation-optimize'),
+    path('simulations/sensitivity/', views.sensitivity_analysis_view, name='simulation-sensitivity'),
+    path('simulations/risk/', views.monte_carlo_simulation_view, name='simulation-risk'),
     path('simulations/<uuid:id>/', views.SimulationDetailView.as_view(), name='simulation-detail'),
     path('simulations/user/', views.UserSimulationsView.as_view(), name='user-simulations'),
     path('simulations/stats/', views.simulation_stats_view, name='simulation-stats'),
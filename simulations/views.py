@@ -4,18 +4,34 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.contrib.auth.hashers import check_password
+from django.conf import settings
 from decimal import Decimal
-from .models import InvestmentSimulation, TariffCategory, ExchangeRate
+from .models import InvestmentSimulation, SimulationStats, TariffCategory, ExchangeRate
 from projects.models import SolarProject
+from core.pagination import OptInCursorPagination
 from .serializers import (
     InvestmentSimulationSerializer,
     SimulationInputSerializer,
     TariffCategorySerializer,
     ExchangeRateSerializer,
     SimulationSummarySerializer,
-    SimulationComparisonSerializer
+    SimulationResultSerializer,
+    SimulationComparisonSerializer,
+    BatchSimulationComparisonSerializer,
+    SimulationCurveInputSerializer,
+    MonteCarloInputSerializer,
+    SensitivityInputSerializer,
+    OptimizationInputSerializer,
+    CURVE_MAX_POINTS,
+    TARGET_INPUT_FIELDS
 )
-from .simulation_engine import SolarInvestmentCalculator
+from .simulation_engine import SolarInvestmentCalculator, get_cached_project, get_project_economics
+from .core import SimulationCore, TargetNotReachable
+from .batch_engine import BatchSimulationEngine
+from .pricing import PricingSnapshot
+from .projection import ProjectionEngine, DEFAULT_HORIZON_YEARS, DEFAULT_DISCOUNT_RATE
+from .sensitivity import sensitivity_analysis, DEFAULT_VARIATION_PERCENTAGES
+from . import monte_carlo
 from projects.models import SolarProject
 
 
@@ -40,6 +56,17 @@ def _check_project_access(user, project, access_code=None):
     return False
 
 
+def _projection_engine(pricing):
+    """
+    Projection engine configured from settings and the pricing snapshot degradation
+    """
+    return ProjectionEngine(
+        degradation=pricing.system_degradation,
+        horizon_years=getattr(settings, 'SIMULATION_PROJECTION_YEARS', DEFAULT_HORIZON_YEARS),
+        discount_rate=getattr(settings, 'SIMULATION_DISCOUNT_RATE', DEFAULT_DISCOUNT_RATE)
+    )
+
+
 class TariffCategoryListView(generics.ListAPIView):
     """
     API view to list all available tariff categories
@@ -101,24 +128,29 @@ def calculate_limits_view(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Cached lookups: called on every keystroke, answered without queries in steady state
         try:
-            project = SolarProject.objects.get(id=project_id)
-            tariff_category = TariffCategory.objects.get(id=tariff_category_id)
-        except (SolarProject.DoesNotExist, TariffCategory.DoesNotExist):
+            project = get_cached_project(int(project_id))
+            tariff_found = int(tariff_category_id) in TariffCategory.get_ids()
+        except (ValueError, TypeError):
+            project, tariff_found = None, False
+        if project is None or not tariff_found:
             return Response(
                 {'error': 'Proyecto o categoría tarifaria no encontrados'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Initialize calculator and calculate limits
-        from .simulation_engine import SolarInvestmentCalculator
-        calculator = SolarInvestmentCalculator(project, tariff_category)
-        limits = calculator._calculate_bill_based_limits(monthly_bill_ars)
+        # Calculate limits with the engine core (no calculator or model instances needed)
+        pricing = PricingSnapshot.load(project)
+        core = SimulationCore(
+            project.panel_power_wp, pricing, economics=get_project_economics(project, pricing)
+        )
+        limits = core.bill_based_limits(monthly_bill_ars)
         
         # Calculate max investment based on 100% coverage
         max_panels_100_coverage = limits['max_panels_for_bill_coverage']
-        max_investment_usd_100_coverage = calculator._calculate_total_investment_tiered(max_panels_100_coverage)
-        max_investment_ars_100_coverage = max_investment_usd_100_coverage * calculator.exchange_rate
+        max_investment_usd_100_coverage = core.total_investment(max_panels_100_coverage)
+        max_investment_ars_100_coverage = max_investment_usd_100_coverage * core.exchange_rate
         
         # Format response
         response_data = {
@@ -129,7 +161,7 @@ def calculate_limits_view(request):
             'max_panels_allowed': limits['max_panels_for_bill_coverage'],  # Same as 100% coverage
             'savings_per_panel_ars': float(limits['savings_per_panel_ars']),
             'max_payback_years': limits['max_payback_years'],
-            'exchange_rate_used': float(calculator.exchange_rate)
+            'exchange_rate_used': float(core.exchange_rate)
         }
         
         return Response(response_data, status=status.HTTP_200_OK)
@@ -200,6 +232,18 @@ def create_simulation_view(request):
                         user_email=user_email,
                         user_phone=user_phone
                     )
+                else:
+                    field, simulation_type = next(
+                        (field, simulation_type) for field, simulation_type in TARGET_INPUT_FIELDS.items()
+                        if serializer.validated_data.get(field) is not None
+                    )
+                    simulation = calculator.simulate_by_target(
+                        simulation_type,
+                        monthly_bill_ars=serializer.validated_data['monthly_bill_ars'],
+                        target_value=serializer.validated_data[field],
+                        user_email=user_email,
+                        user_phone=user_phone
+                    )
                 
                 # Asociar la simulación con el usuario autenticado
                 simulation.user = request.user
@@ -212,13 +256,24 @@ def create_simulation_view(request):
                 
                 # Serialize response
                 response_serializer = InvestmentSimulationSerializer(simulation)
-                
-                return Response({
+                response_data = {
                     'simulation': response_serializer.data,
                     'capacity_check': capacity_check,
                     'success': True
-                }, status=status.HTTP_201_CREATED)
+                }
+                
+                if serializer.validated_data.get('include_projection'):
+                    projection_engine = _projection_engine(calculator.pricing)
+                    projection = projection_engine.project_simulations([simulation])
+                    response_data['projection'] = projection_engine.scenario(projection, 0)
+                
+                return Response(response_data, status=status.HTTP_201_CREATED)
                 
+        except TargetNotReachable as e:
+            return Response({
+                'error': str(e),
+                'success': False
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({
                 'error': f'Error al crear la simulación: {str(e)}',
@@ -247,17 +302,22 @@ def compare_simulations_view(request):
                 id=serializer.validated_data['tariff_category_id']
             )
             
-            # Initialize calculator
+            # Initialize calculator (results are not persisted: use lightweight records)
             calculator = SolarInvestmentCalculator(project, tariff_category)
             monthly_bill = serializer.validated_data['monthly_bill_ars']
+            result_serializer = SimulationResultSerializer(
+                context={'project': project, 'tariff_category': tariff_category}
+            )
             
             comparison_results = []
+            simulations = []
             
             # Bill coverage percentage scenarios
             if serializer.validated_data.get('bill_coverage_percentages'):
                 for coverage in serializer.validated_data['bill_coverage_percentages']:
-                    simulation = calculator.simulate_by_bill_coverage(monthly_bill, coverage)
-                    simulation_data = InvestmentSimulationSerializer(simulation).data
+                    simulation = calculator.calculate('bill_coverage', monthly_bill, coverage)
+                    simulations.append(simulation)
+                    simulation_data = result_serializer.to_representation(simulation)
                     comparison_results.append({
                         'type': 'bill_coverage',
                         'parameter': float(coverage),
@@ -267,8 +327,9 @@ def compare_simulations_view(request):
             # Panel quantity scenarios
             if serializer.validated_data.get('panel_quantities'):
                 for panels in serializer.validated_data['panel_quantities']:
-                    simulation = calculator.simulate_by_panels(monthly_bill, panels)
-                    simulation_data = InvestmentSimulationSerializer(simulation).data
+                    simulation = calculator.calculate('panels', monthly_bill, panels)
+                    simulations.append(simulation)
+                    simulation_data = result_serializer.to_representation(simulation)
                     comparison_results.append({
                         'type': 'panels',
                         'parameter': panels,
@@ -278,14 +339,22 @@ def compare_simulations_view(request):
             # Investment amount scenarios
             if serializer.validated_data.get('investment_amounts'):
                 for amount in serializer.validated_data['investment_amounts']:
-                    simulation = calculator.simulate_by_investment(monthly_bill, amount)
-                    simulation_data = InvestmentSimulationSerializer(simulation).data
+                    simulation = calculator.calculate('investment', monthly_bill, amount)
+                    simulations.append(simulation)
+                    simulation_data = result_serializer.to_representation(simulation)
                     comparison_results.append({
                         'type': 'investment',
                         'parameter': float(amount),
                         'simulation': simulation_data
                     })
             
+            # Multi-year projection of every scenario in one vectorized pass
+            if serializer.validated_data.get('include_projection'):
+                projection_engine = _projection_engine(calculator.pricing)
+                projection = projection_engine.project_simulations(simulations)
+                for index, result in enumerate(comparison_results):
+                    result['projection'] = projection_engine.scenario(projection, index)
+            
             return Response({
                 'project_info': {
                     'id': project.id,
@@ -308,6 +377,266 @@ def compare_simulations_view(request):
     }, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+def batch_compare_simulations_view(request):
+    """
+    API view to compare many simulation scenarios in one vectorized pass.
+    Results are returned in columnar form (one list per field).
+    """
+    serializer = BatchSimulationComparisonSerializer(data=request.data)
+    
+    if serializer.is_valid():
+        try:
+            project = get_object_or_404(SolarProject, id=serializer.validated_data['project_id'])
+            get_object_or_404(TariffCategory, id=serializer.validated_data['tariff_category_id'])
+            
+            pricing = PricingSnapshot.load(project)
+            engine = BatchSimulationEngine(project.panel_power_wp, pricing)
+            results = engine.run(
+                float(serializer.validated_data['monthly_bill_ars']),
+                bill_coverage_percentages=serializer.validated_data.get('bill_coverage_percentages', []),
+                panel_quantities=serializer.validated_data.get('panel_quantities', []),
+                investment_amounts=serializer.validated_data.get('investment_amounts', [])
+            )
+            
+            response_data = {
+                'project_info': {
+                    'id': project.id,
+                    'name': project.name,
+                    'available_power_kw': float(project.available_power)
+                },
+                'exchange_rate_used': engine.exchange_rate,
+                'pricing_version': pricing.version,
+                'scenario_count': len(results['simulation_type']),
+                'results': results,
+                'success': True
+            }
+            
+            if serializer.validated_data.get('include_projection'):
+                projection_engine = _projection_engine(pricing)
+                projection = projection_engine.project(
+                    results['total_investment_usd'],
+                    results['annual_savings_usd'],
+                    results['annual_generation_kwh']
+                )
+                response_data['projection'] = projection_engine.summary_columns(projection)
+            
+            return Response(response_data, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': f'Error al comparar simulaciones: {str(e)}',
+                'success': False
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    return Response({
+        'errors': serializer.errors,
+        'success': False
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+def simulation_curve_view(request):
+    """
+    API view to get investment, savings, payback and ROI for every panel count
+    from 1 to 100% bill coverage in one columnar response
+    """
+    serializer = SimulationCurveInputSerializer(data=request.data)
+    
+    if serializer.is_valid():
+        try:
+            project = get_object_or_404(SolarProject, id=serializer.validated_data['project_id'])
+            get_object_or_404(TariffCategory, id=serializer.validated_data['tariff_category_id'])
+            
+            engine = BatchSimulationEngine(project.panel_power_wp, PricingSnapshot.load(project))
+            curve = engine.curve(
+                float(serializer.validated_data['monthly_bill_ars']),
+                max_points=CURVE_MAX_POINTS
+            )
+            
+            return Response({
+                'project_id': project.id,
+                'monthly_bill_ars': float(serializer.validated_data['monthly_bill_ars']),
+                'exchange_rate_used': engine.exchange_rate,
+                'pricing_version': engine.pricing.version,
+                'curve': curve,
+                'success': True
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': f'Error al calcular la curva de simulación: {str(e)}',
+                'success': False
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    return Response({
+        'errors': serializer.errors,
+        'success': False
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+def optimize_simulation_view(request):
+    """
+    API view to find the panel count with the best ROI or payback for a bill,
+    under an optional budget, maximum coverage and the project available power
+    """
+    serializer = OptimizationInputSerializer(data=request.data)
+    
+    if serializer.is_valid():
+        try:
+            data = serializer.validated_data
+            project = get_object_or_404(SolarProject, id=data['project_id'])
+            tariff_category = get_object_or_404(TariffCategory, id=data['tariff_category_id'])
+            
+            calculator = SolarInvestmentCalculator(project, tariff_category)
+            result = calculator.optimize_panels(
+                data['monthly_bill_ars'],
+                objective=data['objective'],
+                max_budget_usd=data.get('max_budget_usd'),
+                max_coverage_percentage=data.get('max_coverage_percentage'),
+                respect_available_power=data['respect_available_power']
+            )
+            
+            optimal = result['simulation']
+            return Response({
+                'objective': result['objective'],
+                'feasible': optimal is not None,
+                'simulation': InvestmentSimulationSerializer(optimal).data if optimal is not None else None,
+                'candidates': SimulationSummarySerializer(result['candidates'], many=True).data,
+                'panel_limits': result['panel_limits'],
+                'binding_constraint': result['binding_constraint'],
+                'success': True
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': f'Error al optimizar la simulación: {str(e)}',
+                'success': False
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    return Response({
+        'errors': serializer.errors,
+        'success': False
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+def sensitivity_analysis_view(request):
+    """
+    API view to get tornado-chart data: payback and ROI when each engine parameter
+    (energy price, exchange rate, panel price, performance factor) moves by ±X%
+    """
+    serializer = SensitivityInputSerializer(data=request.data)
+    
+    if serializer.is_valid():
+        try:
+            data = serializer.validated_data
+            project = get_object_or_404(SolarProject, id=data['project_id'])
+            get_object_or_404(TariffCategory, id=data['tariff_category_id'])
+            
+            if data.get('bill_coverage_percentage') is not None:
+                simulation_type, parameter = 'bill_coverage', float(data['bill_coverage_percentage'])
+            elif data.get('number_of_panels') is not None:
+                simulation_type, parameter = 'panels', data['number_of_panels']
+            else:
+                simulation_type, parameter = 'investment', float(data['investment_amount_usd'])
+            
+            engine = BatchSimulationEngine(project.panel_power_wp, PricingSnapshot.load(project))
+            analysis = sensitivity_analysis(
+                engine,
+                simulation_type,
+                float(data['monthly_bill_ars']),
+                parameter,
+                data.get('variation_percentages') or DEFAULT_VARIATION_PERCENTAGES
+            )
+            
+            return Response({
+                'project_id': project.id,
+                'simulation_type': simulation_type,
+                'parameter': parameter,
+                'exchange_rate_used': engine.exchange_rate,
+                'pricing_version': engine.pricing.version,
+                **analysis,
+                'success': True
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': f'Error en el análisis de sensibilidad: {str(e)}',
+                'success': False
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    return Response({
+        'errors': serializer.errors,
+        'success': False
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+def monte_carlo_simulation_view(request):
+    """
+    API view to get payback and ROI percentiles of a simulation over simulated
+    exchange-rate and energy-price paths (see simulations.monte_carlo)
+    """
+    serializer = MonteCarloInputSerializer(data=request.data)
+    
+    if serializer.is_valid():
+        try:
+            data = serializer.validated_data
+            project = get_object_or_404(SolarProject, id=data['project_id'])
+            tariff_category = get_object_or_404(TariffCategory, id=data['tariff_category_id'])
+            
+            calculator = SolarInvestmentCalculator(project, tariff_category)
+            if data.get('bill_coverage_percentage') is not None:
+                simulation = calculator.simulate_by_bill_coverage(
+                    data['monthly_bill_ars'], data['bill_coverage_percentage']
+                )
+            elif data.get('number_of_panels') is not None:
+                simulation = calculator.simulate_by_panels(data['monthly_bill_ars'], data['number_of_panels'])
+            else:
+                simulation = calculator.simulate_by_investment(
+                    data['monthly_bill_ars'], data['investment_amount_usd']
+                )
+            
+            scenario = monte_carlo.RiskScenario(
+                investment_usd=float(simulation.total_investment_usd),
+                monthly_savings_ars=float(simulation.monthly_savings_ars),
+                exchange_rate=float(calculator.pricing.exchange_rate),
+                degradation=float(calculator.pricing.system_degradation),
+                model=monte_carlo.RiskModel.from_history(),
+                horizon_years=data.get('horizon_years') or getattr(
+                    settings, 'SIMULATION_PROJECTION_YEARS', DEFAULT_HORIZON_YEARS
+                )
+            )
+            risk = monte_carlo.run(
+                scenario,
+                paths=data['paths'],
+                seed=data.get('seed'),
+                workers=getattr(settings, 'SIMULATION_MONTE_CARLO_WORKERS', 1),
+                parallel_min_paths=getattr(
+                    settings, 'SIMULATION_MONTE_CARLO_PARALLEL_PATHS', monte_carlo.DEFAULT_PARALLEL_MIN_PATHS
+                )
+            )
+            
+            return Response({
+                'simulation': InvestmentSimulationSerializer(simulation).data,
+                'risk': risk,
+                'success': True
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'error': f'Error en la simulación de riesgo: {str(e)}',
+                'success': False
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    return Response({
+        'errors': serializer.errors,
+        'success': False
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
 class SimulationDetailView(generics.RetrieveAPIView):
     """
     API view to retrieve a specific simulation by ID (only for the owner)
@@ -327,6 +656,7 @@ class UserSimulationsView(generics.ListAPIView):
     """
     serializer_class = SimulationSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptInCursorPagination
     
     def get_queryset(self):
         # Filtrar por usuario autenticado
@@ -339,22 +669,14 @@ def simulation_stats_view(request):
     API view to get general simulation statistics
     """
     try:
-        total_simulations = InvestmentSimulation.objects.count()
+        totals = SimulationStats.totals()
+        total_simulations = totals['total_simulations']
         
         # Average metrics
         if total_simulations > 0:
-            from django.db.models import Avg
-            avg_investment = InvestmentSimulation.objects.aggregate(
-                avg=Avg('total_investment_usd')
-            )['avg'] or 0
-            
-            avg_payback = InvestmentSimulation.objects.aggregate(
-                avg=Avg('payback_period_years')
-            )['avg'] or 0
-            
-            avg_roi = InvestmentSimulation.objects.aggregate(
-                avg=Avg('roi_annual')
-            )['avg'] or 0
+            avg_investment = totals['sum_investment_usd'] / total_simulations
+            avg_payback = totals['sum_payback_years'] / total_simulations
+            avg_roi = totals['sum_roi_annual'] / total_simulations
         else:
             avg_investment = avg_payback = avg_roi = 0
         
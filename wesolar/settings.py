@@ -190,6 +190,33 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 
+# Staleness bounds (seconds) for the in-process exchange rate / energy price cache
+PRICING_CACHE_CHECK_INTERVAL = config('PRICING_CACHE_CHECK_INTERVAL', default=5, cast=int)
+PRICING_CACHE_MAX_AGE = config('PRICING_CACHE_MAX_AGE', default=60, cast=int)
+
+# Cached responses of the public read endpoints (core.response_cache); timeout in seconds, 0 disables it
+RESPONSE_CACHE_ALIAS = config('RESPONSE_CACHE_ALIAS', default='default')
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int)
+
+# In-memory LRU of simulation results (0 disables it)
+SIMULATION_CACHE_SIZE = config('SIMULATION_CACHE_SIZE', default=1024, cast=int)
+
+# Serve simulation stats from the incrementally maintained summary row (SimulationStats)
+SIMULATION_STATS_SUMMARY = config('SIMULATION_STATS_SUMMARY', default=True, cast=bool)
+
+# Compute simulations with the exact integer engine instead of Decimal arithmetic
+# (same results; slower in CPython, see simulations/fixed_point.py)
+SIMULATION_FIXED_POINT = config('SIMULATION_FIXED_POINT', default=False, cast=bool)
+
+# Multi-year cash-flow projection (optional section of simulation responses)
+SIMULATION_PROJECTION_YEARS = config('SIMULATION_PROJECTION_YEARS', default=25, cast=int)
+SIMULATION_DISCOUNT_RATE = config('SIMULATION_DISCOUNT_RATE', default=0.08, cast=float)
+
+# Monte Carlo risk simulation: worker processes (1 = run in the request process; capped at
+# the CPU count and monte_carlo.MAX_WORKERS), used only for runs of at least PARALLEL_PATHS paths
+SIMULATION_MONTE_CARLO_WORKERS = config('SIMULATION_MONTE_CARLO_WORKERS', default=1, cast=int)
+SIMULATION_MONTE_CARLO_PARALLEL_PATHS = config('SIMULATION_MONTE_CARLO_PARALLEL_PATHS', default=50000, cast=int)
+
 # CORS settings for React frontend
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React development server
@@ -8,6 +8,7 @@ from django.conf.urls.static import static
 from django.http import HttpResponse, JsonResponse, FileResponse, Http404
 from django.shortcuts import redirect
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from projects.images import VARIANTS_DIR
 import os
 
 # Simple handlers for common requests
@@ -65,7 +66,11 @@ def serve_media(request, path):
     """Custom media file server for Vercel"""
     media_path = os.path.join(settings.MEDIA_ROOT, path)
     if os.path.exists(media_path) and os.path.isfile(media_path):
-        return FileResponse(open(media_path, 'rb'))
+        response = FileResponse(open(media_path, 'rb'))
+        if path.startswith(VARIANTS_DIR + '/'):
+            # Image variants are named by content hash: they never change
+            response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
     raise Http404("Media file not found")
 
 urlpatterns = [